@@ -0,0 +1,194 @@
+"""앱 단계별 벤치마크 - process_dataframe / recommend_courses / create_google_maps_html
+
+합성 데이터(synthetic_data)로 단계마다 실행 시간, 최대 메모리(tracemalloc peak),
+단계가 끝난 뒤 남은 할당 블록 수를 측정하고, 기준값(baseline.json)과 비교해 성능 저하를 잡는다.
+
+실행:
+    python benchmarks/bench_app.py                         # 측정만
+    python benchmarks/bench_app.py --save-baseline         # 기준값 저장
+    python benchmarks/bench_app.py --check                 # 기준값 대비 저하 시 종료 코드 1
+    python benchmarks/bench_app.py --sizes 1000 1000000    # 행 수 지정 (100만 행은 수 분 소요)
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+logging.disable(logging.WARNING)  # streamlit bare mode 경고 숨김
+
+import streamlit as st  # noqa: E402
+
+import streamlit_app as app  # noqa: E402
+import synthetic_data  # noqa: E402
+
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "baseline.json")
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+# 기준값 대비 허용 비율 (시간은 측정 잡음이 커서 여유를 더 둠)
+TIME_TOLERANCE = 0.5
+MEMORY_TOLERANCE = 0.2
+
+TRAVEL_STYLES = ["역사/문화", "맛집"]
+NUM_DAYS = 3
+
+#################################################
+# 단계 정의
+#################################################
+
+def _reset_course_state():
+    """세션에 남은 장소 테이블/코스 캐시를 비워 매번 처음 요청처럼 측정"""
+    st.session_state.pop('place_table', None)
+    st.session_state.pop('meal_planner', None)
+    app.get_course_cache().clear()
+
+
+def stage_process_dataframe(n, seed):
+    frames = synthetic_data.make_dataframes(n, seed)
+
+    def run():
+        return [app.process_dataframe(df, synthetic_data.DATASET_SCHEMAS[name]['category'], "한국어", source=name)
+                for name, df in frames.items()]
+    return run
+
+
+def stage_recommend_courses(n, seed, optimize_route=False):
+    markers = synthetic_data.make_markers(n, seed, colors=app.CATEGORY_COLORS)
+
+    def run():
+        _reset_course_state()
+        return app.recommend_courses(markers, TRAVEL_STYLES, NUM_DAYS, optimize_route=optimize_route)
+    return run
+
+
+def stage_create_google_maps_html(n, seed):
+    markers = synthetic_data.make_markers(n, seed, colors=app.CATEGORY_COLORS)
+
+    def run():
+        return app.create_google_maps_html("BENCHMARK_KEY", app.DEFAULT_LOCATION[0], app.DEFAULT_LOCATION[1],
+                                           markers=markers)
+    return run
+
+
+STAGES = {
+    'process_dataframe': stage_process_dataframe,
+    'recommend_courses': stage_recommend_courses,
+    'recommend_courses[optimize]': lambda n, seed: stage_recommend_courses(n, seed, optimize_route=True),
+    'create_google_maps_html': stage_create_google_maps_html,
+}
+
+#################################################
+# 측정
+#################################################
+
+def measure(run, repeat=3):
+    """최소 실행 시간(ms) + tracemalloc 한 번 실행의 최대 메모리(KB)/남은 할당 블록 수
+
+    시간은 tracemalloc 없이 재고 (추적 비용이 시간에 섞이지 않도록), 메모리는 따로 한 번 더 실행한다.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        result = run()
+        _, peak = tracemalloc.get_traced_memory()
+        # 추적 시작 후 할당되어 아직 살아 있는 블록 (결과 객체 포함)
+        blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics('filename'))
+    finally:
+        tracemalloc.stop()
+    del result
+    return {'time_ms': round(best * 1000, 3), 'peak_kb': round(peak / 1024, 1), 'blocks': blocks}
+
+
+def run_benchmarks(sizes, stages, seed=0, repeat=3):
+    """{'단계@행수': 측정값} - 진행 상황은 한 줄씩 출력"""
+    results = {}
+    print(f"{'stage':<30} {'rows':>9} {'time ms':>11} {'peak KB':>11} {'blocks':>9}")
+    for n in sizes:
+        for name in stages:
+            run = STAGES[name](n, seed)
+            stats = measure(run, repeat)
+            results[f"{name}@{n}"] = stats
+            print(f"{name:<30} {n:>9} {stats['time_ms']:>11.1f} {stats['peak_kb']:>11.1f} {stats['blocks']:>9}")
+    return results
+
+#################################################
+# 기준값
+#################################################
+
+def machine_info():
+    return {'python': platform.python_version(), 'platform': platform.platform(), 'cpus': os.cpu_count()}
+
+
+def save_baseline(results, path=BASELINE_PATH):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({'machine': machine_info(), 'results': results}, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_baseline(path=BASELINE_PATH):
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def find_regressions(results, baseline, time_tolerance=TIME_TOLERANCE, memory_tolerance=MEMORY_TOLERANCE):
+    """기준값보다 허용 비율 이상 느려지거나 메모리를 더 쓴 항목 [(키, 항목, 기준값, 측정값), ...]"""
+    regressions = []
+    for key, stats in results.items():
+        base = baseline['results'].get(key)
+        if base is None:
+            continue
+        if stats['time_ms'] > base['time_ms'] * (1 + time_tolerance):
+            regressions.append((key, 'time_ms', base['time_ms'], stats['time_ms']))
+        if stats['peak_kb'] > base['peak_kb'] * (1 + memory_tolerance):
+            regressions.append((key, 'peak_kb', base['peak_kb'], stats['peak_kb']))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="앱 단계별 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), default=list(STAGES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--save-baseline", action="store_true", help="측정 결과를 기준값으로 저장")
+    parser.add_argument("--check", action="store_true", help="기준값 대비 성능 저하가 있으면 종료 코드 1")
+    parser.add_argument("--time-tolerance", type=float, default=TIME_TOLERANCE)
+    parser.add_argument("--memory-tolerance", type=float, default=MEMORY_TOLERANCE)
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.sizes, args.stages, args.seed, args.repeat)
+
+    if args.save_baseline:
+        save_baseline(results)
+        print(f"기준값 저장: {BASELINE_PATH}")
+
+    if args.check:
+        baseline = load_baseline()
+        if baseline is None:
+            print(f"기준값 파일이 없습니다: {BASELINE_PATH}")
+            return 1
+        if baseline.get('machine') != machine_info():
+            print(f"주의: 기준값은 다른 환경에서 측정되었습니다 ({baseline.get('machine')})")
+        regressions = find_regressions(results, baseline, args.time_tolerance, args.memory_tolerance)
+        for key, metric, base, value in regressions:
+            print(f"성능 저하: {key} {metric} {base} → {value} ({value / base:.2f}배)")
+        if regressions:
+            return 1
+        print("기준값 대비 성능 저하 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
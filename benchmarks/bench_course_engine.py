@@ -0,0 +1,53 @@
+"""코스 추천 엔진 벤치마크 - 후보 1만~100만 개에서 엔진 내부 단계별 소요 시간 측정
+
+장소는 synthetic_data 의 합성 데이터 (앱 전체 단계 측정은 bench_app.py)
+
+실행: python benchmarks/bench_course_engine.py [--sizes 10000 100000 1000000]
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+logging.disable(logging.WARNING)  # streamlit bare mode 경고 숨김
+
+import course_engine  # noqa: E402
+from streamlit_app import STYLE_CATEGORY_WEIGHTS  # noqa: E402
+from synthetic_data import make_markers  # noqa: E402
+
+
+def timed(func, *args, repeat=3, **kwargs):
+    """최소 소요 시간(ms)과 결과 반환"""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--days", type=int, default=3)
+    args = parser.parse_args()
+
+    styles = ["역사/문화", "맛집"]
+    print(f"{'places':>10} {'table':>10} {'score':>10} {'top-k':>10} {'greedy':>10} {'total':>10}  (ms)")
+    for n in args.sizes:
+        markers = make_markers(n)
+        table_ms, table = timed(course_engine.PlaceTable, markers, repeat=1)
+        score_ms, scores = timed(course_engine.score_places, table, styles, True, STYLE_CATEGORY_WEIGHTS)
+        top_ms, top = timed(course_engine.top_k_stable, scores, args.days * 3 * 2)
+        greedy_ms, _ = timed(course_engine.plan_greedy_days, table, top, scores, args.days, 3, (37.5665, 126.9780))
+        total_ms, _ = timed(course_engine.recommend, table, styles, args.days, True, STYLE_CATEGORY_WEIGHTS)
+        print(f"{n:>10} {table_ms:>10.1f} {score_ms:>10.2f} {top_ms:>10.2f} {greedy_ms:>10.2f} {total_ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
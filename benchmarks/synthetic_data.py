@@ -0,0 +1,186 @@
+"""벤치마크용 합성 데이터 - asset 엑셀 파일과 같은 열 구성/좌표 범위로 1천~100만 행 생성
+
+같은 (행 수, seed) 이면 항상 같은 데이터가 나온다.
+좌표는 실제 파일의 좌표 범위 안에서 몇 개의 밀집 지역(군집)을 중심으로 뽑아
+실제 데이터처럼 도심에 장소가 몰려 있는 분포를 흉내 낸다.
+"""
+import numpy as np
+import pandas as pd
+
+from opening_hours import ALWAYS_OPEN
+
+#################################################
+# 원본 파일 스키마
+#################################################
+
+# 파일별 열 구성, 좌표 범위 (경도 X, 위도 Y), 전체 행 중 비율, 앱이 붙이는 카테고리
+DATASET_SCHEMAS = {
+    "서울시 문화행사 공공서비스예약 정보(한국어+영어+중국어) (1)": {
+        'columns': ['상세(한국어)', '상세(영어)', '상세(중국어)', '명칭(한국어)', '명칭(영어)', '명칭(중국어)', 'X좌표', 'Y좌표'],
+        'x_range': (126.8133747, 128.16047),
+        'y_range': (36.54098, 37.68954),
+        'share': 560,
+        'category': "기타",
+    },
+    "서울시 외국인전용 관광기념품 판매점 정보(한국어+영어+중국어) (1)": {
+        'columns': ['명칭(한국어)', '명칭(영어)', '명칭(중국어)', '도로명전체주소', 'Y좌표', 'X좌표'],
+        'x_range': (126.8120001, 127.1114168),
+        'y_range': (37.5131008, 37.6047932),
+        'share': 80,
+        'category': "관광기념품",
+    },
+    "서울시 자랑스러운 한국음식점 정보 (한국어,영어,중국어) (1)": {
+        'columns': ['명칭(한국어)', '명칭(영어)', '명칭(중국어)', '도로명 주소', 'Y좌표', 'X좌표'],
+        'x_range': (126.8216849, 127.1525822),
+        'y_range': (37.4437149, 37.6827998),
+        'share': 430,
+        'category': "한국음식점",
+    },
+    "서울시 종로구 관광데이터 정보 (중국어) (1)": {
+        'columns': ['명칭(중국어)', 'X좌표', 'Y좌표'],
+        'x_range': (126.9550229, 127.2733626),
+        'y_range': (37.0152241, 37.6314807),
+        'share': 810,
+        'category': "종로구 관광지",
+    },
+    "서울시 종로구 관광데이터 정보 (한국어+영어) (1)": {
+        'columns': ['명칭(한국어)', '명칭(영어)', '명칭(중국어)', '도로명 주소', 'X좌표', 'Y좌표'],
+        'x_range': (126.9550229, 127.2733626),
+        'y_range': (37.0152241, 37.6314807),
+        'share': 810,
+        'category': "종로구 관광지",
+    },
+    "서울시 체육시설 공연행사 정보 (한국어+영어+중국어) (1)": {
+        'columns': ['상세(한국어)', '상세(영어)', '상세(중국어)', '명칭(한국어)', '명칭(영어)', '명칭(중국어)', 'X좌표', 'Y좌표'],
+        'x_range': (126.883, 127.076),
+        'y_range': (37.5122, 37.53064),
+        'share': 18,
+        'category': "체육시설",
+    },
+    "서울시립미술관 전시정보 (한국어+영어+중국어) (1)": {
+        'columns': ['명칭(한국어)', '명칭(영어)', '명칭(중국어)', 'X좌표', 'Y좌표'],
+        'x_range': (126.9738, 126.9738),
+        'y_range': (37.56424, 37.56424),
+        'share': 12,
+        'category': "미술관/전시",
+    },
+}
+
+# 밀집 지역 수와 퍼짐 정도 (좌표 범위 대비 비율)
+CLUSTERS_PER_DATASET = 12
+CLUSTER_SPREAD = 0.04
+# 상세 설명에 행사 기간 문구를 넣는 비율 (실제 문화행사 데이터의 약 1/3)
+PERIOD_RATE = 0.35
+
+GU_NAMES = ["종로구", "중구", "용산구", "성동구", "마포구", "강남구", "서초구", "송파구", "영등포구", "동대문구"]
+ROAD_NAMES = ["세종대로", "종로", "율곡로", "을지로", "퇴계로", "한강대로", "테헤란로", "올림픽로"]
+
+#################################################
+# 생성 함수
+#################################################
+
+def split_rows(n):
+    """전체 행 수를 파일별 비율대로 나눔 (합이 정확히 n)"""
+    names = list(DATASET_SCHEMAS)
+    shares = np.array([DATASET_SCHEMAS[name]['share'] for name in names], dtype=np.float64)
+    counts = np.floor(n * shares / shares.sum()).astype(np.int64)
+    # 남는 행은 비율이 큰 파일부터 하나씩
+    for i in np.argsort(-shares, kind='stable')[:n - counts.sum()]:
+        counts[i] += 1
+    return dict(zip(names, counts.tolist()))
+
+
+def _coordinates(rng, schema, n):
+    """좌표 범위 안의 군집 분포 좌표 (경도, 위도)"""
+    x_lo, x_hi = schema['x_range']
+    y_lo, y_hi = schema['y_range']
+    centers_x = rng.uniform(x_lo, x_hi, CLUSTERS_PER_DATASET)
+    centers_y = rng.uniform(y_lo, y_hi, CLUSTERS_PER_DATASET)
+    which = rng.integers(0, CLUSTERS_PER_DATASET, n)
+    x = centers_x[which] + rng.normal(0, CLUSTER_SPREAD * max(x_hi - x_lo, 1e-3), n)
+    y = centers_y[which] + rng.normal(0, CLUSTER_SPREAD * max(y_hi - y_lo, 1e-3), n)
+    return np.clip(x, x_lo, x_hi), np.clip(y, y_lo, y_hi)
+
+
+def _details(rng, names, n):
+    """상세 설명 문구 - 일부 행에는 'YYYY.MM.DD ~ YYYY.MM.DD' 기간 포함"""
+    months = rng.integers(1, 12, n)
+    days = rng.integers(1, 28, n)
+    lengths = rng.integers(0, 60, n)
+    with_period = rng.random(n) < PERIOD_RATE
+    details = []
+    for i in range(n):
+        text = f"{names[i]} 안내. 사전 예약 후 이용할 수 있습니다."
+        if with_period[i]:
+            text += f" 기간: 2025.{months[i]:02d}.{days[i]:02d} ~ 2025.{months[i] + 1:02d}.{min(days[i] + lengths[i] % 28, 28):02d}"
+        details.append(text)
+    return details
+
+
+def make_dataframe(name, n, seed=0):
+    """파일 하나와 같은 열 구성의 데이터프레임 n행"""
+    schema = DATASET_SCHEMAS[name]
+    # 파일마다 다른 난수열 (같은 seed 라도 파일 간 좌표가 겹치지 않게)
+    rng = np.random.default_rng([seed, list(DATASET_SCHEMAS).index(name)])
+    x, y = _coordinates(rng, schema, n)
+    ids = np.arange(n)
+    category = schema['category']
+
+    korean = [f"{category} 장소 {i}" for i in ids]
+    values = {}
+    for column in schema['columns']:
+        if column == 'X좌표':
+            values[column] = x
+        elif column == 'Y좌표':
+            values[column] = y
+        elif column == '명칭(한국어)':
+            values[column] = korean
+        elif column == '명칭(영어)':
+            values[column] = [f"Place {i}" for i in ids]
+        elif column == '명칭(중국어)':
+            values[column] = [f"地点 {i}" for i in ids]
+        elif column == '상세(한국어)':
+            values[column] = _details(rng, korean, n)
+        elif column == '상세(영어)':
+            values[column] = [f"Details of place {i}." for i in ids]
+        elif column == '상세(중국어)':
+            values[column] = [f"地点 {i} 介绍。" for i in ids]
+        else:  # 주소 열
+            gu = rng.integers(0, len(GU_NAMES), n)
+            road = rng.integers(0, len(ROAD_NAMES), n)
+            number = rng.integers(1, 300, n)
+            values[column] = [f"서울특별시 {GU_NAMES[g]} {ROAD_NAMES[r]} {k}"
+                              for g, r, k in zip(gu, road, number)]
+    return pd.DataFrame(values, columns=schema['columns'])
+
+
+def make_dataframes(n, seed=0):
+    """전체 n행을 파일별 비율로 나눈 {파일명: 데이터프레임}"""
+    return {name: make_dataframe(name, count, seed) for name, count in split_rows(n).items() if count}
+
+
+def make_markers(n, seed=0, colors=None):
+    """process_dataframe 결과와 같은 형태의 마커 n개 (엑셀 파싱 없이 바로 생성)"""
+    colors = colors or {}
+    markers = []
+    for name, df in make_dataframes(n, seed).items():
+        schema = DATASET_SCHEMAS[name]
+        category = schema['category']
+        title_col = next(c for c in ('명칭(한국어)', '명칭(중국어)') if c in df.columns)
+        address_col = next((c for c in df.columns if '주소' in c), None)
+        titles = df[title_col].tolist()
+        addresses = df[address_col].tolist() if address_col else [""] * len(df)
+        for i, (title, lat, lng) in enumerate(zip(titles, df['Y좌표'].tolist(), df['X좌표'].tolist())):
+            markers.append({
+                'lat': lat,
+                'lng': lng,
+                'title': title,
+                'color': colors.get(category, "gray"),
+                'category': category,
+                'info': f"<div><h3>{title}</h3><p>{category}</p></div>",
+                'address': addresses[i],
+                'names': {"한국어": title},
+                'place_id': f"{name}#{i}",
+                'open_mask': ALWAYS_OPEN,
+            })
+    return markers
@@ -0,0 +1,205 @@
+"""추천 코스 카탈로그 - 모든 스타일 조합 × 일수 × 아이 동반 여부의 최적화 코스를 미리 계산
+
+배치 실행: python course_catalog.py [--languages 한국어 영어 중국어] [--max-days 7] [--workers N]
+결과는 data/course_catalog.json.gz 에 저장되며, 앱은 조건이 일치하면 계산 없이 바로 사용한다.
+"""
+import argparse
+import gzip
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import time
+
+import course_engine
+
+CATALOG_PATH = os.path.join("data", "course_catalog.json.gz")
+CATALOG_FORMAT = 1
+MAX_DAYS = 7
+
+# 카탈로그를 만든 조건 (앱 요청이 이 조건과 같을 때만 카탈로그 사용)
+CATALOG_OPTIONS = {
+    'places_per_day': 3,
+    'start': list(course_engine.DEFAULT_START),
+    'optimize': True,
+    'budget_minutes': course_engine.DAY_BUDGET_MINUTES,
+    'partition_days': False,
+    'diversity': course_engine.DIVERSITY_TRADE_OFF,
+}
+
+#################################################
+# 카탈로그 조회
+#################################################
+
+def catalog_key(travel_styles, num_days, include_children):
+    """카탈로그 항목 키 - 스타일 순서와 무관"""
+    return f"{'+'.join(sorted(travel_styles))}|{int(num_days)}|{int(bool(include_children))}"
+
+
+class CourseCatalog:
+    """미리 계산한 코스 카탈로그 (언어별 장소 데이터 버전과 일별 장소 인덱스)"""
+
+    def __init__(self, data):
+        self.options = data.get('options', {})
+        self.languages = data.get('languages', {})
+
+    @classmethod
+    def load(cls, path=CATALOG_PATH):
+        """카탈로그 파일 로드 (없거나 형식이 다르면 None)"""
+        if not os.path.exists(path):
+            return None
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get('format') != CATALOG_FORMAT:
+            return None
+        return cls(data)
+
+    def matches(self, start, optimize, budget_minutes, partition_days, places_per_day=3, diversity=None):
+        """요청 옵션이 카탈로그 생성 조건과 같은지 확인"""
+        requested = {
+            'places_per_day': places_per_day,
+            'start': [float(start[0]), float(start[1])],
+            'optimize': bool(optimize),
+            'budget_minutes': budget_minutes,
+            'partition_days': bool(partition_days),
+            'diversity': diversity,
+        }
+        return requested == self.options
+
+    def lookup(self, table, language, travel_styles, num_days, include_children, style_weights, active=None):
+        """카탈로그에 있으면 일별 코스 목록, 없거나 데이터 버전이 다르면 None
+
+        active(장소별 bool, 예: 여행 기간에 진행 중인 행사)를 주면 코스의 모든 장소가 True 일 때만 사용
+        (끝난 행사가 하나라도 들어 있으면 None → 엔진이 그 기간에 맞춰 다시 계산).
+        """
+        section = self.languages.get(language)
+        if not section or section.get('version') != table.version:
+            return None
+        routes = section['courses'].get(catalog_key(travel_styles, num_days, include_children))
+        if routes is None:
+            return None
+        if active is not None and not all(active[place_idx] for route in routes for place_idx in route):
+            return None
+        scores = course_engine.score_places(table, travel_styles, include_children, style_weights)
+        return course_engine.courses_from_routes(table, scores, routes)
+
+#################################################
+# 배치 계산
+#################################################
+
+_worker_state = {}
+
+
+def _init_worker(tables, style_weights):
+    """작업 프로세스마다 장소 테이블을 한 번만 받아 둠"""
+    _worker_state['tables'] = tables
+    _worker_state['style_weights'] = style_weights
+
+
+def _compute_entry(job):
+    """카탈로그 항목 하나 계산 - (언어, 키, 일별 장소 인덱스)"""
+    language, styles, num_days, include_children = job
+    table = _worker_state['tables'][language]
+    courses = course_engine.recommend(
+        table, list(styles), num_days, include_children, _worker_state['style_weights'],
+        places_per_day=CATALOG_OPTIONS['places_per_day'],
+        start=tuple(CATALOG_OPTIONS['start']),
+        optimize=CATALOG_OPTIONS['optimize'],
+        budget_minutes=CATALOG_OPTIONS['budget_minutes'],
+        partition_days=CATALOG_OPTIONS['partition_days'],
+        diversity=CATALOG_OPTIONS['diversity'],
+    )
+    index = _place_index(language, table)
+    routes = [[index[place['place_id']] for place in day] for day in courses]
+    return language, catalog_key(styles, num_days, include_children), routes
+
+
+def _place_index(language, table):
+    """place_id → 마커 인덱스 (프로세스마다 한 번 생성)"""
+    indexes = _worker_state.setdefault('indexes', {})
+    if language not in indexes:
+        indexes[language] = {marker['place_id']: i for i, marker in enumerate(table.markers)}
+    return indexes[language]
+
+
+def style_combinations(styles):
+    """공집합을 제외한 모든 스타일 조합"""
+    for size in range(1, len(styles) + 1):
+        yield from itertools.combinations(styles, size)
+
+
+def build_catalog(tables, styles, style_weights, max_days=MAX_DAYS, workers=None):
+    """언어별 장소 테이블로 전체 카탈로그 계산 (모든 코어 사용)"""
+    jobs = [
+        (language, combo, num_days, include_children)
+        for language in tables
+        for combo in style_combinations(styles)
+        for num_days in range(1, max_days + 1)
+        for include_children in (False, True)
+    ]
+    languages = {
+        language: {'version': table.version, 'courses': {}}
+        for language, table in tables.items()
+    }
+
+    workers = workers or os.cpu_count() or 1
+    if workers > 1:
+        with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(tables, style_weights)) as pool:
+            results = pool.imap_unordered(_compute_entry, jobs, chunksize=8)
+            for language, key, routes in results:
+                languages[language]['courses'][key] = routes
+    else:
+        _init_worker(tables, style_weights)
+        for job in jobs:
+            language, key, routes = _compute_entry(job)
+            languages[language]['courses'][key] = routes
+
+    for section in languages.values():
+        section['courses'] = dict(sorted(section['courses'].items()))
+    return {'format': CATALOG_FORMAT, 'options': CATALOG_OPTIONS, 'languages': languages}
+
+
+def save_catalog(catalog, path=CATALOG_PATH):
+    """gzip 압축 JSON으로 저장 (임시 파일에 쓴 뒤 교체)"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+        json.dump(catalog, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="추천 코스 카탈로그 배치 생성")
+    parser.add_argument("--languages", nargs="+", default=["한국어", "영어", "중국어"])
+    parser.add_argument("--max-days", type=int, default=MAX_DAYS)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", default=CATALOG_PATH)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)  # streamlit bare mode 경고 숨김
+    import streamlit_app
+
+    tables = {}
+    for language in args.languages:
+        markers = streamlit_app.load_excel_files(language)
+        if markers:
+            tables[language] = course_engine.PlaceTable(markers)
+            print(f"{language}: 장소 {len(markers)}개")
+
+    styles = list(streamlit_app.STYLE_CATEGORY_WEIGHTS)
+    start = time.perf_counter()
+    catalog = build_catalog(tables, styles, streamlit_app.STYLE_CATEGORY_WEIGHTS,
+                            max_days=args.max_days, workers=args.workers)
+    save_catalog(catalog, args.output)
+
+    entries = sum(len(section['courses']) for section in catalog['languages'].values())
+    print(f"카탈로그 {entries}개 항목 저장: {args.output} "
+          f"({os.path.getsize(args.output) / 1024:.1f}KB, {time.perf_counter() - start:.1f}초)")
+
+
+if __name__ == "__main__":
+    main()
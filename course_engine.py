@@ -0,0 +1,887 @@
+"""관광 코스 추천 엔진 - NumPy 배열 기반 점수 계산 및 동선 선택/최적화"""
+import atexit
+import hashlib
+import multiprocessing
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+from opening_hours import ALWAYS_OPEN, SLOT_MINUTES, day_slots, slot_for_stop
+from spatial_index import GridIndex
+
+#################################################
+# 상수
+#################################################
+
+# WGS-84 타원체 (geopy.distance.geodesic 기본값과 동일)
+WGS84_A = 6378.137  # 장반경 (km)
+WGS84_F = 1 / 298.257223563
+WGS84_B = WGS84_A * (1 - WGS84_F)
+
+# 아이 동반 시 가산점을 주는 카테고리와 배율
+FAMILY_CATEGORIES = ["미술관/전시", "체육시설"]
+FAMILY_BONUS = 1.2
+
+# 거리 감점: 10km 이상이면 점수 절반
+DISTANCE_DECAY_KM = 10.0
+MIN_DISTANCE_FACTOR = 0.5
+
+# 식사 장소 삽입: 식당 카테고리와 이동 구간 중점 주변에서 확인할 후보 수
+MEAL_CATEGORY = "한국음식점"
+MEAL_CANDIDATES = 8
+
+# 다양성 선택 (MMR): 1이면 점수만, 0이면 다양성만 고려
+DIVERSITY_TRADE_OFF = 0.7
+DIVERSITY_RADIUS_KM = 1.0  # 위치 유사도가 1/e 로 줄어드는 거리
+DIVERSITY_CATEGORY_WEIGHT = 0.5  # 유사도 중 카테고리 일치의 비중
+
+# 동선 최적화 설정
+DEFAULT_START = (37.5665, 126.9780)  # 서울시청
+VISIT_MINUTES = 90  # 장소당 평균 체류 시간
+TRAVEL_KM_PER_MINUTE = 0.2  # 대중교통 약 12km/h (200m/분)
+TRAVEL_COST_PER_KM = 0.05  # 이동 1km당 점수 감점
+DAY_BUDGET_MINUTES = SLOT_MINUTES[-1][1] - SLOT_MINUTES[0][0]  # 하루 활동 시간 (첫 시간대 시작 ~ 마지막 시간대 끝)
+OPTIMIZE_TIME_LIMIT = 0.2  # 하루 동선 최적화 시간 상한 (초)
+
+#################################################
+# 거리 계산
+#################################################
+
+def geodesic_km(lat1, lng1, lat2, lng2, max_iter=100, tol=1e-12):
+    """WGS-84 타원체 측지 거리 (Vincenty 역해, 배열 브로드캐스트 지원, km)"""
+    lat1, lng1, lat2, lng2 = np.broadcast_arrays(
+        np.asarray(lat1, dtype=np.float64), np.asarray(lng1, dtype=np.float64),
+        np.asarray(lat2, dtype=np.float64), np.asarray(lng2, dtype=np.float64)
+    )
+    L = np.radians(lng2 - lng1)
+    U1 = np.arctan((1 - WGS84_F) * np.tan(np.radians(lat1)))
+    U2 = np.arctan((1 - WGS84_F) * np.tan(np.radians(lat2)))
+    sinU1, cosU1 = np.sin(U1), np.cos(U1)
+    sinU2, cosU2 = np.sin(U2), np.cos(U2)
+
+    lam = L
+    for _ in range(max_iter):
+        sin_lam, cos_lam = np.sin(lam), np.cos(lam)
+        sin_sigma = np.sqrt((cosU2 * sin_lam) ** 2 + (cosU1 * sinU2 - sinU1 * cosU2 * cos_lam) ** 2)
+        cos_sigma = sinU1 * sinU2 + cosU1 * cosU2 * cos_lam
+        sigma = np.arctan2(sin_sigma, cos_sigma)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            sin_alpha = np.where(sin_sigma == 0, 0.0, cosU1 * cosU2 * sin_lam / sin_sigma)
+            cos2_alpha = 1 - sin_alpha ** 2
+            cos_2sigma_m = np.where(cos2_alpha == 0, 0.0, cos_sigma - 2 * sinU1 * sinU2 / cos2_alpha)
+        C = WGS84_F / 16 * cos2_alpha * (4 + WGS84_F * (4 - 3 * cos2_alpha))
+        lam_prev = lam
+        lam = L + (1 - C) * WGS84_F * sin_alpha * (
+            sigma + C * sin_sigma * (cos_2sigma_m + C * cos_sigma * (-1 + 2 * cos_2sigma_m ** 2))
+        )
+        if np.all(np.abs(lam - lam_prev) < tol):
+            break
+
+    u2 = cos2_alpha * (WGS84_A ** 2 - WGS84_B ** 2) / WGS84_B ** 2
+    A = 1 + u2 / 16384 * (4096 + u2 * (-768 + u2 * (320 - 175 * u2)))
+    B = u2 / 1024 * (256 + u2 * (-128 + u2 * (74 - 47 * u2)))
+    delta_sigma = B * sin_sigma * (cos_2sigma_m + B / 4 * (
+        cos_sigma * (-1 + 2 * cos_2sigma_m ** 2)
+        - B / 6 * cos_2sigma_m * (-3 + 4 * sin_sigma ** 2) * (-3 + 4 * cos_2sigma_m ** 2)
+    ))
+    return WGS84_B * A * (sigma - delta_sigma)
+
+#################################################
+# 장소 배열
+#################################################
+
+class PlaceTable:
+    """마커 목록을 열 단위 NumPy 배열로 변환한 테이블"""
+
+    def __init__(self, markers):
+        self.markers = markers
+        n = len(markers)
+        self.lat = np.fromiter((m['lat'] for m in markers), dtype=np.float64, count=n)
+        self.lng = np.fromiter((m['lng'] for m in markers), dtype=np.float64, count=n)
+        self.importance = np.fromiter((m.get('importance', 1.0) for m in markers), dtype=np.float64, count=n)
+        # 요일 × 시간대 영업 비트마스크 (운영시간 정보가 없으면 항상 영업)
+        self.open_mask = np.fromiter((m.get('open_mask', ALWAYS_OPEN) for m in markers), dtype=np.int64, count=n)
+        self.has_hours = bool(np.any(self.open_mask != ALWAYS_OPEN))
+
+        # 카테고리/이름을 정수 코드로 변환
+        self.categories = []
+        category_codes = {}
+        title_codes = {}
+        self.category_code = np.empty(n, dtype=np.int64)
+        self.title_code = np.empty(n, dtype=np.int64)
+        for i, marker in enumerate(markers):
+            category = marker.get('category', '기타')
+            if category not in category_codes:
+                category_codes[category] = len(self.categories)
+                self.categories.append(category)
+            self.category_code[i] = category_codes[category]
+            self.title_code[i] = title_codes.setdefault(marker.get('title'), len(title_codes))
+        self.num_titles = len(title_codes)
+        self.titles = list(title_codes)
+        self._version = None
+
+    def __len__(self):
+        return len(self.markers)
+
+    @property
+    def version(self):
+        """데이터셋 버전 - 좌표/중요도/카테고리/이름/운영시간/행사 기간이 같으면 같은 값 (결과 캐시 키용)"""
+        if self._version is None:
+            digest = hashlib.blake2b(digest_size=16)
+            for array in (self.lat, self.lng, self.importance, self.category_code, self.title_code, self.open_mask):
+                digest.update(array.tobytes())
+            digest.update('\x1f'.join(self.categories).encode('utf-8'))
+            digest.update('\x1f'.join(str(t) for t in self.titles).encode('utf-8'))
+            digest.update('\x1f'.join(f"{m.get('event_start') or ''}~{m.get('event_end') or ''}"
+                                       for m in self.markers).encode('utf-8'))
+            self._version = digest.hexdigest()
+        return self._version
+
+#################################################
+# 점수 계산
+#################################################
+
+def style_weight_matrix(categories, styles, style_weights):
+    """카테고리 × 스타일 가중치 행렬 (가중치가 없으면 1.0)"""
+    matrix = np.ones((len(categories), len(styles)), dtype=np.float64)
+    for j, style in enumerate(styles):
+        for i, category in enumerate(categories):
+            matrix[i, j] = style_weights.get(style, {}).get(category, 1.0)
+    return matrix
+
+
+def score_places(table, travel_styles, include_children, style_weights):
+    """여행 스타일/아이 동반 여부에 따른 장소별 점수 배열"""
+    styles = [style for style in travel_styles if style in style_weights]
+    matrix = style_weight_matrix(table.categories, styles, style_weights)
+
+    # 스타일 순서대로 곱해 기존 반복 계산과 동일한 부동소수점 결과 유지
+    scores = table.importance.copy()
+    for j in range(len(styles)):
+        scores *= matrix[table.category_code, j]
+
+    if include_children:
+        family_codes = [i for i, c in enumerate(table.categories) if c in FAMILY_CATEGORIES]
+        scores[np.isin(table.category_code, family_codes)] *= FAMILY_BONUS
+    return scores
+
+
+def top_k_stable(scores, k):
+    """점수 상위 k개 인덱스 (동점이면 원래 순서 유지, 전체 정렬 없이 O(n) 선택)"""
+    n = len(scores)
+    k = min(k, n)
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    if k < n:
+        threshold = np.partition(scores, n - k)[n - k]
+        above = np.flatnonzero(scores > threshold)
+        ties = np.flatnonzero(scores == threshold)[:k - len(above)]
+        selected = np.concatenate([above, ties])
+        selected.sort()
+    else:
+        selected = np.arange(n)
+    return selected[np.argsort(-scores[selected], kind='stable')]
+
+
+def diverse_top_k(table, scores, k, trade_off=DIVERSITY_TRADE_OFF, radius_km=DIVERSITY_RADIUS_KM,
+                  category_weight=DIVERSITY_CATEGORY_WEIGHT, pool=None):
+    """MMR(maximal marginal relevance) 방식 상위 k개 - 점수와 카테고리/위치 다양성의 균형
+
+    매 단계 trade_off × 정규화 점수 - (1 - trade_off) × (이미 고른 장소와의 최대 유사도)가
+    가장 큰 장소를 고른다. 유사도 = category_weight × [같은 카테고리]
+    + (1 - category_weight) × exp(-거리 / radius_km), 이름이 같으면 1.
+    최대 유사도 배열을 고른 장소 하나씩 갱신하므로 후보 P개에 O(k·P) 벡터 연산.
+    pool(후보 인덱스)이 없으면 점수가 유한한 전체 장소가 후보이며,
+    결과는 top_k_stable 과 같이 점수 내림차순 (동점이면 원래 순서).
+    """
+    if pool is None:
+        pool = np.flatnonzero(np.isfinite(scores))
+    k = min(k, len(pool))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+
+    pool_scores = scores[pool]
+    top = pool_scores.max()
+    relevance = pool_scores / top if top > 0 else np.ones(len(pool))
+    origin = (float(table.lat[pool].mean()), float(table.lng[pool].mean()))
+    # 유사도는 최대 1이므로 k번째로 높은 점수보다 (1 - trade_off)/trade_off 이상 낮은 장소는
+    # 그보다 점수가 높은 장소가 항상 남아 있어 뽑힐 수 없음 → 미리 제외 (결과 동일)
+    kth = np.partition(relevance, len(pool) - k)[len(pool) - k]
+    keep = trade_off * relevance >= trade_off * kth - (1 - trade_off)
+    pool, relevance = pool[keep], relevance[keep]
+    points = project_km(table.lat[pool], table.lng[pool], origin)
+    x, y = points[:, 0], points[:, 1]
+    category = table.category_code[pool]
+    title = table.title_code[pool]
+
+    max_similarity = np.zeros(len(pool))
+    chosen = np.zeros(len(pool), dtype=bool)
+    picks = np.empty(k, dtype=np.int64)
+    for step in range(k):
+        marginal = trade_off * relevance - (1 - trade_off) * max_similarity
+        marginal[chosen] = -np.inf
+        best = int(np.argmax(marginal))  # 동점이면 앞쪽(원래 순서) 장소
+        picks[step] = best
+        chosen[best] = True
+
+        similarity = (1 - category_weight) * np.exp(-np.hypot(x - x[best], y - y[best]) / radius_km)
+        similarity += category_weight * (category == category[best])
+        similarity[title == title[best]] = 1.0
+        np.maximum(max_similarity, similarity, out=max_similarity)
+
+    selected = np.sort(pool[picks])
+    return selected[np.argsort(-scores[selected], kind='stable')]
+
+#################################################
+# 일별 동선 선택
+#################################################
+
+def _pick_best(adjusted, history):
+    """조정 점수 최댓값 위치 (동점이면 이전 시간대 점수 → 원래 순서로 결정)"""
+    candidates = np.flatnonzero(adjusted == adjusted.max())
+    for previous in reversed(history):
+        if len(candidates) == 1:
+            break
+        values = previous[candidates]
+        candidates = candidates[values == values.max()]
+    return int(candidates[0])
+
+
+def _greedy_day(lat, lng, scores, available, places_per_day, start, slot_open=None):
+    """하루 그리디 동선 - 선택한 장소 인덱스와 선택 시점의 조정 점수 목록 반환
+
+    slot_open(그날의 시간대 영업 비트)이 있으면 각 방문 시간대에 문을 연 곳만 고르고,
+    연 곳이 없으면 그 시간대에서 하루를 마친다.
+    """
+    route = []
+    position = start
+    history = []
+
+    for stop in range(places_per_day):
+        if len(available) == 0:
+            break
+
+        # 현재 위치에서 모든 후보까지의 거리 한 줄을 한 번에 계산
+        distance = geodesic_km(position[0], position[1], lat[available], lng[available])
+        distance_factor = np.maximum(MIN_DISTANCE_FACTOR, 1 - distance / DISTANCE_DECAY_KM)
+        adjusted = scores[available] * distance_factor
+        if slot_open is not None:
+            open_now = ((slot_open[available] >> slot_for_stop(stop, places_per_day)) & 1).astype(bool)
+            if not open_now.any():
+                break
+            adjusted = np.where(open_now, adjusted, -np.inf)
+
+        pos = _pick_best(adjusted, history)
+        place_idx = int(available[pos])
+        route.append((place_idx, float(adjusted[pos])))
+
+        history = [np.delete(previous, pos) for previous in history]
+        history.append(np.delete(adjusted, pos))
+        available = np.delete(available, pos)
+        position = (lat[place_idx], lng[place_idx])
+
+    return route
+
+
+def _course_from_route(table, scores, route):
+    """장소 인덱스 경로를 표시용 장소 dict 목록으로 변환"""
+    return [
+        dict(table.markers[place_idx], score=float(scores[place_idx]), adjusted_score=adjusted)
+        for place_idx, adjusted in route
+    ]
+
+
+def courses_from_routes(table, scores, routes):
+    """일별 장소 인덱스 목록을 표시용 코스로 변환 (최적화 경로처럼 조정 점수 = 점수인 경우)"""
+    return [
+        _course_from_route(table, scores, [(int(place_idx), float(scores[place_idx])) for place_idx in route])
+        for route in routes
+    ]
+
+
+def _day_slot_open(table, weekdays, day):
+    """day번째 날의 장소별 시간대 영업 비트 (요일 제약이 없으면 None)"""
+    if weekdays is None:
+        return None
+    return day_slots(table.open_mask, weekdays[day])
+
+
+def iter_greedy_days(table, candidates, scores, num_days, places_per_day, start, weekdays=None):
+    """시작점에서 거리 가중 점수가 가장 높은 곳을 차례로 고르는 일별 그리디 동선 (하루씩 yield)"""
+    chosen_titles = np.zeros(table.num_titles, dtype=bool)
+
+    for day in range(num_days):
+        # 이미 선택된 이름의 장소는 제외
+        available = candidates[~chosen_titles[table.title_code[candidates]]]
+        if len(available) == 0:
+            break
+
+        route = _greedy_day(table.lat, table.lng, scores, available, places_per_day, start,
+                            slot_open=_day_slot_open(table, weekdays, day))
+        for place_idx, _ in route:
+            chosen_titles[table.title_code[place_idx]] = True
+        yield _course_from_route(table, scores, route)
+
+
+def plan_greedy_days(table, candidates, scores, num_days, places_per_day, start, weekdays=None):
+    """시작점에서 거리 가중 점수가 가장 높은 곳을 차례로 고르는 일별 그리디 동선"""
+    return list(iter_greedy_days(table, candidates, scores, num_days, places_per_day, start, weekdays))
+
+#################################################
+# 동선 최적화 (오리엔티어링 / 상금 수집 TSP)
+#################################################
+
+class DayRouteProblem:
+    """하루 동선 문제 - 점수 합에서 이동 비용을 뺀 값을 시간 예산 안에서 최대화"""
+
+    def __init__(self, lat, lng, prizes, start, max_stops, budget_minutes,
+                 return_to_start=False, travel_cost_per_km=TRAVEL_COST_PER_KM, slot_open=None):
+        self.prizes = np.asarray(prizes, dtype=np.float64)
+        self.size = len(self.prizes)
+        # 방문 순서별 시간대에 문을 연 후보인지 (위치 × 후보) 표
+        self.open_at = None
+        if slot_open is not None:
+            slot_open = np.asarray(slot_open)
+            self.open_at = np.array([
+                ((slot_open >> slot_for_stop(pos, max_stops)) & 1).astype(bool)
+                for pos in range(max_stops)
+            ])
+        self.max_stops = max_stops
+        self.budget_minutes = budget_minutes
+        self.return_to_start = return_to_start
+        self.travel_cost_per_km = travel_cost_per_km
+
+        # 마지막 행/열이 출발점인 거리 행렬
+        lat = np.append(lat, start[0])
+        lng = np.append(lng, start[1])
+        self.depot = self.size
+        self.dist = geodesic_km(lat[:, None], lng[:, None], lat[None, :], lng[None, :])
+
+    def travel_km(self, route):
+        """경로 총 이동 거리"""
+        if not route:
+            return 0.0
+        dist = self.dist
+        total = dist[self.depot, route[0]]
+        for a, b in zip(route, route[1:]):
+            total += dist[a, b]
+        if self.return_to_start:
+            total += dist[route[-1], self.depot]
+        return float(total)
+
+    def duration(self, route, travel_km=None):
+        """체류 시간과 이동 시간을 합한 소요 시간 (분)"""
+        if travel_km is None:
+            travel_km = self.travel_km(route)
+        return len(route) * VISIT_MINUTES + travel_km / TRAVEL_KM_PER_MINUTE
+
+    def feasible(self, route):
+        """방문 수/영업 시간대/시간 예산 제약 확인"""
+        if len(route) > self.max_stops:
+            return False
+        if self.open_at is not None and not all(self.open_at[pos, u] for pos, u in enumerate(route)):
+            return False
+        return self.duration(route) <= self.budget_minutes
+
+    def objective(self, route):
+        """점수 합 - 이동 비용"""
+        return float(self.prizes[route].sum()) - self.travel_cost_per_km * self.travel_km(route)
+
+    def neighbours(self, route):
+        """삽입/제거/교체/2-opt/Or-opt 이웃 경로"""
+        n = len(route)
+        unused = [u for u in range(self.size) if u not in route]
+
+        # 삽입
+        if n < self.max_stops:
+            for u in unused:
+                for pos in range(n + 1):
+                    yield route[:pos] + [u] + route[pos:]
+        # 제거
+        for pos in range(n):
+            yield route[:pos] + route[pos + 1:]
+        # 교체
+        for pos in range(n):
+            for u in unused:
+                yield route[:pos] + [u] + route[pos + 1:]
+        # 2-opt (구간 뒤집기)
+        for i in range(n - 1):
+            for j in range(i + 1, n):
+                yield route[:i] + route[i:j + 1][::-1] + route[j + 1:]
+        # Or-opt (1~3개 구간 이동)
+        for length in range(1, min(3, n) + 1):
+            for i in range(n - length + 1):
+                segment = route[i:i + length]
+                rest = route[:i] + route[i + length:]
+                for pos in range(len(rest) + 1):
+                    if pos != i:
+                        yield rest[:pos] + segment + rest[pos:]
+
+    def local_search(self, route, deadline):
+        """개선이 없을 때까지 최선 이웃으로 이동 (시간 상한 도달 시 중단)"""
+        best_value = self.objective(route)
+        while time.perf_counter() < deadline:
+            best_move = None
+            for candidate in self.neighbours(route):
+                value = self.objective(candidate)
+                if value > best_value + 1e-12 and self.feasible(candidate):
+                    best_value, best_move = value, candidate
+            if best_move is None:
+                break
+            route = best_move
+        return route, best_value
+
+    def solve(self, initial, time_limit=OPTIMIZE_TIME_LIMIT, seed=0, patience=30):
+        """반복 지역 탐색 - 시간 상한 안에서 찾은 가장 좋은 경로 반환 (anytime)"""
+        deadline = time.perf_counter() + time_limit
+        rng = random.Random(seed)
+
+        # 초기해가 예산을 넘으면 뒤에서부터 빼서 복구
+        current = [u for u in initial if u < self.size]
+        while current and not self.feasible(current):
+            current.pop()
+        best, best_value = self.local_search(current, deadline)
+        current = best
+
+        stale = 0
+        while time.perf_counter() < deadline and stale < patience and self.size > 1:
+            # 교란: 경로 일부를 빼고 다시 지역 탐색
+            perturbed = list(current)
+            for _ in range(min(2, len(perturbed))):
+                perturbed.pop(rng.randrange(len(perturbed)))
+            candidate, value = self.local_search(perturbed, deadline)
+            if value > best_value + 1e-12:
+                best, best_value = candidate, value
+                current = candidate
+                stale = 0
+            else:
+                current = candidate if rng.random() < 0.3 else best
+                stale += 1
+        return best
+
+
+def solve_day_route(lat, lng, prizes, start, max_stops, budget_minutes, optimize=True,
+                    time_limit=OPTIMIZE_TIME_LIMIT, seed=0, return_to_start=False, slot_open=None):
+    """후보 배열만으로 하루 동선 계산 - (후보 내 위치, 조정 점수) 목록 (프로세스 풀에서도 실행 가능)"""
+    lat = np.asarray(lat, dtype=np.float64)
+    lng = np.asarray(lng, dtype=np.float64)
+    prizes = np.asarray(prizes, dtype=np.float64)
+    greedy = _greedy_day(lat, lng, prizes, np.arange(len(prizes)), max_stops, start, slot_open=slot_open)
+    if not optimize:
+        return greedy
+
+    problem = DayRouteProblem(lat, lng, prizes, start, max_stops, budget_minutes,
+                              return_to_start=return_to_start, slot_open=slot_open)
+    route = problem.solve([u for u, _ in greedy], time_limit=time_limit, seed=seed)
+    return [(u, float(prizes[u])) for u in route]
+
+
+def iter_optimized_days(table, candidates, scores, num_days, places_per_day, start,
+                        budget_minutes=DAY_BUDGET_MINUTES, time_limit=OPTIMIZE_TIME_LIMIT,
+                        return_to_start=False, weekdays=None):
+    """일별 그리디 동선을 초기해로 삼아 오리엔티어링 지역 탐색으로 개선 (하루씩 yield)"""
+    chosen_titles = np.zeros(table.num_titles, dtype=bool)
+
+    for day in range(num_days):
+        available = candidates[~chosen_titles[table.title_code[candidates]]]
+        if len(available) == 0:
+            break
+
+        slot_open = _day_slot_open(table, weekdays, day)
+        route = solve_day_route(table.lat[available], table.lng[available], scores[available], start,
+                                places_per_day, budget_minutes, time_limit=time_limit, seed=day,
+                                return_to_start=return_to_start,
+                                slot_open=None if slot_open is None else slot_open[available])
+
+        place_route = [(int(available[u]), adjusted) for u, adjusted in route]
+        for place_idx, _ in place_route:
+            chosen_titles[table.title_code[place_idx]] = True
+        yield _course_from_route(table, scores, place_route)
+
+
+def plan_optimized_days(table, candidates, scores, num_days, places_per_day, start,
+                        budget_minutes=DAY_BUDGET_MINUTES, time_limit=OPTIMIZE_TIME_LIMIT,
+                        return_to_start=False, weekdays=None):
+    """일별 그리디 동선을 초기해로 삼아 오리엔티어링 지역 탐색으로 개선"""
+    return list(iter_optimized_days(table, candidates, scores, num_days, places_per_day, start,
+                                    budget_minutes, time_limit, return_to_start, weekdays))
+
+#################################################
+# 지역별 일정 분할 (균형 k-means)
+#################################################
+
+def project_km(lat, lng, origin=None):
+    """위경도를 기준점 중심 평면 좌표(km)로 근사 투영"""
+    lat = np.asarray(lat, dtype=np.float64)
+    lng = np.asarray(lng, dtype=np.float64)
+    if origin is None:
+        origin = (float(lat.mean()), float(lng.mean()))
+    x = (lng - origin[1]) * 111.320 * np.cos(np.radians(origin[0]))
+    y = (lat - origin[0]) * 110.574
+    return np.column_stack([x, y])
+
+
+def _balanced_assign(points, centers, capacity):
+    """각 군집 용량을 넘지 않도록 가까운 순서로 배정 (2순위와의 거리 차가 큰 점부터)"""
+    dist = np.linalg.norm(points[:, None, :] - centers[None, :, :], axis=2)
+    order = np.sort(dist, axis=1)
+    regret = order[:, 1] - order[:, 0] if centers.shape[0] > 1 else np.zeros(len(points))
+
+    labels = np.full(len(points), -1, dtype=np.int64)
+    load = np.zeros(centers.shape[0], dtype=np.int64)
+    for i in np.argsort(-regret, kind='stable'):
+        for c in np.argsort(dist[i], kind='stable'):
+            if load[c] < capacity:
+                labels[i] = c
+                load[c] += 1
+                break
+    return labels
+
+
+def balanced_kmeans(points, k, weights=None, max_iter=20):
+    """군집 크기가 고르게 나뉘는 k-means (결정적 초기화: 가중치 최대점에서 시작하는 최원점 선택)"""
+    n = len(points)
+    k = max(1, min(k, n))
+    if weights is None:
+        weights = np.ones(n)
+
+    # 초기 중심: 가중치가 가장 큰 점 → 기존 중심에서 가장 먼 점을 차례로 추가
+    center_idx = [int(np.argmax(weights))]
+    nearest = np.linalg.norm(points - points[center_idx[0]], axis=1)
+    for _ in range(1, k):
+        nxt = int(np.argmax(nearest))
+        center_idx.append(nxt)
+        nearest = np.minimum(nearest, np.linalg.norm(points - points[nxt], axis=1))
+    centers = points[center_idx].astype(np.float64)
+
+    capacity = -(-n // k)
+    labels = _balanced_assign(points, centers, capacity)
+    for _ in range(max_iter):
+        centers = np.array([
+            points[labels == c].mean(axis=0) if np.any(labels == c) else centers[c]
+            for c in range(k)
+        ])
+        new_labels = _balanced_assign(points, centers, capacity)
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+    return labels
+
+
+def _solve_cluster(args):
+    """프로세스 풀 작업 단위 - 한 군집을 하루 일정으로 계산"""
+    return solve_day_route(*args)
+
+
+_solver_pool = None
+_solver_pool_lock = threading.Lock()
+
+
+def solver_pool():
+    """군집별 동선 계산에 쓰는 공유 프로세스 풀 (처음 쓸 때 한 번 만들고 요청마다 재사용)
+
+    Streamlit 서버처럼 스레드가 많은 프로세스에서 fork 하지 않도록 forkserver(없으면 spawn)로 띄운다.
+    풀을 만들 수 없는 환경이면 None.
+    """
+    global _solver_pool
+    with _solver_pool_lock:
+        if _solver_pool is None:
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+            try:
+                _solver_pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1, mp_context=context)
+            except Exception:
+                return None
+        return _solver_pool
+
+
+def _discard_solver_pool(pool):
+    """작업 프로세스가 죽어 쓸 수 없게 된 풀을 버림 (다음 요청에서 새로 생성)"""
+    global _solver_pool
+    with _solver_pool_lock:
+        if _solver_pool is pool:
+            _solver_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+@atexit.register
+def _shutdown_solver_pool():
+    if _solver_pool is not None:
+        _solver_pool.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_partitioned_days(table, candidates, scores, num_days, places_per_day, start,
+                          optimize=True, budget_minutes=DAY_BUDGET_MINUTES,
+                          time_limit=OPTIMIZE_TIME_LIMIT, return_to_start=False, workers=None,
+                          weekdays=None):
+    """상위 후보를 일수만큼 지역 군집으로 나눈 뒤 군집마다 하루 동선을 (병렬로) 계산 (하루씩 yield)"""
+    if len(candidates) == 0:
+        return
+
+    # 이름이 같은 장소(같은 시설의 여러 행사 등)는 후보 순서상 앞선 하나만 남김 - 호출한 쪽이 고른
+    # 후보(점수 순 또는 다양성 선택) 안에서만 거르고 바깥의 점수 순 장소로 바꿔 넣지 않음
+    _, first = np.unique(table.title_code[candidates], return_index=True)
+    candidates = candidates[np.sort(first)]
+    candidates = candidates[np.isfinite(scores[candidates])]  # active=False 로 제외된 장소 빼기
+    if len(candidates) == 0:
+        return
+
+    points = project_km(table.lat[candidates], table.lng[candidates])
+    labels = balanced_kmeans(points, num_days, weights=scores[candidates])
+    clusters = [candidates[labels == c] for c in range(labels.max() + 1)]
+    # 점수 합이 큰 군집부터 Day 1, 2, ...
+    clusters.sort(key=lambda members: -float(scores[members].sum()))
+
+    jobs = []
+    for day, members in enumerate(clusters):
+        slot_open = _day_slot_open(table, weekdays, day)
+        jobs.append((table.lat[members], table.lng[members], scores[members], start, places_per_day,
+                     budget_minutes, optimize, time_limit, day, return_to_start,
+                     None if slot_open is None else slot_open[members]))
+
+    if workers is None:
+        workers = min(len(jobs), os.cpu_count() or 1)
+    executor = None
+    futures = []
+    if optimize and workers > 1 and len(jobs) > 1:
+        executor = solver_pool()  # 프로세스 풀을 쓸 수 없는 환경이면 순차 실행
+        if executor is not None:
+            try:
+                futures = [executor.submit(_solve_cluster, job) for job in jobs]
+            except (BrokenProcessPool, RuntimeError):
+                _discard_solver_pool(executor)
+                executor = None
+
+    try:
+        # 모든 날을 한꺼번에 제출하고, 앞날부터 끝나는 대로 내보냄
+        for day, (members, job) in enumerate(zip(clusters, jobs)):
+            route = None
+            if executor is not None:
+                try:
+                    route = futures[day].result()
+                except BrokenProcessPool:
+                    _discard_solver_pool(executor)
+                    executor = None
+                except Exception:
+                    route = None
+            if route is None:
+                route = _solve_cluster(job)
+            yield _course_from_route(table, scores, [(int(members[u]), adjusted) for u, adjusted in route])
+    finally:
+        # 풀은 공유하므로 닫지 않고, 중간에 멈췄으면 아직 시작하지 않은 날만 취소
+        for future in futures:
+            future.cancel()
+
+
+def plan_partitioned_days(table, candidates, scores, num_days, places_per_day, start, **options):
+    """상위 후보를 일수만큼 지역 군집으로 나눈 뒤 군집마다 하루 동선을 (병렬로) 계산"""
+    return list(iter_partitioned_days(table, candidates, scores, num_days, places_per_day, start, **options))
+
+
+def route_length_km(course, start=DEFAULT_START, return_to_start=False):
+    """코스(장소 dict 목록)의 총 이동 거리"""
+    if not course:
+        return 0.0
+    lat = np.array([start[0]] + [place['lat'] for place in course])
+    lng = np.array([start[1]] + [place['lng'] for place in course])
+    if return_to_start:
+        lat = np.append(lat, start[0])
+        lng = np.append(lng, start[1])
+    return float(geodesic_km(lat[:-1], lng[:-1], lat[1:], lng[1:]).sum())
+
+
+#################################################
+# 식사 장소 삽입
+#################################################
+
+class MealPlanner:
+    """식당 격자 색인으로 코스 사이사이에 점심/저녁 식사 장소를 끼워 넣는 후처리"""
+
+    def __init__(self, table, category=MEAL_CATEGORY, cell_km=0.5):
+        self.table = table
+        codes = [i for i, c in enumerate(table.categories) if c == category]
+        self.restaurants = np.flatnonzero(np.isin(table.category_code, codes))
+        self.category = category
+        self.grid = GridIndex(table.lat[self.restaurants], table.lng[self.restaurants], cell_km=cell_km)
+
+    def __len__(self):
+        return len(self.restaurants)
+
+    def best_stop(self, a, b, used_titles, k=MEAL_CANDIDATES):
+        """a → b 구간 중점에서 가까운 식당 k곳 중 우회 거리가 가장 짧은 곳 (테이블 인덱스, 우회 km)"""
+        mid_lat, mid_lng = (a[0] + b[0]) / 2, (a[1] + b[1]) / 2
+        mask = ~np.isin(self.table.title_code[self.restaurants], list(used_titles))
+        local, _ = self.grid.nearest(mid_lat, mid_lng, k=k, mask=mask)
+        if len(local) == 0:
+            return None, None
+        idx = self.restaurants[local]
+        lat, lng = self.table.lat[idx], self.table.lng[idx]
+        detour = geodesic_km(a[0], a[1], lat, lng) + geodesic_km(lat, lng, b[0], b[1]) - geodesic_km(a[0], a[1], b[0], b[1])
+        best = int(np.argmin(detour))
+        return int(idx[best]), float(detour[best])
+
+    def insert_meals(self, daily_courses, start=DEFAULT_START, return_to_start=False, k=MEAL_CANDIDATES,
+                     exclude_titles=()):
+        """일별 코스에 점심(오전 방문 뒤)·저녁(마지막 방문 뒤) 식당을 추가한 새 코스 목록
+
+        바로 앞뒤 방문지가 이미 식당이면 그 끼니는 추가하지 않는다. 추가한 장소에는 meal('점심'/'저녁')과
+        detour_km(우회 거리)가 붙는다. exclude_titles 의 이름은 (앞서 보여 준 날의 장소처럼) 다시 고르지 않는다.
+        """
+        if len(self) == 0:
+            return [list(day) for day in daily_courses]
+
+        title_code = {t: i for i, t in enumerate(self.table.titles)}
+        titles = [p.get('title') for day in daily_courses for p in day] + list(exclude_titles)
+        used_titles = {title_code[t] for t in titles if t in title_code}
+        result = []
+        for day in daily_courses:
+            stops = list(day)
+            if not stops:
+                result.append(stops)
+                continue
+            points = [start] + [(p['lat'], p['lng']) for p in stops] + [start if return_to_start else None]
+
+            # (삽입 위치, 끼니): 점심은 첫 방문 뒤, 저녁은 마지막 방문 뒤
+            meals = [(1, '점심'), (len(stops), '저녁')] if len(stops) > 1 else [(1, '점심')]
+            inserted = []
+            for position, meal in meals:
+                before = stops[position - 1]
+                after = stops[position] if position < len(stops) else None
+                if before.get('category') == self.category or (after and after.get('category') == self.category):
+                    continue
+                a = points[position]
+                b = points[position + 1] or a  # 마지막 방문 뒤에 돌아갈 곳이 없으면 그 자리에서
+                place_idx, detour = self.best_stop(a, b, used_titles, k=k)
+                if place_idx is None:
+                    continue
+                used_titles.add(int(self.table.title_code[place_idx]))
+                inserted.append((position, dict(self.table.markers[place_idx], meal=meal, detour_km=detour)))
+
+            # 뒤쪽부터 넣어야 앞쪽 삽입 위치가 밀리지 않음
+            for position, stop in sorted(inserted, key=lambda item: -item[0]):
+                stops.insert(position, stop)
+            result.append(stops)
+        return result
+
+#################################################
+# 추천 결과 캐시
+#################################################
+
+class CourseCache:
+    """요청 조건별 추천 결과를 보관하는 LRU 캐시 (여러 세션이 공유하므로 잠금 사용)"""
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(version, language, travel_styles, num_days, include_children, start, **options):
+        """캐시 키 - 스타일은 순서와 무관하게 정렬, 추가 옵션은 이름순으로 포함"""
+        return (
+            version, language, tuple(sorted(travel_styles)), int(num_days), bool(include_children),
+            (round(float(start[0]), 6), round(float(start[1]), 6)),
+            tuple(sorted(options.items())),
+        )
+
+    def get(self, key):
+        """저장된 결과 반환 (없으면 None)"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        """결과 저장 - 용량을 넘으면 가장 오래 쓰지 않은 항목부터 제거"""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        """캐시에 없으면 compute()로 계산해 저장"""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """적중률 등 캐시 지표"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+#################################################
+# 추천 진입점
+#################################################
+
+def iter_recommend(table, travel_styles, num_days, include_children, style_weights,
+                   places_per_day=3, start=DEFAULT_START, optimize=False,
+                   budget_minutes=DAY_BUDGET_MINUTES, time_limit=OPTIMIZE_TIME_LIMIT,
+                   partition_days=False, workers=None, weekdays=None, active=None, return_to_start=False,
+                   diversity=None):
+    """장소 테이블에서 일별 추천 코스를 하루씩 생성 (Day 1 이 준비되는 즉시 yield)
+
+    optimize=True면 동선 최적화 단계를, partition_days=True면 지역별 일정 분할 단계를 추가
+    weekdays(일자별 요일, 월=0)를 주면 각 방문 시간대에 문을 연 장소만 배정
+    active(장소별 bool, 예: 여행 기간에 진행 중인 행사)를 주면 True 인 장소만 후보로 사용
+    return_to_start=True면 (숙소처럼) 매일 출발점으로 돌아오는 이동까지 최적화에 반영
+    diversity(MMR trade_off, 0~1)를 주면 점수 순 대신 카테고리/위치가 겹치지 않게 후보 선택
+    """
+    scores = score_places(table, travel_styles, include_children, style_weights)
+    if weekdays is not None and not table.has_hours:
+        weekdays = None  # 운영시간 정보가 없으면 제약 없음
+    if active is not None:
+        scores[~active] = -np.inf
+
+    # 상위 N개 장소 선택 (N = 전체 방문 수 * 2)
+    total_places = num_days * places_per_day
+    if diversity is not None:
+        candidates = diverse_top_k(table, scores, total_places * 2, trade_off=diversity)
+    else:
+        candidates = top_k_stable(scores, total_places * 2)
+        if active is not None:
+            candidates = candidates[np.isfinite(scores[candidates])]
+
+    if partition_days and num_days > 1:
+        return iter_partitioned_days(table, candidates, scores, num_days, places_per_day, start,
+                                     optimize=optimize, budget_minutes=budget_minutes,
+                                     time_limit=time_limit, return_to_start=return_to_start,
+                                     workers=workers, weekdays=weekdays)
+    if optimize:
+        return iter_optimized_days(table, candidates, scores, num_days, places_per_day, start,
+                                   budget_minutes=budget_minutes, time_limit=time_limit,
+                                   return_to_start=return_to_start, weekdays=weekdays)
+    return iter_greedy_days(table, candidates, scores, num_days, places_per_day, start,
+                            weekdays=weekdays)
+
+
+def recommend(table, travel_styles, num_days, include_children, style_weights, **options):
+    """장소 테이블에서 일별 추천 코스 목록 생성 (옵션은 iter_recommend 와 같음)"""
+    return list(iter_recommend(table, travel_styles, num_days, include_children, style_weights, **options))
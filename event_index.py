@@ -0,0 +1,226 @@
+"""행사/전시 기간 색인 - 시작/종료일 파싱과 구간 트리(centered interval tree) 질의
+
+여행 기간과 겹치는 행사를 O(log n + k)에 찾는다. 기간 정보가 없는 장소는 항상 진행 중으로 본다.
+"""
+import calendar
+import re
+from collections import Counter
+from datetime import date
+
+import numpy as np
+
+#################################################
+# 상수
+#################################################
+
+# 기간 열 후보 (시작/종료가 따로 있거나 '기간' 한 열에 함께 있는 경우)
+START_DATE_COLUMNS = ['시작일', '행사시작일', '전시시작일', '개막일', 'STRTDATE', 'START_DATE', 'BEGIN_DE']
+END_DATE_COLUMNS = ['종료일', '행사종료일', '전시종료일', '폐막일', 'END_DATE', 'ENDDATE', 'END_DE']
+PERIOD_COLUMNS = ['기간', '행사기간', '전시기간', '운영기간', 'DATE', 'PERIOD']
+# 기간 열이 없을 때 날짜를 찾아볼 설명 열
+DETAIL_COLUMNS = ['상세(한국어)', '상세', '명칭(한국어)']
+
+_FULL_DATE = r'(20\d{2})\s*[.\-/년]\s*(\d{1,2})\s*[.\-/월]\s*(\d{1,2})\s*일?'
+FULL_RANGE_RE = re.compile(
+    _FULL_DATE + r'(?:\s*\([^)]*\))?\s*(?:~|-|–|부터)\s*(?:(20\d{2})\s*[.\-/년]\s*)?(?:(\d{1,2})\s*[.\-/월]\s*)?(\d{1,2})\s*일?'
+)
+FULL_DATE_RE = re.compile(_FULL_DATE)
+YEAR_RE = re.compile(r'(20\d{2})\s*년?')
+MONTH_DAY_RE = re.compile(r'(?<!\d)(\d{1,2})\s*월\s*(\d{1,2})\s*일')
+MONTH_RANGE_RE = re.compile(r'(?<!\d)(\d{1,2})\s*월?\s*(?:~|-|–|,)\s*(\d{1,2})\s*월')
+MONTH_RE = re.compile(r'(?<!\d)(\d{1,2})\s*월(?!\s*\d)')
+
+#################################################
+# 날짜 파싱
+#################################################
+
+def _safe_date(year, month, day):
+    """범위를 벗어난 값이면 None"""
+    try:
+        return date(int(year), int(month), int(day))
+    except (TypeError, ValueError):
+        return None
+
+
+def _month_end(year, month):
+    return date(year, month, calendar.monthrange(year, month)[1])
+
+
+def to_date(value):
+    """엑셀 셀 값(날짜/문자열) → date (해석 불가면 None)"""
+    if value is None or value != value:
+        return None
+    if hasattr(value, 'date') and callable(value.date):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    match = FULL_DATE_RE.search(str(value))
+    if match:
+        return _safe_date(*match.groups())
+    digits = re.sub(r'\D', '', str(value))
+    if len(digits) == 8:
+        return _safe_date(digits[:4], digits[4:6], digits[6:])
+    return None
+
+
+def infer_reference_year(texts):
+    """설명 문구에 가장 많이 나온 연도 (월만 적힌 행사의 연도 추정용)"""
+    counts = Counter(int(y) for text in texts if isinstance(text, str) for y in YEAR_RE.findall(text))
+    return counts.most_common(1)[0][0] if counts else None
+
+
+def parse_event_period(text, default_year=None):
+    """문구에서 행사 기간 (시작일, 종료일) 추출 - 찾지 못하면 None
+
+    '2025.04.01 ~ 2025.04.30', '2025-04-01~30', '4월10일', '4월-5월', '5,6월', '(4월)' 형태를 인식하며,
+    연도가 없으면 문구 속 연도 → default_year 순으로 사용한다.
+    """
+    if not isinstance(text, str) or not text.strip():
+        return None
+
+    match = FULL_RANGE_RE.search(text)
+    if match:
+        y1, m1, d1, y2, m2, d2 = match.groups()
+        start = _safe_date(y1, m1, d1)
+        end = _safe_date(y2 or y1, m2 or m1, d2)
+        if start and end and start <= end:
+            return start, end
+    match = FULL_DATE_RE.search(text)
+    if match:
+        day = _safe_date(*match.groups())
+        if day:
+            return day, day
+
+    year_match = YEAR_RE.search(text)
+    year = int(year_match.group(1)) if year_match else default_year
+    if year is None:
+        return None
+
+    match = MONTH_DAY_RE.search(text)
+    if match:
+        day = _safe_date(year, *match.groups())
+        if day:
+            return day, day
+    match = MONTH_RANGE_RE.search(text)
+    if match:
+        first, last = int(match.group(1)), int(match.group(2))
+        if 1 <= first <= last <= 12:
+            return date(year, first, 1), _month_end(year, last)
+    match = MONTH_RE.search(text)
+    if match and 1 <= int(match.group(1)) <= 12:
+        month = int(match.group(1))
+        return date(year, month, 1), _month_end(year, month)
+    return None
+
+
+def row_event_period(row, default_year=None):
+    """데이터프레임 행의 기간 열(없으면 설명 열)에서 행사 기간 추출"""
+    start = next((to_date(row[c]) for c in START_DATE_COLUMNS if c in row and to_date(row[c])), None)
+    end = next((to_date(row[c]) for c in END_DATE_COLUMNS if c in row and to_date(row[c])), None)
+    if start or end:
+        start, end = start or end, end or start
+        return (start, end) if start <= end else (end, start)
+
+    for column in PERIOD_COLUMNS + DETAIL_COLUMNS:
+        if column in row:
+            period = parse_event_period(row[column], default_year)
+            if period:
+                return period
+    return None
+
+#################################################
+# 구간 트리
+#################################################
+
+class IntervalTree:
+    """정수 닫힌 구간 [start, end] 의 중심 구간 트리 - 겹치는 구간 질의 O(log n + k)"""
+
+    __slots__ = ('center', 'by_start', 'by_end', 'left', 'right')
+
+    def __init__(self, starts, ends, ids=None):
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.asarray(ends, dtype=np.int64)
+        ids = np.arange(len(starts)) if ids is None else np.asarray(ids, dtype=np.int64)
+        self.left = self.right = None
+        self.by_start = self.by_end = None
+        self.center = 0
+        if len(ids) == 0:
+            return
+
+        endpoints = np.concatenate([starts, ends])
+        self.center = int(np.median(endpoints))
+        here = (starts <= self.center) & (ends >= self.center)
+        left = ends < self.center
+        right = starts > self.center
+
+        # 중심을 포함하는 구간: 시작일 오름차순 / 종료일 내림차순 두 벌로 보관
+        order = np.argsort(starts[here], kind='stable')
+        self.by_start = (starts[here][order], ids[here][order])
+        order = np.argsort(-ends[here], kind='stable')
+        self.by_end = (ends[here][order], ids[here][order])
+
+        if left.any():
+            self.left = IntervalTree(starts[left], ends[left], ids[left])
+        if right.any():
+            self.right = IntervalTree(starts[right], ends[right], ids[right])
+
+    def query(self, lo, hi):
+        """[lo, hi] 와 겹치는 구간 id 목록"""
+        found = []
+        node = self
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node is None or node.by_start is None:
+                continue
+            if hi < node.center:
+                # 중심보다 왼쪽 질의: 시작일이 hi 이하인 앞부분만
+                starts, ids = node.by_start
+                found.append(ids[:np.searchsorted(starts, hi, side='right')])
+                stack.append(node.left)
+            elif lo > node.center:
+                # 중심보다 오른쪽 질의: 종료일이 lo 이상인 앞부분만
+                ends, ids = node.by_end
+                found.append(ids[:np.searchsorted(-ends, -lo, side='right')])
+                stack.append(node.right)
+            else:
+                found.append(node.by_start[1])
+                stack.append(node.left)
+                stack.append(node.right)
+        if not found:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate(found)
+
+#################################################
+# 행사 색인
+#################################################
+
+class EventIndex:
+    """마커 목록의 행사 기간 색인 - 기간이 없는 장소는 항상 진행 중"""
+
+    def __init__(self, markers):
+        self.size = len(markers)
+        dated, starts, ends = [], [], []
+        for i, marker in enumerate(markers):
+            if marker.get('event_start') and marker.get('event_end'):
+                dated.append(i)
+                starts.append(date.fromisoformat(marker['event_start']).toordinal())
+                ends.append(date.fromisoformat(marker['event_end']).toordinal())
+        self.dated = np.asarray(dated, dtype=np.int64)
+        self.tree = IntervalTree(starts, ends, self.dated)
+        # 기간 없는 장소는 항상 True 인 기본 마스크
+        self._undated = np.ones(self.size, dtype=bool)
+        self._undated[self.dated] = False
+
+    def __len__(self):
+        return len(self.dated)
+
+    def query(self, start, end):
+        """start~end 기간에 진행 중인 (기간이 있는) 행사 마커 인덱스"""
+        return np.sort(self.tree.query(start.toordinal(), end.toordinal()))
+
+    def active_mask(self, start, end):
+        """기간 중 방문할 수 있는 장소 마스크 (기간 없는 장소 + 겹치는 행사)"""
+        mask = self._undated.copy()
+        mask[self.query(start, end)] = True
+        return mask
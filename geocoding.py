@@ -0,0 +1,268 @@
+"""주소 일괄 지오코딩 - 주소 → 좌표 영구 캐시, 교체 가능한 백엔드, 요청 속도 제한
+
+배치 실행:
+    python geocoding.py                                   # 로컬 대체 지오코더 (오프라인)
+    python geocoding.py --backend nominatim --user-agent seoul-trip-app
+입력(final_all_loc_all_fin_2.csv)의 주소마다 좌표를 찾아 Latitude/Longitude 열을 붙여 저장한다.
+이전 결과(--previous)와 주소가 같은 행, 캐시에 있는 주소는 다시 조회하지 않는다.
+"""
+import argparse
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pandas as pd
+
+from hotels import HOTEL_DATA_PATH, load_hotel_dataframe
+
+#################################################
+# 상수
+#################################################
+
+GEOCODE_INPUT_PATH = "final_all_loc_all_fin_2.csv"
+GEOCODE_OUTPUT_PATH = os.path.join("data", "hotels_geocoded.csv")
+GEOCODE_CACHE_PATH = os.path.join("data", "geocode_cache.json")
+
+ADDRESS_COLUMN = '주소'
+KEY_COLUMN = 'Hotel'
+LAT_COLUMN = 'Latitude'
+LNG_COLUMN = 'Longitude'
+
+# Nominatim 이용 정책: 초당 1건
+DEFAULT_MIN_INTERVAL = 1.0
+DEFAULT_WORKERS = 4
+DEFAULT_RETRIES = 2
+# 조회 결과 몇 건마다 캐시 파일에 중간 저장할지
+SAVE_EVERY = 50
+
+#################################################
+# 주소 정규화 / 캐시
+#################################################
+
+def normalize_address(address):
+    """캐시 키용 주소 정규화 - 쉼표/공백 차이 무시 ('전주, 현무3길 56' == '전주 현무3길 56')"""
+    if address is None or address != address:
+        return ""
+    return re.sub(r'\s+', ' ', re.sub(r'[,，]', ' ', str(address))).strip()
+
+
+class GeocodeCache:
+    """정규화 주소 → [위도, 경도] (찾지 못한 주소는 None) JSON 파일 캐시"""
+
+    def __init__(self, path=GEOCODE_CACHE_PATH):
+        self.path = path
+        self.entries = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                self.entries = {}
+        self.dirty = False
+
+    def __contains__(self, address):
+        return address in self.entries
+
+    def get(self, address):
+        value = self.entries.get(address)
+        return tuple(value) if value else None
+
+    def put(self, address, coords):
+        self.entries[address] = list(coords) if coords else None
+        self.dirty = True
+
+    def save(self):
+        """변경이 있으면 저장 (임시 파일에 쓴 뒤 교체)"""
+        if not self.dirty or not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+#################################################
+# 백엔드
+#################################################
+
+class GeopyBackend:
+    """geopy 지오코더 백엔드 (provider: nominatim, googlev3, kakao 등 geopy 서비스 이름)"""
+
+    def __init__(self, provider="nominatim", timeout=10, **options):
+        from geopy.geocoders import get_geocoder_for_service
+        self.geocoder = get_geocoder_for_service(provider)(timeout=timeout, **options)
+
+    def __call__(self, address):
+        location = self.geocoder.geocode(address)
+        return (location.latitude, location.longitude) if location else None
+
+
+class LocalGeocoder:
+    """오프라인 대체 지오코더 - 이미 좌표가 있는 주소 표에서 정규화 주소로 찾음 (테스트/재현용)"""
+
+    def __init__(self, known):
+        self.known = {normalize_address(address): coords for address, coords in known.items()}
+        self.calls = 0
+
+    @classmethod
+    def from_hotels(cls, path=HOTEL_DATA_PATH):
+        """좌표가 붙은 호텔 CSV 에서 주소 표 생성"""
+        df = load_hotel_dataframe(path, columns=[ADDRESS_COLUMN, LAT_COLUMN, LNG_COLUMN])
+        if df.empty:
+            return cls({})
+        df = df.dropna(subset=[ADDRESS_COLUMN, LAT_COLUMN, LNG_COLUMN])
+        return cls({row[ADDRESS_COLUMN]: (float(row[LAT_COLUMN]), float(row[LNG_COLUMN]))
+                    for _, row in df.iterrows()})
+
+    def __call__(self, address):
+        self.calls += 1
+        return self.known.get(normalize_address(address))
+
+
+class RateLimiter:
+    """여러 스레드가 공유하는 호출 간격 제한 - 호출 시작 시각이 min_interval 이상 벌어지도록 대기"""
+
+    def __init__(self, min_interval=DEFAULT_MIN_INTERVAL):
+        self.min_interval = min_interval
+        self.lock = threading.Lock()
+        self.next_time = 0.0
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_time)
+            self.next_time = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
+
+#################################################
+# 일괄 지오코딩
+#################################################
+
+def _lookup(backend, limiter, address, retries):
+    """속도 제한을 지키며 주소 하나 조회 - (주소, 좌표 또는 None, 오류 메시지 또는 None)"""
+    error = None
+    for attempt in range(retries + 1):
+        limiter.wait()
+        try:
+            return address, backend(address), None
+        except Exception as e:  # 네트워크/서비스 오류는 캐시하지 않고 다음 실행에서 다시 시도
+            error = f"{type(e).__name__}: {e}"
+            time.sleep(limiter.min_interval * (2 ** attempt))
+    return address, None, error
+
+
+def geocode_dataframe(df, backend, cache, previous=None, address_column=ADDRESS_COLUMN, key_column=KEY_COLUMN,
+                      workers=DEFAULT_WORKERS, min_interval=DEFAULT_MIN_INTERVAL, retries=DEFAULT_RETRIES,
+                      retry_failed=False, progress=None):
+    """데이터프레임 주소에 좌표 열을 붙인 사본과 통계 반환
+
+    1. previous(이전 결과)에 같은 키·같은 주소의 좌표가 있으면 그대로 사용
+    2. 나머지는 캐시 확인 (retry_failed=True면 찾지 못했던 주소도 다시 조회)
+    3. 캐시에 없는 주소만 workers 개 스레드로 조회 (전체 호출 간격 min_interval 초)
+    """
+    out = df.copy()
+    addresses = out[address_column].map(normalize_address)
+    lat = pd.Series(float('nan'), index=out.index)
+    lng = pd.Series(float('nan'), index=out.index)
+    stats = {'rows': len(out), 'reused': 0, 'cached': 0, 'looked_up': 0, 'not_found': 0, 'errors': 0}
+
+    # 1. 이전 결과에서 주소가 바뀌지 않은 행
+    unchanged = pd.Series(False, index=out.index)
+    if previous is not None and not previous.empty and key_column in previous.columns:
+        prev = previous.dropna(subset=[LAT_COLUMN, LNG_COLUMN]).drop_duplicates(subset=key_column)
+        prev = prev.set_index(key_column)
+        prev_address = prev[address_column].map(normalize_address)
+        keys = out[key_column]
+        known = keys.isin(prev.index)
+        same = known & (keys.map(prev_address) == addresses)
+        lat[same] = keys[same].map(prev[LAT_COLUMN])
+        lng[same] = keys[same].map(prev[LNG_COLUMN])
+        unchanged = same
+        stats['reused'] = int(same.sum())
+        for address, row_lat, row_lng in zip(addresses[same], lat[same], lng[same]):
+            if address not in cache:
+                cache.put(address, (float(row_lat), float(row_lng)))
+
+    # 2. 캐시
+    pending = []
+    for address in addresses[~unchanged].unique():
+        if not address:
+            continue
+        if address in cache and (cache.get(address) is not None or not retry_failed):
+            continue
+        pending.append(address)
+
+    # 3. 캐시에 없는 주소 조회
+    fresh = set()
+    if pending:
+        limiter = RateLimiter(min_interval)
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            futures = [executor.submit(_lookup, backend, limiter, address, retries) for address in pending]
+            for done, future in enumerate(as_completed(futures), 1):
+                address, coords, error = future.result()
+                if error is not None:
+                    stats['errors'] += 1
+                    continue
+                cache.put(address, coords)
+                fresh.add(address)
+                stats['looked_up'] += 1
+                stats['not_found'] += coords is None
+                if done % SAVE_EVERY == 0:
+                    cache.save()
+                if progress is not None:
+                    progress(done, len(pending))
+        cache.save()
+
+    for idx in out.index[~unchanged]:
+        coords = cache.get(addresses[idx])
+        if coords is not None:
+            lat[idx], lng[idx] = coords
+            stats['cached'] += addresses[idx] not in fresh
+
+    out[LAT_COLUMN] = lat
+    out[LNG_COLUMN] = lng
+    return out, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="호텔 주소 일괄 지오코딩")
+    parser.add_argument("--input", default=GEOCODE_INPUT_PATH)
+    parser.add_argument("--output", default=GEOCODE_OUTPUT_PATH)
+    parser.add_argument("--previous", default=GEOCODE_OUTPUT_PATH, help="이전 결과 (주소가 같은 행은 다시 조회하지 않음)")
+    parser.add_argument("--cache", default=GEOCODE_CACHE_PATH)
+    parser.add_argument("--backend", default="local", help="local 또는 geopy 서비스 이름 (nominatim 등)")
+    parser.add_argument("--user-agent", default="seoul-trip-app", help="nominatim 등 서비스에 보낼 User-Agent")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--min-interval", type=float, default=DEFAULT_MIN_INTERVAL, help="조회 간 최소 간격 (초)")
+    parser.add_argument("--retry-failed", action="store_true", help="찾지 못했던 주소도 다시 조회")
+    args = parser.parse_args()
+
+    if args.backend == "local":
+        backend = LocalGeocoder.from_hotels()
+        min_interval = 0.0
+    else:
+        backend = GeopyBackend(args.backend, user_agent=args.user_agent)
+        min_interval = args.min_interval
+
+    df = load_hotel_dataframe(args.input)
+    previous = load_hotel_dataframe(args.previous) if args.previous else None
+    cache = GeocodeCache(args.cache)
+
+    start = time.perf_counter()
+    out, stats = geocode_dataframe(
+        df, backend, cache, previous=previous, workers=args.workers, min_interval=min_interval,
+        retry_failed=args.retry_failed,
+        progress=lambda done, total: print(f"\r조회 {done}/{total}", end="", flush=True)
+    )
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    out.to_csv(args.output, index=False, encoding="utf-8-sig")
+    print(f"\n{args.output} 저장 ({time.perf_counter() - start:.1f}초): {stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""숙소 주변 장소 - 호텔 × 관광 장소 공간 조인을 미리 계산해 열 단위로 저장
+
+배치 실행: python hotel_proximity.py [--language 한국어] [--radii 0.5 1 2]
+결과는 data/hotel_proximity.npz 에 저장되며, 앱은 요청마다 거리를 계산하지 않고
+저장된 개수 열에 가중치를 곱해 "궁궐·맛집 가까운 숙소" 같은 순위를 바로 만든다.
+"""
+import argparse
+import logging
+import os
+import time
+
+import numpy as np
+
+import course_engine
+from hotels import HOTEL_DATA_PATH, load_hotels
+from spatial_index import GridIndex
+
+PROXIMITY_PATH = os.path.join("data", "hotel_proximity.npz")
+PROXIMITY_FORMAT = 1
+
+# 도보 반경 (km) - 약 7분 / 15분 / 30분 거리
+WALK_RADII_KM = (0.5, 1.0, 2.0)
+# 호텔마다 저장할 가장 가까운 관광지 수와 찾아볼 최대 거리 (서울 밖 호텔은 비워 둠)
+NEAREST_ATTRACTIONS = 5
+NEAREST_MAX_KM = 10.0
+# 가장 가까운 관광지에서 제외할 카테고리 (식당은 개수 열로만 반영)
+NON_ATTRACTION_CATEGORIES = (course_engine.MEAL_CATEGORY,)
+
+#################################################
+# 공간 조인
+#################################################
+
+def unique_places(table, markers):
+    """같은 카테고리·같은 좌표의 중복 장소를 하나로 (정보가 더 많은 마커 우선) - 인덱스 배열
+
+    종로구 관광지처럼 언어별 파일에 같은 장소가 나뉘어 있으면 개수가 두 번 세어지는 것을 막는다.
+    """
+    completeness = np.fromiter((len(m.get('names', {})) for m in markers), dtype=np.int64, count=len(markers))
+    order = np.argsort(-completeness, kind='stable')
+    keys = np.column_stack([table.category_code[order], table.lat[order], table.lng[order]])
+    _, first = np.unique(keys, axis=0, return_index=True)
+    return np.sort(order[first])
+
+
+def build_proximity(hotels, markers, radii_km=WALK_RADII_KM, nearest=NEAREST_ATTRACTIONS,
+                    nearest_max_km=NEAREST_MAX_KM, cell_km=0.5):
+    """호텔별 반경 내 카테고리별 장소 수와 가장 가까운 관광지 계산
+
+    장소 격자 색인에서 가장 큰 반경 안의 장소를 호텔마다 한 번만 찾은 뒤 (거리순),
+    반경마다 거리로 잘라 카테고리 코드를 bincount 하고, 앞에서부터 관광지 k곳을 고른다.
+    """
+    radii_km = tuple(sorted(float(r) for r in radii_km))
+    table = course_engine.PlaceTable(markers)
+    places = unique_places(table, markers)
+    grid = GridIndex(table.lat[places], table.lng[places], cell_km=cell_km)
+    num_categories = len(table.categories)
+    reach_km = max(radii_km[-1], nearest_max_km)
+
+    counts = np.zeros((len(hotels), len(radii_km), num_categories), dtype=np.uint16)
+    nearest_index = np.full((len(hotels), nearest), -1, dtype=np.int32)
+    nearest_km = np.full((len(hotels), nearest), np.nan, dtype=np.float32)
+    attraction = ~np.isin(table.category_code,
+                          [i for i, c in enumerate(table.categories) if c in NON_ATTRACTION_CATEGORIES])
+
+    for h, hotel in enumerate(hotels):
+        idx, dist = grid.within(hotel['lat'], hotel['lng'], reach_km)
+        idx = places[idx]
+        codes = table.category_code[idx]
+        for r, radius in enumerate(radii_km):
+            # within 결과는 거리 오름차순이므로 반경별 경계만 찾으면 됨
+            inside = np.searchsorted(dist, radius, side='right')
+            counts[h, r] = np.minimum(np.bincount(codes[:inside], minlength=num_categories), np.iinfo(np.uint16).max)
+        closest = np.flatnonzero(attraction[idx])[:nearest]
+        nearest_index[h, :len(closest)] = idx[closest]
+        nearest_km[h, :len(closest)] = dist[closest]
+
+    place_ids = np.array([m.get('place_id', '') for m in markers], dtype=object)
+    used = np.unique(nearest_index[nearest_index >= 0])
+    # 가장 가까운 관광지로 쓰인 장소만 id/이름을 남기고 인덱스를 그 목록 기준으로 바꿈
+    remap = np.full(len(markers), -1, dtype=np.int32)
+    remap[used] = np.arange(len(used))
+    nearest_local = np.where(nearest_index >= 0, remap[np.maximum(nearest_index, 0)], -1).astype(np.int32)
+
+    return {
+        'format': np.int32(PROXIMITY_FORMAT),
+        'places_version': np.str_(table.version),
+        'hotel_titles': np.array([h['title'] for h in hotels], dtype=str),
+        'categories': np.array(table.categories, dtype=str),
+        'radii_km': np.array(radii_km, dtype=np.float32),
+        'counts': counts,
+        'nearest_index': nearest_local,
+        'nearest_km': nearest_km,
+        'place_ids': place_ids[used].astype(str),
+        'place_titles': np.array([str(markers[i].get('title', '')) for i in used], dtype=str),
+    }
+
+
+def save_proximity(columns, path=PROXIMITY_PATH):
+    """압축 npz 로 저장 (임시 파일에 쓴 뒤 교체)"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp.npz"
+    np.savez_compressed(tmp_path, **columns)
+    os.replace(tmp_path, path)
+
+#################################################
+# 조회
+#################################################
+
+class HotelProximity:
+    """미리 계산한 호텔 주변 장소 열 - 순위/조회에 거리 계산 없음"""
+
+    def __init__(self, columns):
+        self.hotel_titles = columns['hotel_titles'].tolist()
+        self.categories = columns['categories'].tolist()
+        self.radii_km = columns['radii_km'].astype(np.float64).tolist()
+        self.counts = columns['counts']
+        self.nearest_index = columns['nearest_index']
+        self.nearest_km = columns['nearest_km']
+        self.place_ids = columns['place_ids'].tolist()
+        self.place_titles = columns['place_titles'].tolist()
+        self.places_version = str(columns['places_version'])
+        self.by_title = {title: i for i, title in enumerate(self.hotel_titles)}
+
+    @classmethod
+    def build(cls, hotels, markers, **options):
+        """저장본 없이 바로 계산 (옵션은 build_proximity 와 같음)"""
+        return cls(build_proximity(hotels, markers, **options))
+
+    @classmethod
+    def load(cls, path=PROXIMITY_PATH, places_version=None):
+        """저장된 열 로드 (없거나 형식이 다르면 None)
+
+        places_version(PlaceTable.version)을 주면 그 장소 데이터로 계산한 저장본일 때만 사용하고,
+        장소 동기화 등으로 데이터가 바뀌었으면 오래된 거리 대신 None.
+        """
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                columns = {key: data[key] for key in data.files}
+        except (OSError, ValueError):
+            return None
+        if int(columns.get('format', -1)) != PROXIMITY_FORMAT:
+            return None
+        if places_version is not None and str(columns.get('places_version')) != places_version:
+            return None
+        return cls(columns)
+
+    def _radius_index(self, radius_km):
+        """가장 가까운 저장 반경 번호"""
+        return int(np.argmin(np.abs(np.asarray(self.radii_km) - radius_km)))
+
+    def counts_for(self, title, radius_km):
+        """호텔 주변 반경 내 카테고리별 장소 수 {카테고리: 개수} (없는 호텔이면 None)"""
+        h = self.by_title.get(title)
+        if h is None:
+            return None
+        row = self.counts[h, self._radius_index(radius_km)]
+        return {category: int(n) for category, n in zip(self.categories, row) if n}
+
+    def nearest_for(self, title):
+        """호텔에서 가장 가까운 관광지 [(장소 id, 이름, 거리 km), ...]"""
+        h = self.by_title.get(title)
+        if h is None:
+            return []
+        return [
+            (self.place_ids[i], self.place_titles[i], float(km))
+            for i, km in zip(self.nearest_index[h], self.nearest_km[h]) if i >= 0
+        ]
+
+    def rank(self, category_weights, radius_km=1.0, titles=None, k=5):
+        """카테고리 가중 장소 수 기준 호텔 순위 [(호텔 이름, 점수), ...]
+
+        category_weights: 카테고리 → 가중치, titles 를 주면 그 호텔들 안에서만 순위 계산
+        """
+        w = np.array([category_weights.get(c, 0.0) for c in self.categories], dtype=np.float64)
+        rows = np.arange(len(self.hotel_titles)) if titles is None else np.array(
+            [self.by_title[t] for t in titles if t in self.by_title], dtype=np.int64)
+        if len(rows) == 0 or not w.any():
+            return []
+        score = self.counts[rows, self._radius_index(radius_km)] @ w
+        order = np.argsort(-score, kind='stable')[:k]
+        return [(self.hotel_titles[rows[i]], float(score[i])) for i in order]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="호텔 × 관광 장소 공간 조인 배치")
+    parser.add_argument("--language", default="한국어")
+    parser.add_argument("--radii", type=float, nargs="+", default=list(WALK_RADII_KM))
+    parser.add_argument("--nearest", type=int, default=NEAREST_ATTRACTIONS)
+    parser.add_argument("--nearest-max-km", type=float, default=NEAREST_MAX_KM)
+    parser.add_argument("--hotels", default=HOTEL_DATA_PATH)
+    parser.add_argument("--output", default=PROXIMITY_PATH)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)  # streamlit bare mode 경고 숨김
+    import streamlit_app
+
+    hotels = load_hotels(args.hotels)
+    markers = streamlit_app.load_excel_files(args.language)
+    print(f"호텔 {len(hotels)}곳, 장소 {len(markers)}개")
+
+    start = time.perf_counter()
+    columns = build_proximity(hotels, markers, radii_km=args.radii, nearest=args.nearest,
+                              nearest_max_km=args.nearest_max_km)
+    save_proximity(columns, args.output)
+    print(f"저장: {args.output} ({os.path.getsize(args.output) / 1024:.1f}KB, {time.perf_counter() - start:.2f}초)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+"""숙소 리뷰 추가 - 추가 전용 리뷰 로그와 호텔별 감성 항목 누적 집계
+
+새 리뷰는 data/hotel_reviews.jsonl 끝에 한 줄씩 붙이고, 호텔별 개수/합/지수 감쇠 합을 리뷰 하나당 O(1)로 갱신한다.
+항목 점수는 CSV 와 같은 척도(-1 ~ 1, 언급이 없으면 0)이며, 호텔 점수는 CSV 점수를 리뷰 BASELINE_WEIGHT 건으로 보고
+추가 리뷰와 시간 감쇠 가중 평균한 값이다.
+집계는 로그의 읽은 위치(바이트)와 함께 스냅샷으로 저장해, 다시 시작할 때 스냅샷 이후에 붙은 줄만 읽는다.
+
+일괄 추가: python hotel_reviews.py reviews.jsonl     # 한 줄에 {"hotel", "location", "scores", "text", "time"}
+스냅샷 재생성: python hotel_reviews.py --rebuild
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from hotels import ASPECT_COLUMNS
+
+#################################################
+# 상수
+#################################################
+
+REVIEW_LOG_PATH = os.path.join("data", "hotel_reviews.jsonl")
+REVIEW_SNAPSHOT_PATH = os.path.join("data", "hotel_review_aggregates.json")
+REVIEW_SNAPSHOT_FORMAT = 1
+
+# 리뷰 가중치가 절반이 되는 기간
+REVIEW_HALF_LIFE_DAYS = 180.0
+# CSV 점수를 리뷰 몇 건 분량으로 볼지 (CSV 점수도 같은 반감기로 옅어짐)
+BASELINE_WEIGHT = 20.0
+# CSV 점수 기준 시각 (hotel_fin_0331_1.csv) - 감쇠 가중치의 기준 시각으로도 씀
+BASELINE_TIME = datetime(2025, 3, 31, tzinfo=timezone.utc).timestamp()
+# 리뷰 몇 건마다 스냅샷을 저장할지
+SNAPSHOT_EVERY = 50
+
+#################################################
+# 누적 집계
+#################################################
+
+class AspectAggregates:
+    """(지역, 호텔) → 리뷰 수, 항목별 합, 지수 감쇠 합/가중치
+
+    감쇠 가중치는 고정 기준 시각(epoch)에서 잰 2^((t - epoch) / 반감기) 로 쌓는다.
+    평균을 낼 때 공통 배율이 약분되므로 리뷰가 들어올 때 예전 값을 다시 감쇠시킬 필요가 없다.
+    CSV 점수는 epoch 시각의 리뷰(가중치 1)로 취급한다.
+    """
+
+    def __init__(self, epoch=BASELINE_TIME, half_life_days=REVIEW_HALF_LIFE_DAYS):
+        self.epoch = float(epoch)
+        self.half_life_days = float(half_life_days)
+        self.stats = {}
+
+    def __len__(self):
+        return len(self.stats)
+
+    def __iter__(self):
+        return iter(self.stats)
+
+    def __contains__(self, key):
+        return key in self.stats
+
+    def _weight(self, timestamp):
+        return 2.0 ** ((timestamp - self.epoch) / (self.half_life_days * 86400))
+
+    def add(self, location, hotel, scores, timestamp):
+        """리뷰 하나 반영 (scores: 항목명 → 점수, 빠진 항목은 0)"""
+        values = np.array([float(scores.get(col, 0.0)) for col in ASPECT_COLUMNS], dtype=np.float64)
+        stat = self.stats.get((location, hotel))
+        if stat is None:
+            stat = self.stats[location, hotel] = {
+                'count': 0, 'sum': np.zeros(len(ASPECT_COLUMNS)), 'decayed_sum': np.zeros(len(ASPECT_COLUMNS)),
+                'decayed_weight': 0.0, 'last_time': timestamp,
+            }
+        weight = self._weight(timestamp)
+        stat['count'] += 1
+        stat['sum'] += values
+        stat['decayed_sum'] += weight * values
+        stat['decayed_weight'] += weight
+        stat['last_time'] = max(stat['last_time'], timestamp)
+
+    def count(self, location, hotel):
+        stat = self.stats.get((location, hotel))
+        return stat['count'] if stat else 0
+
+    def mean(self, location, hotel):
+        """추가 리뷰만의 단순 평균 {항목명: 점수} (리뷰가 없으면 None)"""
+        stat = self.stats.get((location, hotel))
+        if not stat:
+            return None
+        return dict(zip(ASPECT_COLUMNS, (stat['sum'] / stat['count']).tolist()))
+
+    def blended(self, location, hotel, baseline=None, baseline_weight=BASELINE_WEIGHT):
+        """CSV 점수(baseline, 기준 시각의 리뷰 baseline_weight 건)와 추가 리뷰의 감쇠 가중 평균 {항목명: 점수}"""
+        stat = self.stats.get((location, hotel))
+        base = np.array([(baseline or {}).get(col, 0.0) for col in ASPECT_COLUMNS], dtype=np.float64)
+        prior = baseline_weight if baseline else 0.0
+        if not stat or prior + stat['decayed_weight'] <= 0:
+            return dict(zip(ASPECT_COLUMNS, base.tolist())) if baseline else None
+        values = (prior * base + stat['decayed_sum']) / (prior + stat['decayed_weight'])
+        return dict(zip(ASPECT_COLUMNS, values.tolist()))
+
+    def to_json(self):
+        return {
+            'epoch': self.epoch,
+            'half_life_days': self.half_life_days,
+            'hotels': [
+                {'location': location, 'hotel': hotel, 'count': stat['count'], 'sum': stat['sum'].tolist(),
+                 'decayed_sum': stat['decayed_sum'].tolist(), 'decayed_weight': stat['decayed_weight'],
+                 'last_time': stat['last_time']}
+                for (location, hotel), stat in self.stats.items()
+            ],
+        }
+
+    @classmethod
+    def from_json(cls, data):
+        aggregates = cls(data['epoch'], data['half_life_days'])
+        for item in data['hotels']:
+            aggregates.stats[item['location'], item['hotel']] = {
+                'count': int(item['count']),
+                'sum': np.array(item['sum'], dtype=np.float64),
+                'decayed_sum': np.array(item['decayed_sum'], dtype=np.float64),
+                'decayed_weight': float(item['decayed_weight']),
+                'last_time': float(item['last_time']),
+            }
+        return aggregates
+
+#################################################
+# 리뷰 로그
+#################################################
+
+def normalize_review(review):
+    """리뷰 한 건 검증/정리 - hotel, location 필수, 점수는 -1 ~ 1 로 자름 (잘못된 값이면 ValueError)"""
+    hotel = str(review.get('hotel') or '').strip()
+    location = str(review.get('location') or '').strip()
+    if not hotel or not location:
+        raise ValueError("hotel 과 location 이 필요합니다")
+    scores = {}
+    for aspect, value in (review.get('scores') or {}).items():
+        if aspect not in ASPECT_COLUMNS:
+            raise ValueError(f"알 수 없는 항목: {aspect}")
+        scores[aspect] = min(1.0, max(-1.0, float(value)))
+    return {
+        'hotel': hotel,
+        'location': location,
+        'scores': scores,
+        'text': str(review.get('text') or ''),
+        'time': float(review.get('time') or time.time()),
+    }
+
+
+def _lock_file(f):
+    """로그 파일 배타 잠금 - 앱과 일괄 추가 CLI 처럼 여러 프로세스가 함께 쓸 때 (fcntl 이 없으면 생략)"""
+    try:
+        import fcntl
+    except ImportError:
+        return
+    fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+
+class ReviewLog:
+    """추가 전용 리뷰 로그 + 누적 집계 (여러 세션/프로세스가 함께 쓰므로 잠금으로 보호)"""
+
+    def __init__(self, path=REVIEW_LOG_PATH, snapshot_path=REVIEW_SNAPSHOT_PATH,
+                 half_life_days=REVIEW_HALF_LIFE_DAYS):
+        self.path = path
+        self.snapshot_path = snapshot_path
+        self.lock = threading.Lock()
+        self.offset = 0
+        self.pending = 0  # 스냅샷 이후 반영한 리뷰 수
+        self.aggregates = self._load_snapshot(half_life_days)
+        self.replay()
+        if self.pending >= SNAPSHOT_EVERY:
+            self.save_snapshot()
+
+    def _load_snapshot(self, half_life_days):
+        """스냅샷 로드 - 없거나, 형식/반감기가 다르거나, 로그가 스냅샷보다 짧으면 처음부터"""
+        if self.snapshot_path and os.path.exists(self.snapshot_path):
+            try:
+                with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                log_size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+                if (data.get('format') == REVIEW_SNAPSHOT_FORMAT
+                        and data['aggregates']['half_life_days'] == half_life_days
+                        and data['aggregates']['epoch'] == BASELINE_TIME
+                        and data['offset'] <= log_size):
+                    self.offset = int(data['offset'])
+                    return AspectAggregates.from_json(data['aggregates'])
+            except (OSError, ValueError, KeyError):
+                pass
+        self.offset = 0
+        return AspectAggregates(half_life_days=half_life_days)
+
+    def replay(self):
+        """스냅샷 이후 로그에 붙은 줄만 읽어 반영 - 새로 반영한 (지역, 호텔) 목록"""
+        with self.lock:
+            return self._replay_locked()
+
+    def _replay_locked(self):
+        if not os.path.exists(self.path):
+            return []
+        touched = []
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # 쓰는 중인 마지막 줄은 다음에
+                self.offset += len(line)
+                try:
+                    review = json.loads(line)
+                except ValueError:
+                    continue
+                self.aggregates.add(review['location'], review['hotel'], review['scores'], review['time'])
+                self.pending += 1
+                touched.append((review['location'], review['hotel']))
+        return list(dict.fromkeys(touched))
+
+    def append(self, review):
+        """리뷰 한 건을 로그 끝에 쓰고 집계 갱신 - 정리된 리뷰 반환
+
+        다른 프로세스(일괄 추가 CLI 등)가 먼저 붙인 줄이 있으면 그 줄부터 반영한 뒤 쓴다.
+        """
+        review = normalize_review(review)
+        line = (json.dumps(review, ensure_ascii=False) + "\n").encode('utf-8')
+        with self.lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, 'ab') as f:
+                # 읽은 위치 확인부터 쓰기까지 다른 프로세스가 끼어들지 못하게 (파일을 닫으면 풀림)
+                _lock_file(f)
+                self._replay_locked()
+                if f.seek(0, os.SEEK_END) != self.offset:
+                    line = b"\n" + line  # 쓰다 멈춘 프로세스가 남긴 끊긴 줄은 끝맺고 건너뜀
+                f.write(line)
+                f.flush()
+                self.offset = f.tell()
+            self.aggregates.add(review['location'], review['hotel'], review['scores'], review['time'])
+            self.pending += 1
+        if self.pending >= SNAPSHOT_EVERY:
+            self.save_snapshot()
+        return review
+
+    def save_snapshot(self):
+        """집계와 로그 읽은 위치 저장 (임시 파일에 쓴 뒤 교체)"""
+        if not self.snapshot_path:
+            return
+        with self.lock:
+            data = {'format': REVIEW_SNAPSHOT_FORMAT, 'offset': self.offset, 'aggregates': self.aggregates.to_json()}
+            self.pending = 0
+        os.makedirs(os.path.dirname(self.snapshot_path) or ".", exist_ok=True)
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.snapshot_path)
+
+#################################################
+# 순위/색인 반영
+#################################################
+
+def apply_reviews(log, target, keys=None):
+    """추가 리뷰 집계를 호텔 순위(HotelRankings)나 숙소 색인(HotelIndex)에 반영 - 바뀐 호텔 수
+
+    CSV 원래 점수(target.baseline)와 합친 점수로 바꾼다. keys 를 주면 그 (지역, 호텔)만
+    (리뷰 한 건 추가 후에는 그 호텔 하나만 다시 계산).
+    """
+    updated = 0
+    for location, hotel in (list(log.aggregates) if keys is None else keys):
+        baseline = target.baseline(location, hotel)
+        if baseline is None:
+            continue
+        values = log.aggregates.blended(location, hotel, baseline)
+        updated += bool(values is not None and target.update_scores(location, hotel, values))
+    return updated
+
+
+def main():
+    parser = argparse.ArgumentParser(description="호텔 리뷰 일괄 추가 / 집계 스냅샷 관리")
+    parser.add_argument("input", nargs="?", help="추가할 리뷰 JSON Lines 파일")
+    parser.add_argument("--log", default=REVIEW_LOG_PATH)
+    parser.add_argument("--snapshot", default=REVIEW_SNAPSHOT_PATH)
+    parser.add_argument("--rebuild", action="store_true", help="스냅샷을 버리고 로그 전체에서 다시 집계")
+    args = parser.parse_args()
+
+    if args.rebuild and os.path.exists(args.snapshot):
+        os.remove(args.snapshot)
+    start = time.perf_counter()
+    log = ReviewLog(args.log, args.snapshot)
+    print(f"로그 반영: 리뷰 {log.pending}건, 호텔 {len(log.aggregates)}곳 ({time.perf_counter() - start:.2f}초)")
+
+    if args.input:
+        added = failed = 0
+        start = time.perf_counter()
+        with open(args.input, 'r', encoding='utf-8') as f:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    log.append(json.loads(line))
+                    added += 1
+                except ValueError as e:
+                    failed += 1
+                    print(f"{args.input}:{number}: {e}")
+        print(f"추가: {added}건, 실패: {failed}건 ({time.perf_counter() - start:.2f}초)")
+    log.save_snapshot()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,500 @@
+"""숙소 데이터 - 호텔 리뷰 감성 점수 CSV 로드, 공간 색인, 코스 기준 숙소 추천
+
+호텔 CSV(EUC-KR/CP949)는 처음 읽을 때 인코딩을 한 번 판별해 UTF-8 열 저장본(parquet)으로 옮겨 두고,
+이후에는 필요한 열만 읽는다. 긴 리뷰 요약 열은 목록/순위에서 읽지 않고 호텔을 고를 때만 읽는다.
+
+저장본 일괄 생성: python hotels.py [CSV ...] [--force]
+"""
+import argparse
+import codecs
+import io
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+import course_engine
+from spatial_index import GridIndex, KDTree, haversine_km
+
+#################################################
+# 상수
+#################################################
+
+HOTEL_DATA_PATH = "hotel_fin_0331_1.csv"
+HOTEL_ENCODINGS = ["euc-kr", "cp949", "utf-8-sig", "utf-8"]
+# 열 저장본 (원본 CSV 하나당 parquet 하나, 원본 크기/수정 시각이 바뀌면 다시 생성)
+HOTEL_STORE_DIR = os.path.join("data", "hotels")
+HOTEL_STORE_FORMAT = "1"
+HOTEL_SOURCE_PATHS = [HOTEL_DATA_PATH, "final_all_loc_all_fin_2.csv"]
+
+# 긴 리뷰 요약 열 - 목록/순위 계산에서는 읽지 않음
+REVIEW_COLUMNS = ['Refined_Positive', 'Refined_Negative']
+
+# 리뷰 감성 항목 (값이 클수록 긍정)
+ASPECT_COLUMNS = ['소음', '가격', '위치', '서비스', '청결', '편의시설']
+
+# 숙소 추천: 리뷰 점수 1점 = 이동 거리 50km 로 환산
+HOTEL_TRAVEL_WEIGHT = 0.02
+# 코스 중심에서 가까운 숙소 몇 곳을 후보로 볼지
+HOTEL_CANDIDATES = 40
+# 비슷한 숙소 검색 결과 수
+SIMILAR_HOTELS = 5
+
+#################################################
+# 데이터 로드
+#################################################
+
+def detect_encoding(raw):
+    """CSV 바이트의 인코딩 판별 (BOM → UTF-8 → HOTEL_ENCODINGS 순서로 엄격하게 디코딩, 모두 실패하면 None)
+
+    UTF-8 은 바이트 규칙이 엄격해 EUC-KR 파일을 UTF-8 로 잘못 읽는 일이 없으므로 먼저 시도한다.
+    """
+    if raw.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    for encoding in ["utf-8"] + [e for e in HOTEL_ENCODINGS if e not in ("utf-8", "utf-8-sig")]:
+        try:
+            raw.decode(encoding)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return None
+
+
+def _read_csv(path, usecols=None):
+    """호텔 CSV 직접 로드 (인코딩을 차례로 시도) - 열 저장본을 쓸 수 없을 때"""
+    for encoding in HOTEL_ENCODINGS:
+        try:
+            return pd.read_csv(path, encoding=encoding, usecols=usecols)
+        except UnicodeDecodeError:
+            continue
+    return pd.read_csv(path, encoding="utf-8", encoding_errors="replace", usecols=usecols)
+
+
+def hotel_store_path(path, store_dir=HOTEL_STORE_DIR):
+    """원본 CSV 의 열 저장본 경로"""
+    return os.path.join(store_dir, os.path.splitext(os.path.basename(path))[0] + ".parquet")
+
+
+def _source_stamp(path):
+    """원본이 바뀌었는지 판단할 크기/수정 시각"""
+    stat = os.stat(path)
+    return {b'source_size': str(stat.st_size).encode(), b'source_mtime_ns': str(stat.st_mtime_ns).encode()}
+
+
+def _store_is_fresh(path, store):
+    import pyarrow.parquet as pq
+    if not os.path.exists(store):
+        return False
+    try:
+        metadata = pq.read_schema(store).metadata or {}
+    except (OSError, ValueError):
+        return False
+    if metadata.get(b'store_format') != HOTEL_STORE_FORMAT.encode():
+        return False
+    return all(metadata.get(key) == value for key, value in _source_stamp(path).items())
+
+
+def ingest_hotel_csv(path, store_dir=HOTEL_STORE_DIR, force=False):
+    """원본 CSV 를 UTF-8 열 저장본으로 변환 - 저장본 경로 반환 (이미 최신이면 그대로)
+
+    인코딩은 파일 전체 바이트로 한 번만 판별하고, 디코딩한 텍스트를 파싱해 parquet(문자열은 UTF-8)로 저장한다.
+    판별한 원본 인코딩과 원본 크기/수정 시각은 parquet 스키마 메타데이터에 남긴다.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    store = hotel_store_path(path, store_dir)
+    if not force and _store_is_fresh(path, store):
+        return store
+
+    stamp = _source_stamp(path)
+    with open(path, 'rb') as f:
+        raw = f.read()
+    encoding = detect_encoding(raw)
+    text = raw.decode(encoding or "utf-8", errors="strict" if encoding else "replace")
+    df = pd.read_csv(io.StringIO(text))
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        **stamp,
+        b'store_format': HOTEL_STORE_FORMAT.encode(),
+        b'source_encoding': (encoding or "unknown").encode(),
+    })
+    os.makedirs(store_dir, exist_ok=True)
+    tmp_path = store + ".tmp"
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, store)
+    return store
+
+
+def _hotel_store(path):
+    """최신 열 저장본 경로 (pyarrow 가 없거나 저장할 수 없으면 None → CSV 직접 로드)"""
+    try:
+        return ingest_hotel_csv(path)
+    except (ImportError, OSError):
+        return None
+
+
+def load_hotel_dataframe(path=HOTEL_DATA_PATH, columns=None, reviews=True):
+    """호텔 데이터 로드 (파일이 없으면 빈 데이터프레임)
+
+    열 저장본에서 columns 에 해당하는 열만 읽는다 (None 이면 전체). reviews=False 면 리뷰 요약 열은 읽지 않는다.
+    """
+    if not os.path.exists(path):
+        return pd.DataFrame()
+
+    def wanted(column):
+        return (columns is None or column in columns) and (reviews or column not in REVIEW_COLUMNS)
+
+    store = _hotel_store(path)
+    if store is None:
+        return _read_csv(path, usecols=wanted)
+    import pyarrow.parquet as pq
+    names = [column for column in pq.read_schema(store).names if wanted(column)]
+    return pd.read_parquet(store, columns=names)
+
+
+def load_hotel_reviews(path=HOTEL_DATA_PATH, hotel=None, region=None):
+    """리뷰 요약 열 로드 - Hotel, Location, Refined_Positive, Refined_Negative (hotel/region 을 주면 그 행만)"""
+    columns = ['Hotel', 'Location'] + REVIEW_COLUMNS
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=columns)
+    filters = [(column, '==', value) for column, value in (('Hotel', hotel), ('Location', region))
+               if value is not None]
+    store = _hotel_store(path)
+    if store is not None:
+        import pyarrow.parquet as pq
+        names = [column for column in columns if column in pq.read_schema(store).names]
+        return pd.read_parquet(store, columns=names, filters=filters or None)
+    df = _read_csv(path, usecols=lambda column: column in columns)
+    for column, _, value in filters:
+        df = df[df[column] == value]
+    return df
+
+
+def load_hotels(path=HOTEL_DATA_PATH, region=None):
+    """호텔 목록 로드 - 좌표가 있는 행만, 같은 이름은 첫 행만 사용"""
+    df = load_hotel_dataframe(path, reviews=False)
+    if df.empty:
+        return []
+    if region is not None:
+        df = df[df['Location'] == region]
+    df = df.dropna(subset=['Latitude', 'Longitude']).drop_duplicates(subset='Hotel')
+
+    hotels = []
+    for idx, row in df.iterrows():
+        hotels.append({
+            'title': str(row['Hotel']),
+            'location': row.get('Location', ''),
+            'address': row.get('주소', '') if pd.notna(row.get('주소')) else '',
+            'lat': float(row['Latitude']),
+            'lng': float(row['Longitude']),
+            'aspects': {col: float(row[col]) for col in ASPECT_COLUMNS if col in row and pd.notna(row[col])},
+            'category': '숙소',
+            'place_id': f"hotel#{idx}",
+        })
+    return hotels
+
+#################################################
+# 숙소 색인
+#################################################
+
+class HotelIndex:
+    """호텔 좌표 격자 색인 + 감성 점수 행렬 + 점수 벡터 KD-트리"""
+
+    def __init__(self, hotels, cell_km=1.0):
+        self.hotels = hotels
+        self.lat = np.array([h['lat'] for h in hotels], dtype=np.float64)
+        self.lng = np.array([h['lng'] for h in hotels], dtype=np.float64)
+        self.aspects = np.array(
+            [[h['aspects'].get(col, 0.0) for col in ASPECT_COLUMNS] for h in hotels], dtype=np.float64
+        ).reshape(len(hotels), len(ASPECT_COLUMNS))
+        self.base_aspects = self.aspects.copy()  # CSV 원래 점수 (추가 리뷰와 합칠 기준값)
+        self.grid = GridIndex(self.lat, self.lng, cell_km=cell_km)
+        self.by_title = {h['title']: i for i, h in enumerate(hotels)}
+
+        # 항목마다 척도가 달라 (예: 소음은 0 근처) 표준화한 점수 벡터로 유사도 계산
+        std = self.aspects.std(axis=0) if len(hotels) else np.ones(len(ASPECT_COLUMNS))
+        std[std == 0] = 1.0
+        mean = self.aspects.mean(axis=0) if len(hotels) else np.zeros(len(ASPECT_COLUMNS))
+        self.feature_mean = mean
+        self.feature_std = std
+        self.features = (self.aspects - mean) / std
+        self._vector_index = None
+
+    def __len__(self):
+        return len(self.hotels)
+
+    def _position(self, location, title):
+        return next((i for i, h in enumerate(self.hotels) if h['title'] == title and h.get('location') == location), None)
+
+    def baseline(self, location, title):
+        """호텔의 CSV 원래 점수 {항목명: 점수} (없으면 None)"""
+        i = self._position(location, title)
+        return None if i is None else dict(zip(ASPECT_COLUMNS, self.base_aspects[i].tolist()))
+
+    def update_scores(self, location, title, values):
+        """호텔 하나의 감성 점수 교체 (values: 항목명 → 점수) - 있으면 True
+
+        표준화 기준(평균/표준편차)은 처음 색인할 때 값을 그대로 쓰고 점수 배열의 그 행만 바꾼다.
+        좌표 격자는 그대로이고, 점수 벡터 KD-트리는 다음 유사 호텔 검색 때 한 번만 다시 만든다.
+        """
+        i = self._position(location, title)
+        if i is None:
+            return False
+        self.hotels[i]['aspects'] = {**self.hotels[i]['aspects'], **values}
+        self.aspects[i] = [self.hotels[i]['aspects'].get(col, 0.0) for col in ASPECT_COLUMNS]
+        self.features[i] = (self.aspects[i] - self.feature_mean) / self.feature_std
+        self._vector_index = None
+        return True
+
+    @property
+    def vector_index(self):
+        """표준화 점수 벡터 KD-트리 (점수가 바뀌었으면 처음 쓸 때 다시 만듦)"""
+        index = self._vector_index
+        if index is None:
+            index = self._vector_index = KDTree(self.features)
+        return index
+
+    def aspect_score(self, weights=None):
+        """호텔별 감성 점수 가중 평균 (weights: 항목명 → 가중치, 없으면 균등)"""
+        if weights is None:
+            w = np.ones(len(ASPECT_COLUMNS))
+        else:
+            w = np.array([weights.get(col, 0.0) for col in ASPECT_COLUMNS], dtype=np.float64)
+        if w.sum() <= 0:
+            return np.zeros(len(self.hotels))
+        return self.aspects @ (w / w.sum())
+
+    def nearest(self, lat, lng, k=1):
+        """좌표에서 가까운 호텔 k곳 [(호텔, 거리 km), ...]"""
+        idx, dist = self.grid.nearest(lat, lng, k=k)
+        return [(self.hotels[i], float(d)) for i, d in zip(idx, dist)]
+
+    def similar(self, title, k=SIMILAR_HOTELS, max_km=None):
+        """리뷰 점수가 비슷한 호텔 k곳 [{'hotel', 'distance', 'km'}, ...] (가까운 점수 순)
+
+        max_km 를 주면 그 호텔에서 max_km 안에 있는 호텔만 찾는다 (격자 반경 검색 → KD-트리 마스크).
+        """
+        i = self.by_title.get(title)
+        if i is None:
+            return []
+        if max_km is None:
+            mask = np.ones(len(self.hotels), dtype=bool)
+        else:
+            mask = np.zeros(len(self.hotels), dtype=bool)
+            mask[self.grid.within(self.lat[i], self.lng[i], max_km)[0]] = True
+        mask[i] = False
+        if not mask.any():
+            return []
+        idx, dist = self.vector_index.nearest(self.features[i], k=k, mask=mask)
+        km = haversine_km(self.lat[i], self.lng[i], self.lat[idx], self.lng[idx])
+        return [
+            {'hotel': self.hotels[j], 'distance': float(d), 'km': float(m)}
+            for j, d, m in zip(idx, dist, km)
+        ]
+
+#################################################
+# 코스 기준 숙소 추천
+#################################################
+
+def course_travel_km(daily_courses, lat, lng):
+    """숙소(들)에서 매일 출발해 돌아오는 총 이동 거리 (lat/lng 배열이면 숙소별 배열)"""
+    lat = np.atleast_1d(np.asarray(lat, dtype=np.float64))
+    lng = np.atleast_1d(np.asarray(lng, dtype=np.float64))
+    total = np.zeros(len(lat))
+    for day in daily_courses:
+        if not day:
+            continue
+        first, last = day[0], day[-1]
+        total += course_engine.geodesic_km(lat, lng, first['lat'], first['lng'])
+        total += course_engine.geodesic_km(last['lat'], last['lng'], lat, lng)
+        # 하루 안의 이동은 숙소와 무관한 상수
+        total += course_engine.route_length_km(day[1:], start=(first['lat'], first['lng']))
+    return total
+
+
+def rank_hotels_for_courses(index, daily_courses, k=5, candidates=HOTEL_CANDIDATES,
+                            aspect_weights=None, travel_weight=HOTEL_TRAVEL_WEIGHT):
+    """일별 코스 전체 이동 거리와 리뷰 점수를 합쳐 숙소 순위 계산
+
+    후보는 코스 장소 중심에서 가까운 호텔로 한정하고 (격자 색인),
+    점수 = 리뷰 점수 - travel_weight × 총 이동 거리(km)
+    """
+    places = [p for day in daily_courses for p in day]
+    if not places or len(index) == 0:
+        return []
+
+    center_lat = float(np.mean([p['lat'] for p in places]))
+    center_lng = float(np.mean([p['lng'] for p in places]))
+    hotel_idx, _ = index.grid.nearest(center_lat, center_lng, k=candidates)
+
+    travel = course_travel_km(daily_courses, index.lat[hotel_idx], index.lng[hotel_idx])
+    aspect = index.aspect_score(aspect_weights)[hotel_idx]
+    score = aspect - travel_weight * travel
+
+    order = np.argsort(-score, kind='stable')[:k]
+    return [
+        {
+            'hotel': index.hotels[hotel_idx[i]],
+            'travel_km': float(travel[i]),
+            'aspect_score': float(aspect[i]),
+            'score': float(score[i]),
+        }
+        for i in order
+    ]
+
+#################################################
+# 지역별 항목 순위
+#################################################
+
+class HotelRankings:
+    """지역 × 감성 항목별 호텔 순위 - CSV를 한 번 읽어 순위를 미리 정렬해 둠
+
+    항목 하나의 Top-N 은 미리 정렬한 배열을 자르기만 하고,
+    여러 항목 가중 순위는 지역 호텔 행렬 × 가중치 벡터 한 번으로 계산한다.
+    """
+
+    def __init__(self, df, max_k=None, path=None):
+        df = df.dropna(subset=['Hotel', 'Location']).reset_index(drop=True)
+        self.frame = df
+        self.path = path  # 리뷰 요약 열을 나중에 읽을 원본 (frame 에 리뷰 열이 없을 때)
+        self.names = df['Hotel'].astype(str).to_numpy()
+        self.scores = np.column_stack([
+            pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=np.float64) if col in df.columns
+            else np.full(len(df), np.nan)
+            for col in ASPECT_COLUMNS
+        ]).reshape(len(df), len(ASPECT_COLUMNS))
+        self.base_scores = self.scores.copy()  # CSV 원래 점수 (추가 리뷰와 합칠 기준값)
+        self.regions = sorted(df['Location'].astype(str).unique())
+        self.locations = df['Location'].astype(str).to_numpy()
+        self.max_k = max_k
+
+        self.region_rows = {}  # 지역별 호텔 대표 행 (같은 이름은 첫 행)
+        self.region_scores = {}  # 지역별 대표 행 감성 점수 행렬 (가중 순위용, NaN → 0)
+        self.orders = {}       # (지역, 항목) → 점수 내림차순 행 번호 (호텔당 최고 점수 행 하나)
+        self.stale_regions = set()  # 점수가 바뀌어 항목별 순위를 다시 정렬해야 하는 지역
+        for region in self.regions:
+            self.region_rows[region] = self._first_per_hotel(np.flatnonzero(self.locations == region))
+            self._rank_region(region)
+
+    def _rank_region(self, region):
+        """지역 하나의 대표 행 점수 행렬과 항목별 순위 계산"""
+        rows = np.flatnonzero(self.locations == region)
+        self.region_scores[region] = np.nan_to_num(self.scores[self.region_rows[region]], nan=0.0)
+        for j, aspect in enumerate(ASPECT_COLUMNS):
+            # 기존 sort_values(ascending=False).drop_duplicates('Hotel') 과 같은 순위 (NaN 은 맨 뒤)
+            order = rows[np.argsort(-self.scores[rows, j], kind='stable')]
+            self.orders[region, aspect] = self._first_per_hotel(order)[:self.max_k]
+
+    @classmethod
+    def load(cls, path=HOTEL_DATA_PATH, max_k=None):
+        """호텔 CSV 로드 후 순위 계산 (파일이 없으면 None) - 리뷰 요약 열은 review() 에서 읽음"""
+        df = load_hotel_dataframe(path, reviews=False)
+        if df.empty:
+            return None
+        return cls(df, max_k=max_k, path=path)
+
+    def _first_per_hotel(self, rows):
+        """행 순서를 유지하며 호텔 이름별 첫 행만 남김"""
+        _, first = np.unique(self.names[rows], return_index=True)
+        return rows[np.sort(first)]
+
+    def hotels(self, region):
+        """지역의 호텔 이름 목록 (CSV 순서)"""
+        return self.names[self.region_rows.get(region, [])].tolist()
+
+    def record(self, region, hotel):
+        """지역/호텔 이름의 대표 행 (없으면 None)"""
+        rows = self.region_rows.get(region)
+        if rows is None:
+            return None
+        match = rows[self.names[rows] == hotel]
+        return self.frame.iloc[int(match[0])] if len(match) else None
+
+    def review(self, region, hotel):
+        """지역/호텔 이름의 리뷰 요약 {'positive', 'negative'} - 이 호텔 행만 읽음 (없으면 None)"""
+        if all(column in self.frame.columns for column in REVIEW_COLUMNS):
+            row = self.record(region, hotel)
+        else:
+            if self.path is None or self.record(region, hotel) is None:
+                return None
+            rows = load_hotel_reviews(self.path, hotel=hotel, region=region)
+            row = rows.iloc[0] if len(rows) else None
+        if row is None:
+            return None
+        return {key: row.get(column, '') if pd.notna(row.get(column)) else ''
+                for key, column in zip(('positive', 'negative'), REVIEW_COLUMNS)}
+
+    def baseline(self, region, hotel):
+        """지역/호텔 대표 행의 CSV 원래 점수 {항목명: 점수} (없으면 None)"""
+        rows = self.region_rows.get(region)
+        if rows is None:
+            return None
+        match = rows[self.names[rows] == hotel]
+        if len(match) == 0:
+            return None
+        return {col: float(v) for col, v in zip(ASPECT_COLUMNS, self.base_scores[match[0]]) if v == v}
+
+    def update_scores(self, region, hotel, values):
+        """호텔 하나의 감성 점수 교체 (values: 항목명 → 점수) - 있으면 True"""
+        rows = np.flatnonzero((self.locations == region) & (self.names == hotel))
+        if len(rows) == 0:
+            return False
+        for aspect, value in values.items():
+            if aspect in ASPECT_COLUMNS:
+                self.scores[rows, ASPECT_COLUMNS.index(aspect)] = value
+                if aspect in self.frame.columns:
+                    self.frame.loc[rows, aspect] = value
+        # 가중 순위 행렬은 그 호텔 행만 바꾸고, 항목별 순위는 다음 조회 때 한 번만 다시 정렬
+        representative = self.region_rows[region]
+        changed = np.flatnonzero(np.isin(representative, rows))
+        self.region_scores[region][changed] = np.nan_to_num(self.scores[representative[changed]], nan=0.0)
+        self.stale_regions.add(region)
+        return True
+
+    def top(self, region, aspect, n=5):
+        """항목 하나 기준 상위 n개 [(호텔 이름, 점수), ...]"""
+        if region in self.stale_regions:
+            self.stale_regions.discard(region)
+            self._rank_region(region)
+        rows = self.orders.get((region, aspect))
+        if rows is None:
+            return []
+        j = ASPECT_COLUMNS.index(aspect)
+        return [(self.names[i], float(self.scores[i, j])) for i in rows[:n]]
+
+    def weighted_top(self, region, weights, n=5):
+        """여러 항목 가중 평균 기준 상위 n개 (weights: 항목명 → 가중치)"""
+        rows = self.region_rows.get(region)
+        w = np.array([weights.get(col, 0.0) for col in ASPECT_COLUMNS], dtype=np.float64)
+        if rows is None or len(rows) == 0 or w.sum() <= 0:
+            return []
+        combined = self.region_scores[region] @ (w / w.sum())
+        best = course_engine.top_k_stable(combined, n)  # 점수 내림차순, 경계 동점도 CSV 순서로 결정
+        return [(self.names[rows[i]], float(combined[i])) for i in best]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="호텔 CSV → UTF-8 열 저장본(parquet) 변환")
+    parser.add_argument("paths", nargs="*", default=HOTEL_SOURCE_PATHS)
+    parser.add_argument("--store-dir", default=HOTEL_STORE_DIR)
+    parser.add_argument("--force", action="store_true", help="원본이 바뀌지 않았어도 다시 변환")
+    args = parser.parse_args()
+
+    import pyarrow.parquet as pq
+    for path in args.paths:
+        if not os.path.exists(path):
+            print(f"{path}: 파일 없음")
+            continue
+        start = time.perf_counter()
+        store = ingest_hotel_csv(path, args.store_dir, force=args.force)
+        metadata = pq.read_schema(store).metadata
+        print(f"{path} ({metadata[b'source_encoding'].decode()}) → {store} "
+              f"({os.path.getsize(store) / 1024:.1f}KB, {time.perf_counter() - start:.2f}초)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""운영시간 파싱 - 운영시간/휴무일 문구를 요일 × 시간대 주간 비트마스크로 변환
+
+비트 배치: (요일 * 3 + 시간대), 요일은 월=0 … 일=6, 시간대는 오전=0 / 오후=1 / 저녁=2
+→ "d 날짜 t 시간대에 영업 중인가"는 비트 하나만 확인하면 된다 (O(1)).
+"""
+import re
+
+#################################################
+# 상수
+#################################################
+
+SLOT_NAMES = ["오전", "오후", "저녁"]
+# 시간대 범위 (분 단위, [시작, 끝)) - 코스 화면의 방문 시간대와 하루 일정(09:00-19:00)도 이 정의를 씀
+SLOT_MINUTES = [(9 * 60, 12 * 60), (13 * 60, 16 * 60), (16 * 60, 19 * 60)]
+NUM_SLOTS = len(SLOT_MINUTES)
+NUM_WEEKDAYS = 7
+# 시간대와 최소 이만큼 겹쳐야 그 시간대에 연 것으로 봄
+MIN_OVERLAP_MINUTES = 60
+
+DAY_BITS = (1 << NUM_SLOTS) - 1
+ALWAYS_OPEN = (1 << (NUM_WEEKDAYS * NUM_SLOTS)) - 1
+
+# 운영시간/휴무일 열 후보 (build_info_html 과 같은 목록)
+HOURS_COLUMNS = ['이용시간', '운영시간', 'OPENHOUR', 'HOUR', '영업시간', '개장시간']
+CLOSED_COLUMNS = ['휴무일', '휴관일', '정기휴무', '휴일', 'CLOSEDAY', 'HOLIDAY']
+
+WEEKDAY_CHARS = {'월': 0, '화': 1, '수': 2, '목': 3, '금': 4, '토': 5, '일': 6}
+WEEKDAY_ENGLISH = {'mon': 0, 'tue': 1, 'wed': 2, 'thu': 3, 'fri': 4, 'sat': 5, 'sun': 6}
+ALL_DAYS = frozenset(range(NUM_WEEKDAYS))
+
+_TIME = r'(\d{1,2})\s*(?:[:시]\s*(\d{2})?)?\s*분?'
+TIME_RANGE_RE = re.compile(_TIME + r'\s*(?:~|-|–|부터)\s*' + _TIME)
+ENGLISH_DAY_RE = re.compile(r'\b(mon|tue|wed|thu|fri|sat|sun)[a-z]*\.?', re.IGNORECASE)
+# 요일 한 글자는 '당일', '1일', '화장실'처럼 다른 낱말에도 들어가므로
+# 앞에 한글/숫자가 없고 '요일'이 붙거나 뒤에 한글이 이어지지 않을 때만 요일로 봄
+_KOREAN_DAY = r'[월화수목금토일](?:요일|(?![가-힣]))'
+KOREAN_DAY_RANGE_RE = re.compile(r'(?<![가-힣\d])([월화수목금토일])(?:요일)?\s*[~\-–]\s*([월화수목금토일])(?:요일)?')
+# 요일 목록 ('월·화', '토, 일요일'); '요일' 없는 한 글자는 목록/'매주'/시간 앞일 때만 인정 (parse_days)
+KOREAN_DAY_LIST_RE = re.compile(
+    r'(?:(매주)\s*|(?<![가-힣\d]))(' + _KOREAN_DAY + r'(?:\s*[,·/]\s*' + _KOREAN_DAY + r')*)(?=(\s*\d)?)')
+KOREAN_DAY_RE = re.compile(r'([월화수목금토일])(?:요일)?')
+# 요일 문구가 아닌 날짜/명절 낱말 ('공휴일', '설날 당일'의 '일'이 일요일로 읽히지 않도록 제거)
+HOLIDAY_WORD_RE = re.compile(r'평일|매일|공?휴일|주말|당일|설날|추석|명절|연휴')
+# 구간 구분: 줄바꿈/세미콜론/슬래시(요일 사이 제외)/괄호, 또는 시간 범위 뒤의 쉼표 ('평일 9-18시, 토 10-17시')
+SEGMENT_SPLIT_RE = re.compile(r'[\n;|()]|(?<![월화수목금토일])/|(?<=\d)\s*[,，]|(?<=시)\s*[,，]')
+# 매월 특정 주차 휴무처럼 매주 반복되지 않는 휴무는 주간 마스크에 반영하지 않음
+MONTHLY_RE = re.compile(r'매월|첫째|둘째|셋째|넷째|마지막|격주|\d+\s*째')
+CLOSED_RE = re.compile(r'휴무|휴관|휴일|정기\s*휴|closed', re.IGNORECASE)
+ALWAYS_RE = re.compile(r'24\s*시간|연중\s*무휴|상시|24\s*hours', re.IGNORECASE)
+
+#################################################
+# 비트 연산
+#################################################
+
+def slot_bit(weekday, slot):
+    """요일/시간대에 해당하는 비트"""
+    return 1 << (weekday * NUM_SLOTS + slot)
+
+
+def is_open(mask, weekday, slot):
+    """weekday(월=0) slot(오전=0) 시간대에 영업 중인지 확인"""
+    return bool((mask >> (weekday * NUM_SLOTS + slot)) & 1)
+
+
+def day_slots(mask, weekday):
+    """하루 치 시간대 비트 (오전/오후/저녁 3비트) - NumPy 배열에도 동작"""
+    return (mask >> (weekday * NUM_SLOTS)) & DAY_BITS
+
+
+def slot_label(slot):
+    """시간대 표시 이름 (예: '오후 (13:00-16:00)')"""
+    start, end = SLOT_MINUTES[slot]
+    return f"{SLOT_NAMES[slot]} ({start // 60:02d}:{start % 60:02d}-{end // 60:02d}:{end % 60:02d})"
+
+
+def slot_for_stop(position, stops_per_day):
+    """하루 n번째 방문이 속하는 시간대 (하루 3곳이면 방문 순서 = 시간대)"""
+    return min(position * NUM_SLOTS // max(stops_per_day, 1), NUM_SLOTS - 1)
+
+
+def mask_from_days(days, slots=range(NUM_SLOTS)):
+    """요일 집합 × 시간대 집합 비트마스크"""
+    mask = 0
+    for day in days:
+        for slot in slots:
+            mask |= slot_bit(day, slot)
+    return mask
+
+#################################################
+# 문구 파싱
+#################################################
+
+def _minutes(hour, minute):
+    return int(hour) * 60 + int(minute or 0)
+
+
+def parse_time_ranges(text):
+    """'09:00~18:00', '10시~22시 30분' 같은 시간 범위 목록 (분 단위, 자정 넘김 허용)"""
+    ranges = []
+    for h1, m1, h2, m2 in TIME_RANGE_RE.findall(text):
+        start, end = _minutes(h1, m1), _minutes(h2, m2)
+        if start > 24 * 60 or end > 24 * 60:
+            continue
+        if end <= start:
+            end += 24 * 60
+        ranges.append((start, end))
+    return ranges
+
+
+def parse_days(text):
+    """문구에 나온 요일 집합 (없으면 빈 집합)"""
+    days = set()
+    if '매일' in text or 'daily' in text.lower():
+        return set(ALL_DAYS)
+    if '평일' in text or 'weekday' in text.lower():
+        days.update(range(5))
+    if '주말' in text or 'weekend' in text.lower():
+        days.update((5, 6))
+    text = HOLIDAY_WORD_RE.sub(' ', text)
+
+    for first, last in KOREAN_DAY_RANGE_RE.findall(text):
+        a, b = WEEKDAY_CHARS[first], WEEKDAY_CHARS[last]
+        days.update(range(a, b + 1) if a <= b else list(range(a, 7)) + list(range(0, b + 1)))
+    text = KOREAN_DAY_RANGE_RE.sub(' ', text)
+    for match in KOREAN_DAY_LIST_RE.finditer(text):
+        weekly, listed, before_time = match.groups()
+        chars = KOREAN_DAY_RE.findall(listed)
+        # '월요일' / '월·화' / '매주 월' / '토 10-17시' 만 요일로 인정
+        if weekly or len(chars) > 1 or '요일' in listed or before_time:
+            days.update(WEEKDAY_CHARS[char] for char in chars)
+
+    english = [WEEKDAY_ENGLISH[m.lower()[:3]] for m in ENGLISH_DAY_RE.findall(text)]
+    if len(english) == 2 and re.search(r'[a-z]\.?\s*[~\-–]\s*[a-z]', text, re.IGNORECASE):
+        a, b = english
+        days.update(range(a, b + 1) if a <= b else list(range(a, 7)) + list(range(0, b + 1)))
+    else:
+        days.update(english)
+    return days
+
+
+def slots_for_ranges(ranges):
+    """시간 범위 목록과 충분히 겹치는 시간대 번호 집합"""
+    slots = set()
+    for start, end in ranges:
+        for slot, (slot_start, slot_end) in enumerate(SLOT_MINUTES):
+            overlap = min(end, slot_end) - max(start, slot_start)
+            if overlap > 0 and overlap >= min(MIN_OVERLAP_MINUTES, end - start):
+                slots.add(slot)
+    return slots
+
+
+def parse_hours(text):
+    """운영시간 문구 → 주간 비트마스크 (해석할 수 없으면 None)"""
+    if text is None:
+        return None
+    text = str(text).strip()
+    if not text:
+        return None
+    if ALWAYS_RE.search(text):
+        return ALWAYS_OPEN
+
+    mask = 0
+    closed = 0
+    parsed = False
+    for segment in SEGMENT_SPLIT_RE.split(text):
+        segment = segment.strip()
+        if not segment:
+            continue
+        days = parse_days(segment)
+        if CLOSED_RE.search(segment):
+            if days and not MONTHLY_RE.search(segment):
+                closed |= mask_from_days(days)
+                parsed = True
+            continue
+        ranges = parse_time_ranges(segment)
+        if not ranges:
+            continue
+        mask |= mask_from_days(days or ALL_DAYS, slots_for_ranges(ranges))
+        parsed = True
+
+    if not parsed:
+        return None
+    if mask == 0:
+        mask = ALWAYS_OPEN  # 휴무일만 적힌 경우
+    return mask & ~closed
+
+
+def parse_closed_days(text):
+    """휴무일 문구 → 닫는 요일 비트마스크 (매주 반복되는 휴무만)"""
+    if text is None:
+        return 0
+    text = str(text).strip()
+    if not text or ALWAYS_RE.search(text):
+        return 0
+    closed = 0
+    for segment in SEGMENT_SPLIT_RE.split(text):
+        if segment.strip() and not MONTHLY_RE.search(segment):
+            closed |= mask_from_days(parse_days(segment))
+    return closed
+
+
+def compile_weekly_mask(hours_text=None, closed_text=None):
+    """운영시간 + 휴무일 문구를 합친 주간 비트마스크 (정보가 없으면 항상 영업)"""
+    mask = parse_hours(hours_text)
+    if mask is None:
+        mask = ALWAYS_OPEN
+    return mask & ~parse_closed_days(closed_text)
+
+
+def row_weekly_mask(row):
+    """데이터프레임 행의 운영시간/휴무일 열에서 주간 비트마스크 계산"""
+    hours_text = next((row[c] for c in HOURS_COLUMNS if c in row and _present(row[c])), None)
+    closed_text = next((row[c] for c in CLOSED_COLUMNS if c in row and _present(row[c])), None)
+    return compile_weekly_mask(hours_text, closed_text)
+
+
+def _present(value):
+    return value is not None and value == value and str(value).strip() != ''
+
+
+def describe_mask(mask):
+    """비트마스크를 '월 오전·오후, …' 형태 문자열로 (디버깅/표시용)"""
+    names = "월화수목금토일"
+    parts = []
+    for day in range(NUM_WEEKDAYS):
+        slots = [SLOT_NAMES[s] for s in range(NUM_SLOTS) if is_open(mask, day, s)]
+        parts.append(f"{names[day]} {'·'.join(slots) if slots else '휴무'}")
+    return ", ".join(parts)
@@ -0,0 +1,398 @@
+"""장소 검색 엔진 - 한글 자모/초성 분해 기반 퍼지 검색 및 자동완성"""
+from bisect import bisect_left
+from collections import Counter, defaultdict
+
+import numpy as np
+
+#################################################
+# 한글 자모 분해
+#################################################
+
+# 한글 음절 범위 (가 ~ 힣)
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+
+CHOSUNG_LIST = [
+    'ㄱ', 'ㄲ', 'ㄴ', 'ㄷ', 'ㄸ', 'ㄹ', 'ㅁ', 'ㅂ', 'ㅃ', 'ㅅ',
+    'ㅆ', 'ㅇ', 'ㅈ', 'ㅉ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ'
+]
+JUNGSUNG_LIST = [
+    'ㅏ', 'ㅐ', 'ㅑ', 'ㅒ', 'ㅓ', 'ㅔ', 'ㅕ', 'ㅖ', 'ㅗ', 'ㅘ', 'ㅙ',
+    'ㅚ', 'ㅛ', 'ㅜ', 'ㅝ', 'ㅞ', 'ㅟ', 'ㅠ', 'ㅡ', 'ㅢ', 'ㅣ'
+]
+JONGSUNG_LIST = [
+    '', 'ㄱ', 'ㄲ', 'ㄳ', 'ㄴ', 'ㄵ', 'ㄶ', 'ㄷ', 'ㄹ', 'ㄺ', 'ㄻ', 'ㄼ', 'ㄽ', 'ㄾ',
+    'ㄿ', 'ㅀ', 'ㅁ', 'ㅂ', 'ㅄ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ'
+]
+
+# 겹모음/겹받침은 키 입력 단위(두벌식)로 분해해 오타 거리를 실제 타이핑과 맞춤
+COMPOUND_JAMO = {
+    'ㅘ': 'ㅗㅏ', 'ㅙ': 'ㅗㅐ', 'ㅚ': 'ㅗㅣ', 'ㅝ': 'ㅜㅓ', 'ㅞ': 'ㅜㅔ', 'ㅟ': 'ㅜㅣ', 'ㅢ': 'ㅡㅣ',
+    'ㄳ': 'ㄱㅅ', 'ㄵ': 'ㄴㅈ', 'ㄶ': 'ㄴㅎ', 'ㄺ': 'ㄹㄱ', 'ㄻ': 'ㄹㅁ', 'ㄼ': 'ㄹㅂ',
+    'ㄽ': 'ㄹㅅ', 'ㄾ': 'ㄹㅌ', 'ㄿ': 'ㄹㅍ', 'ㅀ': 'ㄹㅎ', 'ㅄ': 'ㅂㅅ'
+}
+
+# 초성 검색으로 인식할 자음
+CONSONANTS = set(CHOSUNG_LIST)
+
+
+def normalize_text(text):
+    """소문자 변환 후 문자/숫자만 남김 (공백, 괄호, 문장부호 제거)"""
+    return ''.join(ch for ch in str(text).lower() if ch.isalnum())
+
+
+def decompose_jamo(text):
+    """문자열을 키 입력 단위 자모 시퀀스로 분해 (한글 외 문자는 정규화만 적용)"""
+    result = []
+    for ch in normalize_text(text):
+        code = ord(ch)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            offset = code - HANGUL_BASE
+            cho, rest = divmod(offset, 21 * 28)
+            jung, jong = divmod(rest, 28)
+            result.append(CHOSUNG_LIST[cho])
+            result.append(COMPOUND_JAMO.get(JUNGSUNG_LIST[jung], JUNGSUNG_LIST[jung]))
+            if jong:
+                result.append(COMPOUND_JAMO.get(JONGSUNG_LIST[jong], JONGSUNG_LIST[jong]))
+        else:
+            result.append(COMPOUND_JAMO.get(ch, ch))
+    return ''.join(result)
+
+
+def extract_chosung(text):
+    """문자열의 초성 시퀀스 추출 (예: 경복궁 → ㄱㅂㄱ, 한글 외 문자는 그대로 유지)"""
+    result = []
+    for ch in normalize_text(text):
+        code = ord(ch)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            result.append(CHOSUNG_LIST[(code - HANGUL_BASE) // (21 * 28)])
+        else:
+            result.append(ch)
+    return ''.join(result)
+
+
+def is_chosung_query(text):
+    """검색어가 초성(자음)으로만 이루어졌는지 확인"""
+    normalized = normalize_text(text)
+    return bool(normalized) and all(ch in CONSONANTS for ch in normalized)
+
+
+# 국어의 로마자 표기법 (초성/중성/종성 대표음)
+ROMAN_CHOSUNG = ['g', 'kk', 'n', 'd', 'tt', 'r', 'm', 'b', 'pp', 's',
+                 'ss', '', 'j', 'jj', 'ch', 'k', 't', 'p', 'h']
+ROMAN_JUNGSUNG = ['a', 'ae', 'ya', 'yae', 'eo', 'e', 'yeo', 'ye', 'o', 'wa', 'wae',
+                  'oe', 'yo', 'u', 'wo', 'we', 'wi', 'yu', 'eu', 'ui', 'i']
+ROMAN_JONGSUNG = ['', 'k', 'k', 'k', 'n', 'n', 'n', 't', 'l', 'k', 'm', 'l', 'l', 'l',
+                  'p', 'l', 'm', 'p', 'p', 't', 't', 'ng', 't', 't', 'k', 't', 'p', 't']
+
+
+def romanize_korean(text):
+    """한글을 로마자로 변환 (연음, ㄴ/ㄹ 유음화 정도만 반영한 간이 표기)"""
+    syllables = []
+    for ch in str(text):
+        code = ord(ch)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            cho, rest = divmod(code - HANGUL_BASE, 21 * 28)
+            jung, jong = divmod(rest, 28)
+            syllables.append([cho, jung, jong])
+        else:
+            syllables.append(ch)
+
+    result = []
+    for i, syllable in enumerate(syllables):
+        if isinstance(syllable, str):
+            result.append(syllable)
+            continue
+
+        cho, jung, jong = syllable
+        nxt = syllables[i + 1] if i + 1 < len(syllables) else None
+        initial = ROMAN_CHOSUNG[cho]
+        final = ROMAN_JONGSUNG[jong]
+
+        if isinstance(nxt, list):
+            next_cho = CHOSUNG_LIST[nxt[0]]
+            final_jamo = JONGSUNG_LIST[jong]
+            # 연음: 받침 뒤에 모음(ㅇ)이 오면 받침을 다음 음절 첫소리로 넘김
+            if next_cho == 'ㅇ' and final_jamo in CHOSUNG_LIST and final_jamo != 'ㅇ':
+                final = ''
+                nxt[0] = CHOSUNG_LIST.index(final_jamo)
+            # 유음화: ㄴ+ㄹ, ㄹ+ㄴ, ㄹ+ㄹ → ll
+            elif (final_jamo, next_cho) in (('ㄴ', 'ㄹ'), ('ㄹ', 'ㄴ'), ('ㄹ', 'ㄹ')):
+                final = 'l'
+                nxt[0] = -1
+
+        if cho == -1:
+            initial = 'l'
+        result.append(initial + ROMAN_JUNGSUNG[jung] + final)
+    return ''.join(result)
+
+
+def default_max_distance(length):
+    """검색어 길이(자모 수)에 따른 허용 편집 거리"""
+    if length <= 3:
+        return 0
+    if length <= 7:
+        return 1
+    return 2
+
+#################################################
+# 퍼지 매칭
+#################################################
+
+def _qgrams(text, q):
+    """문자열의 q-gram 목록"""
+    return [text[i:i + q] for i in range(len(text) - q + 1)]
+
+
+def substring_distance(pattern, text, max_distance):
+    """pattern과 text의 임의 부분문자열 사이 최소 편집 거리 (max_distance 초과 시 None)"""
+    m = len(pattern)
+    prev = list(range(m + 1))
+    best = prev[m]
+    for ch in text:
+        cur = [0]
+        for i in range(1, m + 1):
+            cost = 0 if pattern[i - 1] == ch else 1
+            cur.append(min(prev[i - 1] + cost, prev[i] + 1, cur[i - 1] + 1))
+        if cur[m] < best:
+            best = cur[m]
+            if best == 0:
+                break
+        prev = cur
+    return best if best <= max_distance else None
+
+
+class FuzzyIndex:
+    """q-gram 역색인 기반 근사 부분문자열 검색 인덱스"""
+
+    def __init__(self, keys, q=2):
+        self.keys = list(keys)
+        self.q = q
+        postings = defaultdict(list)
+        char_postings = defaultdict(list)
+        for entry_id, key in enumerate(self.keys):
+            for gram in set(_qgrams(key, q)):
+                postings[gram].append(entry_id)
+            for ch in set(key):
+                char_postings[ch].append(entry_id)
+        self.postings = dict(postings)
+        self.char_postings = dict(char_postings)
+
+    def _candidates(self, pattern, max_distance):
+        """q-gram 개수 필터로 검증 대상 항목 축소
+
+        짧은 검색어라 q-gram 필터가 아무것도 거르지 못하면 글자(1-gram) 필터를 쓴다.
+        편집 1회는 서로 다른 글자 하나만 없앨 수 있고, 거리가 검색어 길이보다 작으면
+        적어도 한 글자는 일치해야 하므로 전체 항목을 훑지 않는다.
+        """
+        grams = set(_qgrams(pattern, self.q))
+        # 편집 1회는 최대 q개의 q-gram을 깨뜨림
+        threshold = len(grams) - max_distance * self.q
+        postings = self.postings
+        if threshold <= 0:
+            grams = set(pattern)
+            threshold = max(1, len(grams) - max_distance)
+            postings = self.char_postings
+
+        counts = Counter()
+        for gram in grams:
+            counts.update(postings.get(gram, ()))
+        return [entry_id for entry_id, count in counts.items() if count >= threshold]
+
+    def search(self, pattern, max_distance):
+        """편집 거리 max_distance 이내로 pattern을 포함하는 항목 반환 ({항목 번호: 거리})"""
+        if not pattern:
+            return {}
+
+        # 검색어 길이 이상의 거리는 모든 항목과 일치하므로 의미 없음
+        max_distance = min(max_distance, len(pattern) - 1)
+        if max_distance == 0:
+            return {entry_id: 0 for entry_id, key in enumerate(self.keys) if pattern in key}
+
+        matches = {}
+        for entry_id in self._candidates(pattern, max_distance):
+            key = self.keys[entry_id]
+            if pattern in key:
+                matches[entry_id] = 0
+                continue
+            distance = substring_distance(pattern, key, max_distance)
+            if distance is not None:
+                matches[entry_id] = distance
+        return matches
+
+#################################################
+# 장소 검색 인덱스
+#################################################
+
+def marker_names(marker):
+    """마커에서 검색 대상이 되는 이름 목록 (한국어/영어/중국어 이름 + 한국어 이름의 로마자 표기)"""
+    variants = [marker.get('title')] + list(marker.get('names', {}).values())
+    korean_name = marker.get('names', {}).get('한국어')
+    if korean_name:
+        variants.append(romanize_korean(korean_name))
+
+    names = []
+    for name in variants:
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def marker_place_id(marker, marker_idx):
+    """마커의 공유 장소 ID (언어와 무관하게 같은 원본 행이면 같은 ID)"""
+    return marker.get('place_id', f"#{marker_idx}")
+
+
+def display_name(marker, language):
+    """사용자 언어로 표시할 장소 이름 (해당 언어 이름이 없으면 영어 → 한국어 순으로 대체)"""
+    names = marker.get('names', {})
+    for lang in (language, '영어', '한국어', '중국어'):
+        if names.get(lang):
+            return names[lang]
+    return marker.get('title', '')
+
+
+class PlaceSearchIndex:
+    """관광지 마커 검색 인덱스 - 모든 언어의 이름 변형을 공유 장소 ID로 색인"""
+
+    def __init__(self, markers):
+        self.markers = markers
+        # 장소 ID별 대표 마커 (같은 장소의 여러 언어/행 중 처음 나온 것)
+        self._place_marker = []
+        place_numbers = {}
+        self._entry_place = []
+        jamo_keys = []
+        chosung_keys = []
+
+        for marker_idx, marker in enumerate(markers):
+            place_id = marker_place_id(marker, marker_idx)
+            if place_id not in place_numbers:
+                place_numbers[place_id] = len(self._place_marker)
+                self._place_marker.append(marker_idx)
+            place_number = place_numbers[place_id]
+
+            for name in marker_names(marker):
+                jamo = decompose_jamo(name)
+                if not jamo:
+                    continue
+                self._entry_place.append(place_number)
+                jamo_keys.append(jamo)
+                chosung_keys.append(extract_chosung(name))
+
+        self._jamo_index = FuzzyIndex(jamo_keys)
+        self._chosung_index = FuzzyIndex(chosung_keys)
+
+    def search(self, query, limit=None, max_distance=None):
+        """검색어와 일치하는 마커 목록 (편집 거리, 접두 일치, 이름 길이 순)"""
+        if is_chosung_query(query):
+            index = self._chosung_index
+            pattern = normalize_text(query)
+        else:
+            index = self._jamo_index
+            pattern = decompose_jamo(query)
+
+        if not pattern:
+            return []
+
+        if max_distance is None:
+            max_distance = default_max_distance(len(pattern))
+
+        # 같은 장소에 이름 변형이 여러 개 있으면 가장 좋은 매칭만 사용
+        best = {}
+        for entry_id, distance in index.search(pattern, max_distance).items():
+            key = index.keys[entry_id]
+            rank = (distance, not key.startswith(pattern), len(key))
+            place_number = self._entry_place[entry_id]
+            if place_number not in best or rank < best[place_number]:
+                best[place_number] = rank
+
+        ordered = sorted(best, key=lambda place_number: (best[place_number], place_number))
+        if limit is not None:
+            ordered = ordered[:limit]
+        return [self.markers[self._place_marker[place_number]] for place_number in ordered]
+
+#################################################
+# 접두어 자동완성
+#################################################
+
+# 접두어 범위 상한 계산용 문자
+_PREFIX_SENTINEL = '\U0010FFFF'
+
+
+def _token_suffixes(name):
+    """이름의 각 단어 시작 위치부터의 접미 문자열 (중간 단어로도 자동완성되도록)"""
+    words = str(name).split()
+    return [' '.join(words[i:]) for i in range(len(words))]
+
+
+class PrefixIndex:
+    """정렬 배열 기반 자동완성 인덱스 - 모든 언어 이름을 인기도 가중치와 함께 색인"""
+
+    def __init__(self, markers, popularity=None):
+        self.markers = markers
+        entries = []
+        for marker_idx, marker in enumerate(markers):
+            weight = float(popularity(marker)) if popularity else 1.0
+            for name in marker_names(marker):
+                for suffix in _token_suffixes(name):
+                    jamo = decompose_jamo(suffix)
+                    if jamo:
+                        entries.append((jamo, extract_chosung(suffix), weight, len(name), marker_idx, name))
+
+        # 자모 키 정렬 배열과 초성 키 정렬 배열을 각각 유지
+        self._jamo = self._build(entries, key_pos=0)
+        self._chosung = self._build(entries, key_pos=1)
+
+    @staticmethod
+    def _build(entries, key_pos):
+        """키 기준 정렬 후 열 단위 배열로 변환"""
+        ordered = sorted(entries, key=lambda entry: entry[key_pos])
+        return {
+            'keys': [entry[key_pos] for entry in ordered],
+            'weights': np.array([entry[2] for entry in ordered], dtype=np.float64),
+            'lengths': np.array([entry[3] for entry in ordered], dtype=np.int32),
+            'marker_idx': np.array([entry[4] for entry in ordered], dtype=np.int64),
+            'names': [entry[5] for entry in ordered]
+        }
+
+    def complete(self, prefix, k=10):
+        """접두어로 시작하는 이름 중 인기도 상위 k개 반환 ([{'text', 'marker'}, ...])"""
+        if is_chosung_query(prefix):
+            table = self._chosung
+            key = normalize_text(prefix)
+        else:
+            table = self._jamo
+            key = decompose_jamo(prefix)
+
+        if not key or k <= 0:
+            return []
+
+        lo = bisect_left(table['keys'], key)
+        hi = bisect_left(table['keys'], key + _PREFIX_SENTINEL, lo)
+        if lo >= hi:
+            return []
+
+        weights = table['weights'][lo:hi]
+        lengths = table['lengths'][lo:hi]
+
+        # 인기도 내림차순, 이름이 짧은 순, 같으면 키 순서 (lexsort 는 안정 정렬)
+        # 같은 장소가 여러 이름/단어로 중복될 수 있으므로 구간 전체를 정렬해 두고
+        # 서로 다른 장소 k개가 모일 때까지 훑음
+        candidates = np.lexsort((lengths, -weights))
+
+        results = []
+        seen_places = set()
+        seen_names = set()
+        for pos in candidates:
+            entry = lo + int(pos)
+            marker_idx = int(table['marker_idx'][entry])
+            name = table['names'][entry]
+            place_id = marker_place_id(self.markers[marker_idx], marker_idx)
+            if place_id in seen_places or name in seen_names:
+                continue
+            seen_places.add(place_id)
+            seen_names.add(name)
+            results.append({'text': name, 'marker': self.markers[marker_idx]})
+            if len(results) >= k:
+                break
+        return results
@@ -0,0 +1,241 @@
+"""Open API 장소 데이터 변경분 동기화 - 레코드별 해시로 추가/수정/삭제만 장소 데이터에 반영
+
+배치 실행:
+    python place_sync.py                               # culturalSpaceInfo 동기화 (인증키: SEOUL_API_KEY 또는 secrets)
+    python place_sync.py --mock data/culturalSpaceInfo.xml --dry-run
+
+전체 건수(list_total_count)만 비교하면 건수가 같은 수정은 놓치므로, 레코드마다 자연 키(시설 번호 등)와
+내용 해시를 저장해 두고 새로 받은 레코드와 비교한다. 바뀐 레코드만 asset 엑셀에 반영하고(바뀐 것이 없으면
+파일을 건드리지 않음), 실행마다 결과를 data/sync_log.jsonl 에 한 줄씩 남긴다.
+Open API 에는 변경분 조회가 없어 목록은 매번 전부 받는다 (seoul_openapi 의 동시 페이지 요청).
+받은 행은 목록으로 모으지 않고 스트리밍으로 바로 비교하므로, 메모리에는 키별 해시와 바뀐 행만 남는다.
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from seoul_openapi import (CULTURAL_SPACE_COLUMNS, CULTURAL_SPACE_OUTPUT_PATH, CULTURAL_SPACE_SERVICE,
+                           SEOUL_API_BASE_URL, ReplayServer, SeoulApiError, SeoulOpenApiClient, get_api_key,
+                           read_place_dataset, rows_to_dataframe, write_place_dataset)
+
+#################################################
+# 상수
+#################################################
+
+SYNC_STATE_DIR = os.path.join("data", "sync")
+SYNC_LOG_PATH = os.path.join("data", "sync_log.jsonl")
+SYNC_STATE_FORMAT = 1
+
+# 서비스별 자연 키 필드 (API 필드 이름) - 문화공간은 시설 번호
+NATURAL_KEYS = {
+    CULTURAL_SPACE_SERVICE: ('NUM',),
+}
+# 동기화 로그에 남길 바뀐 키 예시 수
+LOG_SAMPLE_KEYS = 10
+
+#################################################
+# 레코드 해시 / 비교
+#################################################
+
+def record_key(row, key_fields):
+    """자연 키 문자열 (여러 필드면 구분 문자로 연결, 앞뒤 공백 무시)"""
+    return "\x1f".join(str(row.get(field) or "").strip() for field in key_fields)
+
+
+def record_hash(row):
+    """레코드 내용 해시 (필드 순서와 무관)"""
+    payload = json.dumps(row, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def diff_records(rows, stored_hashes, key_fields):
+    """새 레코드와 저장된 {키: 해시} 비교
+
+    반환: {'added': [행], 'updated': [행], 'deleted': [키], 'unchanged': 개수, 'duplicates': 개수,
+           'hashes': 새 {키: 해시}} - 같은 키가 여러 번 나오면 처음 것만 사용
+    """
+    hashes = {}
+    added, updated = [], []
+    duplicates = 0
+    for row in rows:
+        key = record_key(row, key_fields)
+        if key in hashes:
+            duplicates += 1
+            continue
+        digest = hashes[key] = record_hash(row)
+        previous = stored_hashes.get(key)
+        if previous is None:
+            added.append(row)
+        elif previous != digest:
+            updated.append(row)
+    deleted = [key for key in stored_hashes if key not in hashes]
+    return {
+        'added': added,
+        'updated': updated,
+        'deleted': deleted,
+        'unchanged': len(hashes) - len(added) - len(updated),
+        'duplicates': duplicates,
+        'hashes': hashes,
+    }
+
+#################################################
+# 상태 / 장소 데이터 반영
+#################################################
+
+def state_path_for(service, state_dir=SYNC_STATE_DIR):
+    return os.path.join(state_dir, f"{service}.json")
+
+
+def load_state(path, key_fields):
+    """저장된 {키: 해시} (없거나 키 필드가 바뀌었으면 빈 상태)"""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get('format') != SYNC_STATE_FORMAT or tuple(data.get('key_fields', ())) != tuple(key_fields):
+        return {}
+    return data.get('hashes', {})
+
+
+def save_state(path, key_fields, hashes):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'format': SYNC_STATE_FORMAT, 'key_fields': list(key_fields), 'hashes': hashes}, f,
+                  ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def apply_changes(store_path, changes, key_fields, columns=CULTURAL_SPACE_COLUMNS):
+    """바뀐 레코드만 장소 데이터 엑셀에 반영 - 수정은 제자리 교체, 추가는 끝에, 삭제는 제거
+
+    바뀌지 않은 행은 기존 파일의 값을 그대로 둔다. 반환: 반영 후 행 수
+    """
+    key_columns = [columns[field] for field in key_fields]
+    if os.path.exists(store_path):
+        store = read_place_dataset(store_path)
+    else:
+        store = pd.DataFrame(columns=list(columns.values()))
+    keys = store[key_columns].fillna("").astype(str).apply(lambda values: values.str.strip()).agg("\x1f".join, axis=1)
+    store.index = keys if len(store) else pd.Index([], dtype=object)
+
+    store = store[~store.index.isin(changes['deleted'])]
+    upserts = changes['updated'] + changes['added']
+    if upserts:
+        incoming = rows_to_dataframe(upserts, columns)
+        incoming.index = [record_key(row, key_fields) for row in upserts]
+        replace = incoming.index.isin(store.index)
+        # 열마다 읽은 dtype(정수 좌표, 문자열 등)과 새 값의 형식이 달라도 제자리 교체가 되도록
+        store = store.astype(object)
+        store.loc[incoming.index[replace], incoming.columns] = incoming[replace].astype(object)
+        store = pd.concat([store, incoming[~replace]])
+    write_place_dataset(store.reset_index(drop=True), store_path)
+    return len(store)
+
+
+def append_sync_log(entry, path=SYNC_LOG_PATH):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+def read_sync_log(path=SYNC_LOG_PATH, limit=None):
+    """동기화 로그 목록 (오래된 순, limit 를 주면 마지막 limit 개)"""
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        entries = [json.loads(line) for line in f if line.strip()]
+    return entries[-limit:] if limit else entries
+
+#################################################
+# 동기화
+#################################################
+
+def sync_service(client, service=CULTURAL_SPACE_SERVICE, store_path=CULTURAL_SPACE_OUTPUT_PATH,
+                 key_fields=None, columns=CULTURAL_SPACE_COLUMNS, state_dir=SYNC_STATE_DIR,
+                 log_path=SYNC_LOG_PATH, dry_run=False):
+    """서비스 전체 목록을 받아 변경분만 장소 데이터에 반영하고 로그 항목 반환
+
+    장소 데이터 파일이 없으면 저장된 해시를 버리고 전체를 추가로 처리한다.
+    받은 건수가 list_total_count 와 다르면 아무것도 반영하지 않고 SeoulApiError.
+    """
+    key_fields = tuple(key_fields or NATURAL_KEYS[service])
+    state_path = state_path_for(service, state_dir)
+    start = time.perf_counter()
+
+    stored = load_state(state_path, key_fields) if os.path.exists(store_path) else {}
+    info = {}
+    changes = diff_records(client.iter_rows(service, info=info), stored, key_fields)
+    total = len(changes['hashes']) + changes['duplicates']
+    if total != info.get('total', 0):
+        raise SeoulApiError(f"{service}: 전체 {info.get('total', 0)}건 중 {total}건만 받았습니다")
+    changed = bool(changes['added'] or changes['updated'] or changes['deleted'])
+
+    size = None
+    if changed and not dry_run:
+        size = apply_changes(store_path, changes, key_fields, columns)
+    if not dry_run and (changed or not os.path.exists(state_path)):
+        save_state(state_path, key_fields, changes['hashes'])
+
+    entry = {
+        'time': datetime.now().isoformat(timespec='seconds'),
+        'service': service,
+        'total': total,
+        'added': len(changes['added']),
+        'updated': len(changes['updated']),
+        'deleted': len(changes['deleted']),
+        'unchanged': changes['unchanged'],
+        'duplicates': changes['duplicates'],
+        'applied': changed and not dry_run,
+        'store': store_path,
+        'store_rows': size,
+        'seconds': round(time.perf_counter() - start, 3),
+        'sample': {
+            'added': [record_key(row, key_fields) for row in changes['added'][:LOG_SAMPLE_KEYS]],
+            'updated': [record_key(row, key_fields) for row in changes['updated'][:LOG_SAMPLE_KEYS]],
+            'deleted': changes['deleted'][:LOG_SAMPLE_KEYS],
+        },
+    }
+    if not dry_run and log_path:
+        append_sync_log(entry, log_path)
+    return entry
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Open API 장소 데이터 변경분 동기화")
+    parser.add_argument("--service", default=CULTURAL_SPACE_SERVICE, choices=list(NATURAL_KEYS))
+    parser.add_argument("--store", default=CULTURAL_SPACE_OUTPUT_PATH, help="장소 데이터 엑셀 경로")
+    parser.add_argument("--key", nargs="+", help="자연 키 필드 (기본: 서비스별 NATURAL_KEYS)")
+    parser.add_argument("--state-dir", default=SYNC_STATE_DIR)
+    parser.add_argument("--log", default=SYNC_LOG_PATH)
+    parser.add_argument("--mock", help="녹화한 XML 을 로컬 서버로 재생해 동기화 (네트워크 없이)")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--dry-run", action="store_true", help="변경분만 계산하고 저장하지 않음")
+    args = parser.parse_args()
+
+    def run(api_key, base_url):
+        with SeoulOpenApiClient(api_key, base_url, workers=args.workers) as client:
+            return sync_service(client, args.service, args.store, args.key, state_dir=args.state_dir,
+                                log_path=args.log, dry_run=args.dry_run)
+
+    if args.mock:
+        with ReplayServer({args.service: args.mock}) as server:
+            entry = run(server.api_key, server.base_url)
+    else:
+        entry = run(get_api_key(), SEOUL_API_BASE_URL)
+    print(f"{entry['service']}: 전체 {entry['total']}건 - 추가 {entry['added']}, 수정 {entry['updated']}, "
+          f"삭제 {entry['deleted']}, 변경 없음 {entry['unchanged']} ({entry['seconds']}초)")
+    if entry['applied']:
+        print(f"반영: {entry['store']} ({entry['store_rows']}행)")
+
+
+if __name__ == "__main__":
+    main()
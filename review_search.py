@@ -0,0 +1,198 @@
+"""호텔 리뷰 전문 검색 - 글자 2-gram 역색인 + BM25 순위, 검색어 강조 요약문
+
+한국어는 띄어쓰기 단위 어절에 조사/어미가 붙어 ('조용해서', '역세권이라') 단어 단위로는 잘 맞지 않으므로
+어절 안의 글자 2-gram 으로 색인한다. '조용한 역세권' → 조용, 용한, 역세, 세권 을 BM25 로 점수화한다.
+"""
+import re
+from collections import Counter
+
+import numpy as np
+
+from course_engine import top_k_stable
+from hotels import HOTEL_DATA_PATH, REVIEW_COLUMNS, load_hotel_reviews
+
+#################################################
+# 상수
+#################################################
+
+# 검색 필드 이름 → 리뷰 열
+REVIEW_FIELDS = dict(zip(('positive', 'negative'), REVIEW_COLUMNS))
+
+# BM25 파라미터
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# 요약문 최대 길이 (문장이 더 길면 첫 일치 위치 주변만)
+SNIPPET_CHARS = 80
+HIGHLIGHT = ("**", "**")
+
+_WORD_RE = re.compile(r'[^\W_]+')
+_SENTENCE_RE = re.compile(r'[^.!?。\n]+[.!?。]*')
+
+#################################################
+# 토큰화
+#################################################
+
+def review_terms(text, query=False):
+    """어절별 글자 2-gram 목록 (한 글자 어절은 그 글자)
+
+    색인할 때는 한 글자 검색어('뷰')도 찾을 수 있도록 모든 글자를 함께 넣고,
+    검색어는 두 글자 이상이면 2-gram 만 쓴다.
+    """
+    if text is None or text != text:
+        return []
+    terms = []
+    for word in _WORD_RE.findall(str(text).lower()):
+        if len(word) == 1:
+            terms.append(word)
+            continue
+        terms.extend(word[i:i + 2] for i in range(len(word) - 1))
+        if not query:
+            terms.extend(word)
+    return terms
+
+
+def highlight_snippet(text, terms, max_chars=SNIPPET_CHARS, marks=HIGHLIGHT):
+    """검색어 2-gram 이 가장 많이 (종류 기준) 나오는 문장을 골라 일치 부분을 강조 (없으면 빈 문자열)"""
+    if text is None or text != text or not terms:
+        return ""
+    text = str(text)
+    lower = text.lower()
+    terms = set(terms)
+    covered = np.zeros(len(text) + 1, dtype=bool)
+    for size in {len(term) for term in terms}:
+        for i in range(len(text) - size + 1):
+            if lower[i:i + size] in terms:
+                covered[i:i + size] = True
+
+    best = None
+    for match in _SENTENCE_RE.finditer(text):
+        start, end = match.span()
+        hits = sum(term in lower[start:end] for term in terms)
+        if hits and (best is None or hits > best[0]):
+            best = (hits, start, end)
+    if best is None:
+        return ""
+
+    _, start, end = best
+    while start < end and text[start].isspace():
+        start += 1
+    prefix = suffix = ""
+    if end - start > max_chars:
+        first = start + int(np.argmax(covered[start:end]))
+        start = max(start, first - max_chars // 4)
+        if start > best[1]:
+            prefix = "…"
+        if start + max_chars < end:
+            end = start + max_chars
+            suffix = "…"
+
+    parts = []
+    i = start
+    while i < end:
+        j = i
+        while j < end and covered[j] == covered[i]:
+            j += 1
+        chunk = text[i:j]
+        parts.append(f"{marks[0]}{chunk}{marks[1]}" if covered[i] and chunk.strip() else chunk)
+        i = j
+    return prefix + "".join(parts).strip() + suffix
+
+#################################################
+# 역색인
+#################################################
+
+class ReviewSearchIndex:
+    """호텔 리뷰 요약 역색인 - 필드(긍정/부정)별 CSR 포스팅 (term → 문서 번호, 빈도)
+
+    문서는 지역/호텔 이름별 첫 행 하나. 검색은 검색어 2-gram 의 포스팅 구간만 읽어
+    문서 점수 배열에 BM25 가중치를 더하므로 전체 문서를 훑지 않는다.
+    """
+
+    def __init__(self, df, k1=BM25_K1, b=BM25_B):
+        df = df.dropna(subset=['Hotel', 'Location']).drop_duplicates(subset=['Hotel', 'Location'])
+        df = df.reset_index(drop=True)
+        self.hotels = df['Hotel'].astype(str).tolist()
+        self.locations = df['Location'].astype(str).to_numpy()
+        self.texts = {field: df[column].tolist() if column in df.columns else [None] * len(df)
+                      for field, column in REVIEW_FIELDS.items()}
+        self.k1 = k1
+        self.b = b
+
+        self.vocabulary = {}
+        self.fields = {}
+        for field, texts in self.texts.items():
+            term_ids, doc_ids, freqs = [], [], []
+            lengths = np.zeros(len(df), dtype=np.float64)
+            for doc, text in enumerate(texts):
+                counts = Counter(review_terms(text))
+                lengths[doc] = sum(counts.values())
+                for term, count in counts.items():
+                    term_ids.append(self.vocabulary.setdefault(term, len(self.vocabulary)))
+                    doc_ids.append(doc)
+                    freqs.append(count)
+            self.fields[field] = (term_ids, doc_ids, freqs, lengths)
+
+        # 어휘가 필드 사이에서 공유되므로 모든 필드를 읽은 뒤 CSR 로 정리
+        for field, (term_ids, doc_ids, freqs, lengths) in self.fields.items():
+            term_ids = np.array(term_ids, dtype=np.int64)
+            order = np.argsort(term_ids, kind='stable')
+            self.fields[field] = {
+                'offsets': np.concatenate([[0], np.cumsum(np.bincount(term_ids, minlength=len(self.vocabulary)))]),
+                'docs': np.array(doc_ids, dtype=np.int32)[order],
+                'freqs': np.array(freqs, dtype=np.float64)[order],
+                'lengths': lengths,
+                'avg_length': lengths.mean() if len(lengths) and lengths.mean() > 0 else 1.0,
+            }
+
+    @classmethod
+    def load(cls, path=HOTEL_DATA_PATH):
+        """호텔 리뷰 열만 읽어 색인 (파일이 없으면 None)"""
+        df = load_hotel_reviews(path)
+        if df.empty:
+            return None
+        return cls(df)
+
+    def __len__(self):
+        return len(self.hotels)
+
+    def scores(self, query, field='positive'):
+        """문서별 BM25 점수 배열 (field=None 이면 긍정/부정 점수 합)"""
+        terms = [self.vocabulary[t] for t in dict.fromkeys(review_terms(query, query=True)) if t in self.vocabulary]
+        total = np.zeros(len(self.hotels), dtype=np.float64)
+        for name in (REVIEW_FIELDS if field is None else [field]):
+            postings = self.fields[name]
+            norm = self.k1 * (1 - self.b + self.b * postings['lengths'] / postings['avg_length'])
+            for term in terms:
+                lo, hi = postings['offsets'][term], postings['offsets'][term + 1]
+                if lo == hi:
+                    continue
+                docs = postings['docs'][lo:hi]
+                tf = postings['freqs'][lo:hi]
+                idf = np.log(1 + (len(self.hotels) - (hi - lo) + 0.5) / (hi - lo + 0.5))
+                total[docs] += idf * tf * (self.k1 + 1) / (tf + norm[docs])
+        return total
+
+    def search(self, query, k=10, field='positive', region=None):
+        """검색어 상위 k개 [{'hotel', 'location', 'score', 'snippet'}, ...] (region 을 주면 그 지역만)"""
+        score = self.scores(query, field)
+        if region is not None:
+            score[self.locations != region] = 0.0
+        candidates = np.flatnonzero(score > 0)
+        if len(candidates) == 0:
+            return []
+        # 점수 내림차순, 동점이면 (k번째 경계 동점 포함) CSV 순서
+        candidates = candidates[top_k_stable(score[candidates], k)]
+
+        terms = review_terms(query, query=True)
+        results = []
+        for doc in candidates:
+            texts = [self.texts[name][doc] for name in (REVIEW_FIELDS if field is None else [field])]
+            snippet = next((s for s in (highlight_snippet(text, terms) for text in texts) if s), "")
+            results.append({
+                'hotel': self.hotels[doc],
+                'location': str(self.locations[doc]),
+                'score': float(score[doc]),
+                'snippet': snippet,
+            })
+        return results
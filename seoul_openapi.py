@@ -0,0 +1,514 @@
+"""서울 열린데이터광장 Open API 수집 - 전체 건수 확인 후 모든 페이지를 동시에 받아 장소 데이터로 저장
+
+배치 실행:
+    python seoul_openapi.py                        # culturalSpaceInfo → asset/ 엑셀 (인증키: SEOUL_API_KEY 또는 secrets)
+    python seoul_openapi.py --record data/culturalSpaceInfo.xml
+    python seoul_openapi.py --mock data/culturalSpaceInfo.xml --output /tmp/places.xlsx
+
+인증키는 코드에 넣지 않는다. 환경 변수 SEOUL_API_KEY 나 .streamlit/secrets.toml 의 seoul_api_key 를 쓴다.
+--mock 은 녹화한 XML 을 같은 URL 규칙으로 돌려주는 로컬 서버를 띄워 네트워크 없이 수집 과정을 재현한다.
+응답은 도착하는 대로 조각 단위로 파싱해 행마다 내보내고 처리한 요소는 지우므로 (PageStream),
+페이지가 커도 응답 본문이나 전체 XML 트리를 메모리에 올리지 않는다.
+"""
+import argparse
+import os
+import queue
+import random
+import threading
+import time
+import xml.etree.ElementTree as ET
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import islice
+from urllib.parse import unquote
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+#################################################
+# 상수
+#################################################
+
+SEOUL_API_BASE_URL = "http://openapi.seoul.go.kr:8088"
+SEOUL_API_KEY_ENV = "SEOUL_API_KEY"
+SEOUL_API_KEY_SECRET = "seoul_api_key"
+
+# 한 번에 받을 수 있는 최대 행 수 (API 제한)
+PAGE_SIZE = 1000
+DEFAULT_WORKERS = 4
+DEFAULT_RETRIES = 3
+# 재시도 대기: BACKOFF_SECONDS × 2^시도 (+ 무작위 지연)
+BACKOFF_SECONDS = 0.5
+REQUEST_TIMEOUT = 30
+# 응답 본문을 읽어 파서에 넣는 단위 / 동시에 받는 페이지마다 미리 받아 둘 최대 행 수
+STREAM_CHUNK_BYTES = 64 * 1024
+STREAM_BUFFER_ROWS = 256
+
+# 응답 코드 - 정상 / 데이터 없음 / 잠시 후 다시 시도하면 되는 서버 오류
+CODE_OK = "INFO-000"
+CODE_NO_DATA = "INFO-200"
+RETRYABLE_CODES = {"ERROR-500", "ERROR-600", "ERROR-601"}
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+CULTURAL_SPACE_SERVICE = "culturalSpaceInfo"
+# 문화공간 API 필드 → 앱 장소 데이터 열 (운영시간/휴관일/입장료/전화번호는 앱이 읽는 열 이름으로)
+# X_COORD 가 위도, Y_COORD 가 경도로 들어오므로 앱 기준 X좌표(경도)/Y좌표(위도)에 맞춰 바꿔 넣는다.
+CULTURAL_SPACE_COLUMNS = {
+    'NUM': '번호',
+    'FAC_NAME': '명칭(한국어)',
+    'SUBJCODE': '주제분류',
+    'ADDR': '주소',
+    'Y_COORD': 'X좌표',
+    'X_COORD': 'Y좌표',
+    'PHNE': '전화번호',
+    'HOMEPAGE': '홈페이지',
+    'OPENHOUR': '운영시간',
+    'CLOSEDAY': '휴관일',
+    'ENTR_FEE': '입장료',
+    'ENTRFREE': '무료구분',
+    'SUBWAY': '지하철',
+    'FAC_DESC': '시설소개',
+}
+# 숫자로 저장하는 좌표 열 (나머지 열은 API 가 준 문자열 그대로)
+COORDINATE_COLUMNS = ('X좌표', 'Y좌표')
+# load_excel_files 가 파일 이름으로 카테고리를 정하므로 이름에 '문화공간' 을 넣음
+CULTURAL_SPACE_OUTPUT_PATH = os.path.join("asset", "서울시 문화공간 정보 (Open API).xlsx")
+
+
+class SeoulApiError(Exception):
+    """API 가 오류 코드를 돌려주었거나 재시도 후에도 실패한 요청"""
+
+    def __init__(self, message, code=None):
+        super().__init__(message)
+        self.code = code
+
+#################################################
+# 인증키
+#################################################
+
+def get_api_key():
+    """인증키 조회 - 환경 변수 → streamlit secrets 순서 (없으면 None)"""
+    key = os.environ.get(SEOUL_API_KEY_ENV)
+    if key:
+        return key
+    try:
+        import streamlit as st
+        return st.secrets[SEOUL_API_KEY_SECRET]
+    except Exception:  # secrets.toml 이 없거나 키가 없음
+        return None
+
+#################################################
+# 응답 파싱
+#################################################
+
+class PageStream:
+    """XML 응답을 받는 대로 파싱해 <row> 마다 평평한 {필드: 값} 을 내보냄 - 처리한 요소는 바로 지움
+
+    chunks: 바이트 조각 iterable (응답 본문 스트림). 본문 전체나 전체 트리를 메모리에 두지 않으므로
+    페이지가 아무리 커도 메모리는 행 하나 분량만 쓴다.
+    list_total_count 와 결과 코드는 첫 행을 내보내기 전에 total / code 에 채워진다.
+    오류 코드면 SeoulApiError, 응답이 중간에 끊기면 ET.ParseError.
+    """
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.total = None
+        self.code = None
+        self.message = None
+
+    def __iter__(self):
+        parser = ET.XMLPullParser(events=("start", "end"))
+        stack = []
+        for chunk in self.chunks:
+            parser.feed(chunk)
+            yield from self._rows(parser, stack)
+        parser.close()
+        yield from self._rows(parser, stack)
+        if self.total is None:
+            self.total = 0
+
+    def _rows(self, parser, stack):
+        for event, element in parser.read_events():
+            if event == "start":
+                stack.append(element)
+                continue
+            stack.pop()
+            tag = element.tag
+            if tag == "row":
+                yield {field.tag: field.text for field in element}
+                # 내보낸 행은 부모에서 떼어 내 트리가 커지지 않게
+                element.clear()
+                if stack:
+                    stack[-1].remove(element)
+            elif tag == "list_total_count":
+                self.total = int(element.text or 0)
+            elif tag == "CODE":
+                self.code = element.text
+            elif tag == "MESSAGE":
+                self.message = element.text
+            elif tag == "RESULT":
+                self._check_result()
+
+    def _check_result(self):
+        if self.code == CODE_NO_DATA:
+            self.total = 0
+        elif self.code and self.code != CODE_OK:
+            raise SeoulApiError(f"{self.code}: {self.message or ''}", self.code)
+
+
+def parse_page(content):
+    """XML 응답 본문 → (전체 건수, 행 목록 [{필드: 값}, ...]) - 오류 코드면 SeoulApiError"""
+    page = PageStream([content])
+    rows = list(page)
+    return page.total, rows
+
+
+# 페이지 행 버퍼의 끝 표시
+_PAGE_END = object()
+
+
+def _put(buffer, item, stop):
+    """가득 찬 버퍼에 자리가 날 때까지 기다려 넣음 - stop 이 설정되면 넣지 않고 False"""
+    while not stop.is_set():
+        try:
+            buffer.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def page_ranges(total, page_size=PAGE_SIZE, first=1):
+    """1부터 total 까지를 page_size 단위 (시작, 끝) 구간으로 (first 번 이전은 제외)"""
+    return [(start, min(start + page_size - 1, total)) for start in range(first, total + 1, page_size)]
+
+#################################################
+# 수집
+#################################################
+
+class SeoulOpenApiClient:
+    """서울 Open API 동기 클라이언트 - 연결 풀 세션 하나를 여러 스레드가 함께 씀"""
+
+    def __init__(self, api_key, base_url=SEOUL_API_BASE_URL, workers=DEFAULT_WORKERS, retries=DEFAULT_RETRIES,
+                 backoff=BACKOFF_SECONDS, timeout=REQUEST_TIMEOUT, page_size=PAGE_SIZE):
+        if not api_key:
+            raise ValueError(f"인증키가 필요합니다 ({SEOUL_API_KEY_ENV} 환경 변수 또는 secrets 의 {SEOUL_API_KEY_SECRET})")
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.workers = max(1, workers)
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.page_size = page_size
+        self.session = requests.Session()
+        # 동시에 보내는 요청 수만큼 연결을 유지 (재시도는 아래에서 직접 처리)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.workers, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.stats = {'requests': 0, 'retries': 0}
+        self._stats_lock = threading.Lock()
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def page_url(self, service, start, end):
+        return f"{self.base_url}/{self.api_key}/xml/{service}/{start}/{end}/"
+
+    def _count(self, key):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def stream_page(self, service, start, end, info=None):
+        """한 구간의 행을 응답이 도착하는 대로 하나씩 내보냄 (info 를 주면 info['total'] 에 전체 건수)
+
+        연결 오류, 429/5xx, 서버 오류 코드, 중간에 끊긴 응답은 지수 백오프로 재시도하며,
+        재시도 때는 이미 내보낸 행 수만큼 건너뛰어 같은 행이 두 번 나오지 않게 한다.
+        """
+        yielded = 0
+        error = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                self._count('retries')
+                time.sleep(self.backoff * (2 ** (attempt - 1)) * (1 + random.random()))
+            self._count('requests')
+            try:
+                with self.session.get(self.page_url(service, start, end), timeout=self.timeout,
+                                      stream=True) as response:
+                    if response.status_code in RETRYABLE_STATUS:
+                        error = SeoulApiError(f"HTTP {response.status_code}")
+                        continue
+                    response.raise_for_status()
+                    page = PageStream(response.iter_content(STREAM_CHUNK_BYTES))
+                    for position, row in enumerate(page):
+                        if position < yielded:
+                            continue
+                        yielded += 1
+                        yield row
+                    if info is not None:
+                        info['total'] = page.total
+                    return
+            except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError,
+                    ET.ParseError) as e:
+                error = e
+            except SeoulApiError as e:
+                if e.code not in RETRYABLE_CODES:
+                    raise
+                error = e
+        raise SeoulApiError(f"{service} {start}-{end} 요청 실패 ({self.retries}회 재시도): {error}")
+
+    def fetch_page(self, service, start, end):
+        """한 구간 요청 → (전체 건수, 행 목록)"""
+        info = {}
+        rows = list(self.stream_page(service, start, end, info))
+        return info.get('total', 0), rows
+
+    def iter_rows(self, service, progress=None, info=None):
+        """전체 행을 API 순서로 하나씩 내보냄 (info 를 주면 info['total'] 에 전체 건수)
+
+        첫 페이지는 받는 대로 내보내며 list_total_count 를 확인한다. 나머지 페이지는 workers 개씩 동시에
+        받되 페이지마다 STREAM_BUFFER_ROWS 행까지만 미리 받아 두고 순서대로 내보내므로,
+        페이지 크기와 관계없이 메모리는 workers × STREAM_BUFFER_ROWS 행을 넘지 않는다.
+        """
+        first = {}
+        yield from self.stream_page(service, 1, self.page_size, first)
+        total = first.get('total', 0)
+        if info is not None:
+            info['total'] = total
+        ranges = page_ranges(total, self.page_size, first=self.page_size + 1)
+        if progress is not None:
+            progress(1, len(ranges) + 1)
+        if not ranges:
+            return
+
+        stop = threading.Event()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            def submit(start, end):
+                buffer = queue.Queue(STREAM_BUFFER_ROWS)
+                executor.submit(self._pump, service, start, end, buffer, stop)
+                return buffer
+
+            remaining = iter(ranges)
+            window = deque(submit(start, end) for start, end in islice(remaining, self.workers))
+            try:
+                for done in range(2, len(ranges) + 2):
+                    buffer = window.popleft()
+                    following = next(remaining, None)
+                    if following is not None:
+                        window.append(submit(*following))
+                    while True:
+                        row = buffer.get()
+                        if row is _PAGE_END:
+                            break
+                        if isinstance(row, Exception):
+                            raise row
+                        yield row
+                    if progress is not None:
+                        progress(done, len(ranges) + 1)
+            finally:
+                # 중간에 멈추거나 실패하면 아직 받는 중인 페이지도 그만 받게
+                stop.set()
+
+    def _pump(self, service, start, end, buffer, stop):
+        """한 페이지를 스트리밍으로 받아 buffer 에 넣음 (끝나면 _PAGE_END, 실패하면 예외 객체)"""
+        rows = self.stream_page(service, start, end)
+        try:
+            for row in rows:
+                if not _put(buffer, row, stop):
+                    return
+            _put(buffer, _PAGE_END, stop)
+        except Exception as e:
+            _put(buffer, e, stop)
+        finally:
+            rows.close()
+
+    def fetch_all(self, service, progress=None):
+        """전체 행 목록 (API 순서) - 받은 건수가 list_total_count 와 다르면 SeoulApiError"""
+        info = {}
+        rows = list(self.iter_rows(service, progress, info))
+        if len(rows) != info.get('total', 0):
+            raise SeoulApiError(f"{service}: 전체 {info.get('total', 0)}건 중 {len(rows)}건만 받았습니다")
+        return rows
+
+#################################################
+# 장소 데이터 저장
+#################################################
+
+def rows_to_dataframe(rows, columns=CULTURAL_SPACE_COLUMNS):
+    """API 행 → 앱 장소 데이터 열 이름의 데이터프레임 (좌표는 숫자로)"""
+    df = pd.DataFrame(rows, columns=list(columns)).rename(columns=columns)
+    return _numeric_coordinates(df)
+
+
+def read_place_dataset(path=CULTURAL_SPACE_OUTPUT_PATH):
+    """저장한 장소 데이터 엑셀 읽기 - rows_to_dataframe 과 같은 열 형식 (좌표만 숫자, 나머지는 문자열)
+
+    빈 열이 float 로 읽히면 다음 동기화에서 문자열을 넣을 수 없으므로 모두 문자열로 읽는다.
+    """
+    return _numeric_coordinates(pd.read_excel(path, engine='openpyxl', dtype=str))
+
+
+def _numeric_coordinates(df):
+    for column in COORDINATE_COLUMNS:
+        if column in df.columns:
+            df[column] = pd.to_numeric(df[column], errors='coerce')
+    return df
+
+
+def write_place_dataset(df, path=CULTURAL_SPACE_OUTPUT_PATH):
+    """앱이 읽는 asset 엑셀로 저장 (임시 파일에 쓴 뒤 교체)"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    # 임시 파일 이름이 .xlsx 로 끝나지 않게 (앱이 asset/*.xlsx 를 모두 읽으므로) 파일 객체로 씀
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        df.to_excel(f, index=False, engine='openpyxl')
+    os.replace(tmp_path, path)
+
+
+def record_xml(rows, service, path):
+    """받은 전체 행을 응답 하나 형태의 XML 로 저장 (ReplayServer 로 다시 재생)"""
+    root = ET.Element(service)
+    ET.SubElement(root, "list_total_count").text = str(len(rows))
+    result = ET.SubElement(root, "RESULT")
+    ET.SubElement(result, "CODE").text = CODE_OK
+    ET.SubElement(result, "MESSAGE").text = "정상 처리되었습니다"
+    for row in rows:
+        element = ET.SubElement(root, "row")
+        for field, value in row.items():
+            ET.SubElement(element, field).text = value
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    ET.ElementTree(root).write(path, encoding="utf-8", xml_declaration=True)
+
+#################################################
+# 재생용 로컬 서버
+#################################################
+
+class ReplayServer:
+    """녹화한 XML 의 행을 Open API 와 같은 URL 규칙 (/{키}/xml/{서비스}/{시작}/{끝}/) 으로 잘라 돌려주는 서버
+
+    fail_every 를 주면 n번째 요청마다 HTTP 503 을 돌려줘 재시도 경로를 확인할 수 있다.
+    max_page_size 로 API 의 한 번 요청 한도를 바꿔 아주 큰 페이지 응답도 재현할 수 있다.
+    """
+
+    def __init__(self, recordings, api_key="MOCK_KEY", fail_every=0, delay=0.0, max_page_size=PAGE_SIZE):
+        # recordings: 서비스 이름 → 녹화한 XML 경로
+        self.api_key = api_key
+        self.max_page_size = max_page_size
+        self.fail_every = fail_every
+        self.delay = delay
+        self.rows = {}
+        for service, path in recordings.items():
+            self.rows[service] = [ET.tostring(row, encoding="unicode") for row in ET.parse(path).getroot().iter("row")]
+        self.requests = 0
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def respond(self, path):
+        """요청 경로 → (HTTP 상태, XML 본문)"""
+        with self._lock:
+            self.requests += 1
+            failing = self.fail_every and self.requests % self.fail_every == 0
+        if failing:
+            return 503, ""
+        parts = [unquote(part) for part in path.strip("/").split("/")]
+        if len(parts) < 5 or parts[1] != "xml":
+            return 404, ""
+        key, _, service, start, end = parts[:5]
+        if key != self.api_key:
+            return 200, _result_xml("INFO-100", "인증키가 유효하지 않습니다.")
+        if service not in self.rows:
+            return 200, _result_xml("ERROR-310", "해당하는 서비스를 찾을 수 없습니다.")
+        start, end = int(start), int(end)
+        if end - start + 1 > self.max_page_size:
+            return 200, _result_xml("ERROR-336", f"데이터요청은 한번에 최대 {self.max_page_size}건을 넘을 수 없습니다.")
+        rows = self.rows[service][start - 1:end]
+        if not rows:
+            return 200, _result_xml(CODE_NO_DATA, "해당하는 데이터가 없습니다.")
+        body = (f"<?xml version=\"1.0\" encoding=\"UTF-8\"?><{service}>"
+                f"<list_total_count>{len(self.rows[service])}</list_total_count>"
+                f"<RESULT><CODE>{CODE_OK}</CODE><MESSAGE>정상 처리되었습니다</MESSAGE></RESULT>"
+                + "".join(rows) + f"</{service}>")
+        return 200, body
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if server.delay:
+                    time.sleep(server.delay)
+                status, body = server.respond(self.path)
+                data = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/xml; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def _result_xml(code, message):
+    return (f"<?xml version=\"1.0\" encoding=\"UTF-8\"?>"
+            f"<RESULT><CODE>{code}</CODE><MESSAGE>{message}</MESSAGE></RESULT>")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="서울 Open API 전체 페이지 동시 수집")
+    parser.add_argument("--service", default=CULTURAL_SPACE_SERVICE)
+    parser.add_argument("--output", default=CULTURAL_SPACE_OUTPUT_PATH, help="앱 장소 데이터 엑셀 경로")
+    parser.add_argument("--record", help="받은 전체 행을 XML 로 녹화할 경로")
+    parser.add_argument("--mock", help="녹화한 XML 을 로컬 서버로 재생해 수집 (네트워크 없이)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES)
+    parser.add_argument("--page-size", type=int, default=PAGE_SIZE)
+    args = parser.parse_args()
+
+    def run(api_key, base_url):
+        start = time.perf_counter()
+        with SeoulOpenApiClient(api_key, base_url, workers=args.workers, retries=args.retries,
+                                page_size=args.page_size) as client:
+            rows = client.fetch_all(
+                args.service, progress=lambda done, total: print(f"\r페이지 {done}/{total}", end="", flush=True))
+            print(f"\n{args.service}: {len(rows)}건 ({time.perf_counter() - start:.2f}초, {client.stats})")
+        return rows
+
+    if args.mock:
+        with ReplayServer({args.service: args.mock}) as server:
+            rows = run(server.api_key, server.base_url)
+    else:
+        rows = run(get_api_key(), SEOUL_API_BASE_URL)
+
+    if args.record:
+        record_xml(rows, args.service, args.record)
+        print(f"녹화: {args.record}")
+    if args.service == CULTURAL_SPACE_SERVICE:
+        write_place_dataset(rows_to_dataframe(rows), args.output)
+        print(f"저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""공간 색인 - 위경도 격자(반경/k-최근접 검색)와 다차원 벡터 KD-트리
+
+격자: 좌표를 평면(km)으로 근사 투영해 cell_km 크기 격자에 나눠 담고,
+질의 지점 주변 격자만 확인한 뒤 하버사인 거리로 정확히 거른다.
+KD-트리: 점수 벡터 같은 저차원 점의 유클리드 k-최근접 검색 (노드 경계 상자로 가지치기).
+"""
+import heapq
+import math
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEG_LAT = 110.574
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    """하버사인 거리 (km, NumPy 브로드캐스트 지원)"""
+    lat1, lng1, lat2, lng2 = (np.radians(np.asarray(v, dtype=np.float64)) for v in (lat1, lng1, lat2, lng2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class GridIndex:
+    """고정 크기 격자 색인 (점 목록은 생성 후 바뀌지 않는다고 가정)"""
+
+    def __init__(self, lat, lng, cell_km=1.0):
+        self.lat = np.asarray(lat, dtype=np.float64)
+        self.lng = np.asarray(lng, dtype=np.float64)
+        self.cell_km = cell_km
+        # 경도 1도의 길이가 가장 짧은 (고위도) 값으로 투영해야 격자 한 칸이 실제로 cell_km 이상이 됨
+        self.ref_lat = float(np.max(np.abs(self.lat))) if len(self.lat) else 37.5665
+        self.km_per_deg_lng = 111.320 * math.cos(math.radians(self.ref_lat))
+
+        rows, cols = self._cells(self.lat, self.lng)
+        self.cells = {}
+        if len(self.lat):
+            order = np.lexsort((cols, rows))
+            keys = np.column_stack([rows[order], cols[order]])
+            boundaries = np.flatnonzero(np.any(np.diff(keys, axis=0) != 0, axis=1)) + 1
+            for members in np.split(order, boundaries):
+                self.cells[(int(rows[members[0]]), int(cols[members[0]]))] = members
+            self.row_range = (int(rows.min()), int(rows.max()))
+            self.col_range = (int(cols.min()), int(cols.max()))
+
+    def __len__(self):
+        return len(self.lat)
+
+    def _cells(self, lat, lng):
+        rows = np.floor(np.asarray(lat) * KM_PER_DEG_LAT / self.cell_km).astype(np.int64)
+        cols = np.floor(np.asarray(lng) * self.km_per_deg_lng / self.cell_km).astype(np.int64)
+        return rows, cols
+
+    def _ring(self, row, col, radius):
+        """(row, col) 에서 체비쇼프 거리 radius 인 격자들의 점 인덱스"""
+        found = []
+        for r in range(row - radius, row + radius + 1):
+            if abs(r - row) == radius:
+                cols = range(col - radius, col + radius + 1)
+            else:
+                cols = (col - radius, col + radius)
+            for c in cols:
+                members = self.cells.get((r, c))
+                if members is not None:
+                    found.append(members)
+        return found
+
+    def _max_ring(self, row, col):
+        """모든 점을 덮는 데 필요한 최대 고리 반경"""
+        return max(abs(row - self.row_range[0]), abs(row - self.row_range[1]),
+                   abs(col - self.col_range[0]), abs(col - self.col_range[1]))
+
+    def within(self, lat, lng, radius_km):
+        """반경 안의 점 (인덱스 배열, 거리 배열) - 가까운 순"""
+        if not self.cells:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        rows, cols = self._cells(lat, lng)
+        row, col = int(rows), int(cols)
+        reach = min(int(math.ceil(radius_km / self.cell_km)) + 1, self._max_ring(row, col))
+        found = [m for radius in range(reach + 1) for m in self._ring(row, col, radius)]
+        if not found:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        idx = np.concatenate(found)
+        dist = haversine_km(lat, lng, self.lat[idx], self.lng[idx])
+        keep = dist <= radius_km
+        idx, dist = idx[keep], dist[keep]
+        order = np.argsort(dist, kind='stable')
+        return idx[order], dist[order]
+
+    def nearest(self, lat, lng, k=1, mask=None):
+        """가장 가까운 k개 (인덱스 배열, 거리 배열) - mask(bool 배열)가 있으면 True 인 점만"""
+        empty = (np.empty(0, dtype=np.int64), np.empty(0))
+        if not self.cells or k <= 0:
+            return empty
+        rows, cols = self._cells(lat, lng)
+        row, col = int(rows), int(cols)
+        max_ring = self._max_ring(row, col)
+
+        idx = np.empty(0, dtype=np.int64)
+        dist = np.empty(0)
+        for radius in range(max_ring + 1):
+            found = self._ring(row, col, radius)
+            if mask is not None:
+                found = [members[mask[members]] for members in found]
+            if found:
+                ring_idx = np.concatenate(found)
+                idx = np.concatenate([idx, ring_idx])
+                dist = np.concatenate([dist, haversine_km(lat, lng, self.lat[ring_idx], self.lng[ring_idx])])
+            # 다음 고리의 점은 최소 radius * cell_km 떨어져 있으므로, k번째 거리가 그보다 작으면 종료
+            # (투영 오차를 감안해 2% 여유)
+            if len(idx) >= k and radius * self.cell_km >= np.partition(dist, k - 1)[k - 1] * 1.02:
+                break
+
+        if len(idx) == 0:
+            return empty
+        order = np.argsort(dist, kind='stable')[:k]
+        return idx[order], dist[order]
+
+
+class KDTree:
+    """저차원 점(n × d)의 KD-트리 - 유클리드 k-최근접 검색 (점 목록은 생성 후 바뀌지 않는다고 가정)"""
+
+    def __init__(self, points, leaf_size=32):
+        self.points = np.asarray(points, dtype=np.float64)
+        if self.points.ndim == 1:
+            self.points = self.points[:, None]
+        self.leaf_size = leaf_size
+        self.order = np.arange(len(self.points))
+        # 노드별 배열: 담당 구간 [start, end), 자식 번호(잎이면 -1), 경계 상자
+        self.start, self.end, self.left, self.right = [], [], [], []
+        self.box_lo, self.box_hi = [], []
+        if len(self.points):
+            self._build(0, len(self.points))
+        self.box_lo = np.array(self.box_lo)
+        self.box_hi = np.array(self.box_hi)
+        # 내부 노드별 두 자식의 경계 상자 (2 × d), 방문할 때 한 번에 거리 계산
+        self.child_boxes = {
+            node: (self.box_lo[[left, right]], self.box_hi[[left, right]])
+            for node, (left, right) in enumerate(zip(self.left, self.right)) if left >= 0
+        }
+
+    def __len__(self):
+        return len(self.points)
+
+    def _build(self, start, end):
+        """order[start:end] 를 담당하는 노드 생성 (분산이 가장 큰 축의 중앙값으로 분할)"""
+        node = len(self.start)
+        members = self.points[self.order[start:end]]
+        self.start.append(start)
+        self.end.append(end)
+        self.left.append(-1)
+        self.right.append(-1)
+        self.box_lo.append(members.min(axis=0))
+        self.box_hi.append(members.max(axis=0))
+        if end - start > self.leaf_size:
+            axis = int(np.argmax(self.box_hi[node] - self.box_lo[node]))
+            mid = (end - start) // 2
+            part = np.argpartition(members[:, axis], mid)
+            self.order[start:end] = self.order[start:end][part]
+            self.left[node] = self._build(start, start + mid)
+            self.right[node] = self._build(start + mid, end)
+        return node
+
+    def _child_distances(self, node, x):
+        """점 x 에서 노드의 두 자식 경계 상자까지의 최소 거리"""
+        lo, hi = self.child_boxes[node]
+        gap = np.maximum(lo - x, 0) + np.maximum(x - hi, 0)
+        return np.sqrt((gap * gap).sum(axis=1)).tolist()
+
+    def nearest(self, x, k=1, mask=None):
+        """x 에서 가장 가까운 k개 (인덱스 배열, 거리 배열) - mask(bool 배열)가 있으면 True 인 점만
+
+        경계 상자까지 거리가 가까운 노드부터 방문하고, 그 거리가 현재 k번째 거리보다 멀면 멈춘다.
+        """
+        empty = (np.empty(0, dtype=np.int64), np.empty(0))
+        if not len(self.points) or k <= 0:
+            return empty
+        x = np.asarray(x, dtype=np.float64)
+
+        best_idx = np.empty(0, dtype=np.int64)
+        best_dist = np.empty(0)
+        kth = math.inf  # 현재 k번째 거리 (k개가 모이기 전에는 무한대)
+        frontier = [(0.0, 0)]
+        while frontier:
+            bound, node = heapq.heappop(frontier)
+            if bound > kth:
+                break
+            if self.left[node] >= 0:
+                children = (self.left[node], self.right[node])
+                for child, child_bound in zip(children, self._child_distances(node, x)):
+                    if child_bound <= kth:
+                        heapq.heappush(frontier, (child_bound, child))
+                continue
+            idx = self.order[self.start[node]:self.end[node]]
+            if mask is not None:
+                idx = idx[mask[idx]]
+            if not len(idx):
+                continue
+            diff = self.points[idx] - x
+            best_idx = np.concatenate([best_idx, idx])
+            best_dist = np.concatenate([best_dist, np.sqrt(np.einsum('ij,ij->i', diff, diff))])
+            keep = np.lexsort((best_idx, best_dist))[:k]  # 거리 오름차순, 동점이면 인덱스 순
+            best_idx, best_dist = best_idx[keep], best_dist[keep]
+            if len(best_idx) == k:
+                kth = best_dist[-1]
+
+        return best_idx, best_dist
@@ -4,10 +4,20 @@ import json
 import os
 import time
 import random
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 from geopy.distance import geodesic
 import numpy as np
+from place_search import PlaceSearchIndex, PrefixIndex, display_name
+import course_engine
+from course_catalog import CourseCatalog
+from opening_hours import NUM_SLOTS, row_weekly_mask, slot_label
+from hotel_proximity import HotelProximity
+from hotel_reviews import ReviewLog, apply_reviews
+from review_search import ReviewSearchIndex
+from hotels import ASPECT_COLUMNS, HotelIndex, HotelRankings, load_hotels, rank_hotels_for_courses
+from event_index import (EventIndex, row_event_period, infer_reference_year,
+                         START_DATE_COLUMNS, END_DATE_COLUMNS, PERIOD_COLUMNS, DETAIL_COLUMNS)
 
 # 페이지 설정
 st.set_page_config(
@@ -40,7 +50,7 @@ FILE_CATEGORIES = {
     "체육시설": ["체육시설", "공연행사"],
     "관광기념품": ["관광기념품", "외국인전용"],
     "한국음식점": ["음식점", "한국음식"],
-    "미술관/전시": ["미술관", "전시"],
+    "미술관/전시": ["미술관", "전시", "문화공간"],
     "종로구 관광지": ["종로구", "관광데이터"]
 }
 
@@ -401,10 +411,73 @@ def get_location_position():
         
     return DEFAULT_LOCATION  # 기본 위치 (서울시청)
 
+def get_place_search_index():
+    """로드된 관광지 마커의 검색 인덱스 반환 (마커가 다시 로드되면 재생성)"""
+    markers = st.session_state.all_markers
+    index = st.session_state.get('place_search_index')
+    if index is None or index.markers is not markers:
+        index = PlaceSearchIndex(markers)
+        st.session_state.place_search_index = index
+    return index
+
+def get_place_popularity():
+    """장소 인기도 함수 반환 (전체 사용자 방문 횟수 + 장소별 XP)"""
+    visit_counts = {}
+    for visits in st.session_state.user_visits.values():
+        for visit in visits:
+            visit_counts[visit['place_name']] = visit_counts.get(visit['place_name'], 0) + 1
+    
+    def popularity(marker):
+        title = marker.get('title', '')
+        return 1 + visit_counts.get(title, 0) + PLACE_XP.get(title, 0) / 10
+    
+    return popularity, sum(visit_counts.values())
+
+def get_place_autocomplete_index():
+    """자동완성 인덱스 반환 (마커 또는 방문 기록이 바뀌면 재생성)"""
+    markers = st.session_state.all_markers
+    popularity, total_visits = get_place_popularity()
+    index = st.session_state.get('place_autocomplete_index')
+    if (index is None or index.markers is not markers
+            or st.session_state.get('place_autocomplete_visits') != total_visits):
+        index = PrefixIndex(markers, popularity)
+        st.session_state.place_autocomplete_index = index
+        st.session_state.place_autocomplete_visits = total_visits
+    return index
+
+def select_search_suggestion(text):
+    """자동완성 추천어 선택 시 검색어 입력란에 반영"""
+    st.session_state.place_search_term = text
+
 #################################################
 # 데이터 로드 함수
 #################################################
 
+def place_data_version():
+    """asset 엑셀 파일 목록/크기/수정 시각 - 동기화(place_sync)로 파일이 바뀌면 달라짐"""
+    return tuple(sorted((p.name, p.stat().st_size, p.stat().st_mtime_ns) for p in Path("asset").glob("*.xlsx")))
+
+def markers_outdated():
+    """세션에 로드한 마커가 없거나 그 뒤로 장소 데이터 파일이 바뀌었는지"""
+    return (not st.session_state.markers_loaded or not st.session_state.all_markers
+            or st.session_state.get('markers_version') != place_data_version())
+
+def ensure_markers_loaded():
+    """세션 마커가 없거나 장소 데이터 파일이 바뀌었으면 현재 언어로 다시 로드 (코스 추천용 tourism_data 포함)"""
+    if not markers_outdated():
+        return
+    with st.spinner("서울 관광 데이터를 로드하는 중..."):
+        version = place_data_version()
+        all_markers = load_excel_files(st.session_state.language)
+        if all_markers:
+            st.session_state.all_markers = all_markers
+            st.session_state.markers_loaded = True
+            st.session_state.markers_version = version
+            st.session_state.tourism_data = all_markers  # 코스 추천을 위해 저장
+            st.success(f"총 {len(all_markers)}개의 관광지 로드 완료!")
+        else:
+            st.warning("관광지 데이터를 로드할 수 없습니다.")
+
 def load_excel_files(language="한국어"):
     """데이터 폴더에서 Excel 파일 로드 - 개선된 버전"""
     data_folder = Path("asset")
@@ -452,7 +525,7 @@ def load_excel_files(language="한국어"):
             st.success(f"'{file_path.name}' 파일 로드 완료: {len(df)}행, {len(df.columns)}열")
             
             # 데이터 전처리 및 마커 변환
-            markers = process_dataframe(df, file_category, language)
+            markers = process_dataframe(df, file_category, language, source=file_path.stem)
             
             if markers:
                 all_markers.extend(markers)
@@ -472,7 +545,7 @@ def load_excel_files(language="한국어"):
     
     return all_markers
 
-def process_dataframe(df, category, language="한국어"):
+def process_dataframe(df, category, language="한국어", source=None):
     """데이터프레임을 Google Maps 마커 형식으로 변환 - X, Y 좌표 처리 개선"""
     markers = []
     
@@ -600,12 +673,22 @@ def process_dataframe(df, category, language="한국어"):
                 st.error("좌표 변환 실패! 유효한 한국 영역 좌표를 찾을 수 없습니다.")
                 return []
     
-    # 7. 이름 열 결정
+    # 7. 이름 열 결정 (자동완성용으로 다른 언어 이름 열도 함께 확인)
     name_col = get_name_column(df, category, language)
+    # 언어 이름 변형은 그 언어 열이 실제로 있을 때만 (대체 열을 다른 언어 이름으로 색인하지 않게)
+    variant_name_cols = {lang: get_name_column(df, category, lang, fallback=False) for lang in LANGUAGE_CODES}
     
     # 8. 주소 열 결정
     address_col = get_address_column(df, language)
     
+    # 행사 기간 (기간 열이나 상세 설명이 있는 행사 데이터만, 월만 적힌 경우 연도는 설명에서 추정)
+    period_cols = START_DATE_COLUMNS + END_DATE_COLUMNS + PERIOD_COLUMNS
+    has_period = any(col in df.columns for col in period_cols) or any(col.startswith('상세') for col in df.columns)
+    reference_year = None
+    if has_period:
+        detail_texts = [text for col in DETAIL_COLUMNS if col in df.columns for text in df[col]]
+        reference_year = infer_reference_year(detail_texts)
+    
     # 9. 각 행을 마커로 변환
     success_count = 0
     for idx, row in valid_df.iterrows():
@@ -624,6 +707,12 @@ def process_dataframe(df, category, language="한국어"):
             if not (33 <= lat <= 43 and 124 <= lng <= 132):
                 continue  # 유효하지 않은 좌표 건너뛰기
             
+            # 언어별 이름
+            names = {}
+            for lang, col in variant_name_cols.items():
+                if col and pd.notna(row.get(col)):
+                    names[lang] = str(row[col])
+            
             # 주소 정보
             address = ""
             if address_col and address_col in row and pd.notna(row[address_col]):
@@ -643,8 +732,17 @@ def process_dataframe(df, category, language="한국어"):
                 'color': color,
                 'category': category,
                 'info': info,
-                'address': address
+                'address': address,
+                'names': names,
+                # 원본 행 기준 공유 장소 ID (언어가 달라도 같은 행이면 같은 ID)
+                'place_id': f"{source or category}#{idx}",
+                # 요일 × 시간대 영업 비트마스크 (운영시간/휴무일 열이 없으면 항상 영업)
+                'open_mask': row_weekly_mask(row)
             }
+            period = row_event_period(row, reference_year) if has_period else None
+            if period:
+                marker['event_start'] = period[0].isoformat()
+                marker['event_end'] = period[1].isoformat()
             markers.append(marker)
             success_count += 1
             
@@ -656,8 +754,8 @@ def process_dataframe(df, category, language="한국어"):
     return markers
 
 # 이름 열 결정 함수
-def get_name_column(df, category, language):
-    """카테고리와 언어에 따른 이름 열 결정"""
+def get_name_column(df, category, language, fallback=True):
+    """카테고리와 언어에 따른 이름 열 결정 (fallback=False 면 언어 후보 열이 없을 때 None)"""
     name_candidates = []
     
     # 언어별 기본 후보
@@ -683,6 +781,8 @@ def get_name_column(df, category, language):
     for col in name_candidates:
         if col in df.columns:
             return col
+    if not fallback:
+        return None
     
     # 명칭 열이 없으면 첫 번째 문자열 열 사용
     string_cols = [col for col in df.columns if df[col].dtype == 'object']
@@ -1401,9 +1501,269 @@ def display_visits(visits):
 # 개선된 관광 코스 추천 함수
 #################################################
 
-def recommend_courses(data, travel_styles, num_days, include_children=False):
+def get_place_table(data):
+    """코스 추천용 장소 배열 테이블 반환 (같은 마커 목록이면 재사용)"""
+    table = st.session_state.get('place_table')
+    if table is None or table.markers is not data:
+        table = course_engine.PlaceTable(data)
+        st.session_state.place_table = table
+    return table
+
+def get_event_index(data):
+    """행사 기간 색인 반환 (같은 마커 목록이면 재사용)"""
+    index = st.session_state.get('event_index')
+    if index is None or st.session_state.get('event_index_markers') is not data:
+        index = EventIndex(data)
+        st.session_state.event_index = index
+        st.session_state.event_index_markers = data
+    return index
+
+def get_trip_active_mask(data, trip_start, trip_end):
+    """여행 기간에 방문할 수 있는 장소 마스크 (기간이 정해진 행사가 모두 진행 중이면 None)"""
+    if trip_start is None or trip_end is None:
+        return None
+    index = get_event_index(data)
+    if len(index) == 0:
+        return None
+    active = index.active_mask(trip_start, trip_end)
+    return None if active.all() else active
+
+@st.cache_resource
+def get_review_log():
+    """추가 리뷰 로그와 호텔별 누적 집계 (스냅샷 이후에 붙은 리뷰만 읽음)"""
+    return ReviewLog()
+
+@st.cache_resource
+def get_hotel_index():
+    """서울 호텔 공간 색인 - 추가 리뷰 반영 (호텔 CSV가 없으면 None)"""
+    hotels = load_hotels(region="서울")
+    if not hotels:
+        return None
+    index = HotelIndex(hotels)
+    apply_reviews(get_review_log(), index)
+    return index
+
+@st.cache_resource
+def get_all_hotel_index():
+    """전체 지역 호텔 색인 - 비슷한 숙소 검색용, 추가 리뷰 반영 (호텔 CSV가 없으면 None)"""
+    hotels = load_hotels()
+    if not hotels:
+        return None
+    index = HotelIndex(hotels)
+    apply_reviews(get_review_log(), index)
+    return index
+
+@st.cache_resource
+def get_hotel_rankings():
+    """지역 × 항목별 호텔 순위 - 추가 리뷰 반영 (CSV는 앱 실행 중 한 번만 읽음, 없으면 None)"""
+    rankings = HotelRankings.load()
+    if rankings is not None:
+        apply_reviews(get_review_log(), rankings)
+    return rankings
+
+def add_hotel_review(region, hotel, scores, text=""):
+    """리뷰 한 건 추가 - 로그에 붙이고 캐시된 순위/색인에서 그 호텔 점수만 갱신"""
+    log = get_review_log()
+    log.append({'hotel': hotel, 'location': region, 'scores': scores, 'text': text})
+    for target in (get_hotel_rankings(), get_hotel_index(), get_all_hotel_index()):
+        if target is not None:
+            apply_reviews(log, target, keys=[(region, hotel)])
+
+@st.cache_resource
+def get_review_search_index():
+    """호텔 리뷰 전문 검색 색인 (리뷰 열은 첫 검색 때 한 번만 읽음, 없으면 None)"""
+    return ReviewSearchIndex.load()
+
+@st.cache_resource(max_entries=2)
+def get_hotel_proximity(places_version, _markers):
+    """호텔 주변 장소 열 - python hotel_proximity.py 로 만든 저장본이 지금 장소 데이터(places_version)로
+    계산한 것이면 그대로, 아니면 (장소 동기화 뒤 등) 현재 마커로 다시 계산 (호텔/장소가 없으면 None)"""
+    proximity = HotelProximity.load(places_version=places_version)
+    if proximity is None:
+        hotels = load_hotels()
+        if not hotels or not _markers:
+            return None
+        proximity = HotelProximity.build(hotels, _markers)
+    return proximity
+
+def suggest_hotels(daily_courses, k=5):
+    """코스 전체 이동 거리와 리뷰 점수 기준 추천 숙소 목록"""
+    hotel_index = get_hotel_index()
+    if hotel_index is None:
+        return []
+    return rank_hotels_for_courses(hotel_index, daily_courses, k=k)
+
+def get_meal_planner(table):
+    """식사 장소 삽입기 반환 (같은 장소 테이블이면 재사용)"""
+    planner = st.session_state.get('meal_planner')
+    if planner is None or planner.table is not table:
+        planner = course_engine.MealPlanner(table)
+        st.session_state.meal_planner = planner
+    return planner
+
+# 운영시간 비트마스크와 같은 시간대 정의에서 표시 이름 생성
+COURSE_TIME_SLOTS = [slot_label(slot) for slot in range(NUM_SLOTS)]
+
+def course_slot_labels(day_course):
+    """코스 장소별 시간대 표시 이름 (식사 장소는 점심/저녁 식사)"""
+    labels = []
+    visit = 0
+    for place in day_course:
+        if place.get('meal'):
+            labels.append(f"{place['meal']} 식사")
+        else:
+            labels.append(COURSE_TIME_SLOTS[min(visit, len(COURSE_TIME_SLOTS) - 1)])
+            visit += 1
+    return labels
+
+def show_course_day(day_idx, day_course, anchor=None):
+    """하루 코스 표시 (이동 거리 + 시간대별 장소)"""
+    st.markdown(f"### Day {day_idx + 1}")
+    
+    if not day_course:
+        st.info("추천 장소가 부족합니다.")
+        return
+    
+    if anchor:
+        day_km = course_engine.route_length_km(day_course, start=anchor, return_to_start=True)
+    else:
+        day_km = course_engine.route_length_km(day_course)
+    st.caption(f"이동 거리 약 {day_km:.1f}km")
+    
+    # 시간대별 장소 표시
+    slot_labels = course_slot_labels(day_course)
+    timeline = st.columns(len(day_course))
+    
+    for i, place in enumerate(day_course):
+        with timeline[i]:
+            st.markdown(f"**{'🍚 ' if place.get('meal') else ''}{slot_labels[i]}**")
+            st.markdown(f"**{place['title']}**")
+            st.caption(f"분류: {place['category']}")
+            
+            # 간단한 설명 추가
+            info_text = ""
+            if 'address' in place and place['address']:
+                info_text += f"위치: {place['address']}"
+                if len(place['address']) > 20:
+                    info_text = info_text[:20] + "..."
+            st.caption(info_text)
+
+@st.cache_resource
+def get_course_cache():
+    """모든 세션이 공유하는 추천 결과 캐시"""
+    return course_engine.CourseCache(maxsize=256)
+
+@st.cache_resource
+def get_course_catalog():
+    """미리 계산한 코스 카탈로그 (python course_catalog.py 로 생성, 없으면 None)"""
+    return CourseCatalog.load()
+
+def iter_course_days(table, travel_styles, num_days, include_children, start,
+                     optimize_route, day_hours, partition_days, weekdays=None, active=None,
+                     return_to_start=False, diversity=None):
+    """일별 코스를 차례로 반환 - 카탈로그에 있는 조건이면 바로, 없으면 엔진이 하루를 끝낼 때마다"""
+    catalog = get_course_catalog()
+    # 여행 기간 제약(active)은 카탈로그 코스에 끝난 행사가 없으면 그대로 만족하므로 카탈로그를 먼저 확인
+    if (catalog is not None and weekdays is None and not return_to_start
+            and catalog.matches(start, optimize_route, day_hours * 60, partition_days, diversity=diversity)):
+        courses = catalog.lookup(table, st.session_state.get('language', "한국어"), travel_styles,
+                                 num_days, include_children, STYLE_CATEGORY_WEIGHTS, active=active)
+        if courses is not None:
+            return iter(courses)
+
+    return course_engine.iter_recommend(
+        table,
+        travel_styles,
+        num_days,
+        include_children,
+        STYLE_CATEGORY_WEIGHTS,
+        places_per_day=3,  # 하루당 3곳 방문 가정 (아침, 점심, 저녁)
+        start=start,
+        optimize=optimize_route,
+        budget_minutes=day_hours * 60,
+        partition_days=partition_days,
+        weekdays=weekdays,
+        active=active,
+        return_to_start=return_to_start,
+        diversity=diversity
+    )
+
+def stream_courses(data, travel_styles, num_days, include_children=False,
+                   optimize_route=False, day_hours=10, partition_days=False, trip_start=None,
+                   trip_end=None, anchor=None, add_meals=False, diverse_places=False):
+    """
+    추천 코스를 하루씩 생성 (옵션은 recommend_courses 와 같음)
+    캐시에 있으면 바로 내보내고, 없으면 하루가 계산될 때마다 내보낸 뒤 전체를 캐시에 저장
+    """
+    # 장소 배열 변환 후 벡터 연산으로 점수 계산 및 일별 동선 선택
+    # 서울시청을 시작점으로 설정 (모든 날 아침에 숙소/시청에서 출발한다고 가정)
+    table = get_place_table(data)
+    start = tuple(anchor) if anchor is not None else (37.5665, 126.9780)
+    return_to_start = anchor is not None
+    weekdays = None
+    if trip_start is not None and table.has_hours:
+        weekdays = tuple((trip_start + timedelta(days=d)).weekday() for d in range(num_days))
+    active = get_trip_active_mask(data, trip_start, trip_end)
+    diversity = course_engine.DIVERSITY_TRADE_OFF if diverse_places else None
+    cache = get_course_cache()
+    cache_key = cache.make_key(
+        table.version, st.session_state.get('language', "한국어"), travel_styles, num_days,
+        include_children, start,
+        optimize=optimize_route, day_hours=day_hours if optimize_route else None,
+        partition_days=partition_days, weekdays=weekdays,
+        trip=None if active is None else (trip_start.isoformat(), trip_end.isoformat()),
+        return_to_start=return_to_start, diversity=diversity
+    )
+    
+    cached = cache.get(cache_key)
+    days = cached if cached is not None else iter_course_days(
+        table, travel_styles, num_days, include_children, start,
+        optimize_route, day_hours, partition_days, weekdays, active, return_to_start, diversity
+    )
+    planner = get_meal_planner(table) if add_meals else None
+    computed = []
+    seen_titles = set()
+    for day_course in days:
+        computed.append(day_course)
+        # 공유 캐시 항목이 화면 코드에서 바뀌지 않도록 복사본 사용
+        day_course = [dict(place) for place in day_course]
+        if planner is not None:
+            day_course = planner.insert_meals([day_course], start, return_to_start,
+                                              exclude_titles=seen_titles)[0]
+        seen_titles.update(place['title'] for place in day_course)
+        yield day_course
+    if cached is None:
+        cache.put(cache_key, computed)
+
+def course_type_for(travel_styles):
+    """여행 스타일에 따른 코스 이름"""
+    if "역사/문화" in travel_styles:
+        return "서울 역사/문화 탐방 코스"
+    elif "쇼핑" in travel_styles and "맛집" in travel_styles:
+        return "서울 쇼핑과 미식 코스"
+    elif "쇼핑" in travel_styles:
+        return "서울 쇼핑 중심 코스"
+    elif "맛집" in travel_styles:
+        return "서울 미식 여행 코스"
+    elif "자연" in travel_styles:
+        return "서울의 자연 코스"
+    elif "활동적인" in travel_styles:
+        return "액티브 서울 코스"
+    else:
+        return "서울 필수 여행 코스"
+
+def recommend_courses(data, travel_styles, num_days, include_children=False,
+                      optimize_route=False, day_hours=10, partition_days=False, trip_start=None,
+                      trip_end=None, anchor=None, add_meals=False, diverse_places=False):
     """
     사용자 취향과 일정에 따른 관광 코스 추천 기능
+    optimize_route=True면 하루 활동 시간(day_hours) 안에서 동선 최적화 단계를 추가로 실행
+    partition_days=True면 후보 장소를 지역별로 나눠 하루에 한 지역씩 배정
+    trip_start(여행 시작일)가 있으면 날짜별 요일의 운영시간에 맞는 장소만 시간대에 배정
+    trip_end(여행 종료일)까지 주면 여행 기간에 진행하지 않는 행사는 제외
+    anchor(숙소 좌표)가 있으면 매일 그곳에서 출발해 돌아오는 동선으로 계산
+    add_meals=True면 동선 사이에 가까운 식당을 점심/저녁 식사 장소로 추가
+    diverse_places=True면 점수가 같은 비슷한 장소만 몰리지 않게 카테고리/위치를 섞어 후보 선택
     """
     if not data:
         st.warning("관광지 데이터가 없습니다. 기본 추천 코스를 사용합니다.")
@@ -1419,103 +1779,15 @@ def recommend_courses(data, travel_styles, num_days, include_children=False):
             
         return RECOMMENDATION_COURSES.get(course_type, []), course_type, []
     
-    # 장소별 점수 계산
-    scored_places = []
-    
-    for place in data:
-        # 기본 점수는 중요도
-        score = place.get('importance', 1.0)
-        
-        # 여행 스타일에 따른 가중치 적용
-        for style in travel_styles:
-            if style in STYLE_CATEGORY_WEIGHTS:
-                category_weights = STYLE_CATEGORY_WEIGHTS[style]
-                if place['category'] in category_weights:
-                    score *= category_weights[place['category']]
-        
-        # 아이 동반인 경우 가족 친화적인 장소 선호 (미술관/체육시설)
-        if include_children:
-            if place['category'] in ["미술관/전시", "체육시설"]:
-                score *= 1.2
-        
-        # 최종 점수 저장
-        scored_place = place.copy()
-        scored_place['score'] = score
-        scored_places.append(scored_place)
-    
-    # 점수별 정렬
-    scored_places.sort(key=lambda x: x['score'], reverse=True)
-    
-    # 일수에 따른 장소 선택
-    # 하루당 3곳 방문 가정 (아침, 점심, 저녁)
-    places_per_day = 3
-    total_places = num_days * places_per_day
-    
-    # 상위 N개 장소 선택 (N = total_places * 2 for more options)
-    top_places = scored_places[:min(len(scored_places), total_places * 2)]
-    
-    # 동선 최적화: 그리디 알고리즘
-    # 서울시청을 시작점으로 설정 (모든 날 아침에 숙소/시청에서 출발한다고 가정)
-    seoul_city_hall = {"lat": 37.5665, "lng": 126.9780}
-    
-    daily_courses = []
-    
-    for day in range(num_days):
-        daily_course = []
-        current_position = seoul_city_hall
-        
-        # 이미 선택된 장소는 제외
-        available_places = [p for p in top_places if not any(p['title'] == dp['title'] for dc in daily_courses for dp in dc)]
-        
-        if not available_places:
-            break
-        
-        # 각 시간대별 최적 장소 선택
-        for time_slot in range(places_per_day):
-            if not available_places:
-                break
-                
-            # 거리 가중치가 적용된 점수 계산
-            for place in available_places:
-                distance = geodesic(
-                    (current_position['lat'], current_position['lng']), 
-                    (place['lat'], place['lng'])
-                ).kilometers
-                
-                # 거리에 따른 점수 감소 (너무 먼 곳은 피함)
-                distance_factor = max(0.5, 1 - (distance / 10))  # 10km 이상이면 점수 절반으로
-                place['adjusted_score'] = place.get('score', 1.0) * distance_factor
-            
-            # 조정된 점수로 재정렬
-            available_places.sort(key=lambda x: x.get('adjusted_score', 0), reverse=True)
-            
-            # 최고 점수 장소 선택
-            next_place = available_places[0]
-            daily_course.append(next_place)
-            
-            # 선택된 장소 제거
-            available_places.remove(next_place)
-            
-            # 현재 위치 업데이트
-            current_position = {"lat": next_place['lat'], "lng": next_place['lng']}
-        
-        daily_courses.append(daily_course)
+    daily_courses = list(stream_courses(
+        data, travel_styles, num_days, include_children,
+        optimize_route=optimize_route, day_hours=day_hours, partition_days=partition_days,
+        trip_start=trip_start, trip_end=trip_end, anchor=anchor, add_meals=add_meals,
+        diverse_places=diverse_places
+    ))
     
     # 코스 이름 결정
-    if "역사/문화" in travel_styles:
-        course_type = "서울 역사/문화 탐방 코스"
-    elif "쇼핑" in travel_styles and "맛집" in travel_styles:
-        course_type = "서울 쇼핑과 미식 코스"
-    elif "쇼핑" in travel_styles:
-        course_type = "서울 쇼핑 중심 코스"
-    elif "맛집" in travel_styles:
-        course_type = "서울 미식 여행 코스"
-    elif "자연" in travel_styles:
-        course_type = "서울의 자연 코스"
-    elif "활동적인" in travel_styles:
-        course_type = "액티브 서울 코스"
-    else:
-        course_type = "서울 필수 여행 코스"
+    course_type = course_type_for(travel_styles)
     
     # 추천 장소 이름 목록 생성
     recommended_places = []
@@ -1747,6 +2019,22 @@ def show_menu_page():
         if st.button("🗺️ 서울 장소 혼잡도 지도", use_container_width=True, key="congestion_map_button"):
             st.session_state.current_page = "congestion"
             st.rerun()
+    
+    st.markdown("")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("""
+        <div class="card">
+            <h3>🏠 STAY-VIEW 숙소 리뷰</h3>
+            <p>지역별 호텔을 리뷰 감성 항목(소음, 가격, 위치 등) 순위로 비교해보세요.</p>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        if st.button("숙소 리뷰 보기", key="stay_button", use_container_width=True):
+            change_page("stay")
+            st.rerun()
             
     # 로그아웃 버튼
     st.markdown("---")
@@ -1754,6 +2042,67 @@ def show_menu_page():
         logout_user()
         st.rerun()
 
+@st.fragment
+def show_place_search_panel():
+    """장소 검색/자동완성 패널 - 입력 시 이 영역만 다시 실행"""
+    # 검색 기능 (초성/오타 허용)
+    search_term = st.text_input("장소 검색", key="place_search_term")
+    
+    language = st.session_state.language
+    
+    if search_term and st.session_state.all_markers:
+        # 자동완성 추천어
+        suggestions = get_place_autocomplete_index().complete(search_term, k=5)
+        suggestions = [item for item in suggestions if item['text'] != search_term]
+        if suggestions:
+            st.caption("추천 검색어")
+            for i, suggestion in enumerate(suggestions):
+                st.button(
+                    suggestion['text'],
+                    key=f"suggest_{i}",
+                    on_click=select_search_suggestion,
+                    args=(suggestion['text'],)
+                )
+        
+        search_results = get_place_search_index().search(search_term)
+        
+        if search_results:
+            st.markdown(f"### 🔍 검색 결과 ({len(search_results)}개)")
+            for i, marker in enumerate(search_results[:5]):  # 상위 5개만
+                # 어떤 언어로 검색했든 현재 언어 이름으로 표시
+                place_name = display_name(marker, language)
+                with st.container():
+                    st.markdown(f"**{place_name}**")
+                    st.caption(f"분류: {marker.get('category', '기타')}")
+                    
+                    col1, col2 = st.columns([1,1])
+                    with col1:
+                        if st.button(f"길찾기", key=f"nav_{i}"):
+                            st.session_state.navigation_active = True
+                            st.session_state.navigation_destination = {
+                                "name": place_name,
+                                "lat": marker['lat'],
+                                "lng": marker['lng']
+                            }
+                            st.rerun()
+                    
+                    with col2:
+                        if st.button(f"방문기록", key=f"visit_{i}"):
+                            success, xp = add_visit(
+                                st.session_state.username,
+                                place_name,
+                                marker['lat'],
+                                marker['lng']
+                            )
+                            if success:
+                                st.success(f"'{place_name}' 방문! +{xp} XP 획득!")
+                                time.sleep(1)
+                                st.rerun()
+                            else:
+                                st.info("이미 오늘 방문한 장소입니다.")
+        else:
+            st.info(f"'{search_term}'에 대한 검색 결과가 없습니다.")
+
 def show_map_page():
     """지도 페이지 표시 - 내비게이션 기능 개선"""
     page_header("서울 관광 장소 지도")
@@ -1795,16 +2144,7 @@ def show_map_page():
     user_location = get_location_position()
     
     # 자동으로 Excel 파일 로드 (아직 로드되지 않은 경우)
-    if not st.session_state.markers_loaded or not st.session_state.all_markers:
-        with st.spinner("서울 관광 데이터를 로드하는 중..."):
-            all_markers = load_excel_files(st.session_state.language)
-            if all_markers:
-                st.session_state.all_markers = all_markers
-                st.session_state.markers_loaded = True
-                st.session_state.tourism_data = all_markers  # 코스 추천을 위해 저장
-                st.success(f"총 {len(all_markers)}개의 관광지 로드 완료!")
-            else:
-                st.warning("관광지 데이터를 로드할 수 없습니다.")
+    ensure_markers_loaded()
     
     # 내비게이션 모드가 아닌 경우 기본 지도 표시
     if not st.session_state.navigation_active:
@@ -1826,8 +2166,18 @@ def show_map_page():
             
             # 로드된 데이터 마커 추가
             if st.session_state.all_markers:
-                markers.extend(st.session_state.all_markers)
-                st.success(f"지도에 {len(st.session_state.all_markers)}개의 장소를 표시했습니다.")
+                place_markers = st.session_state.all_markers
+                
+                # 코스 페이지에서 여행 기간을 정했으면 그 기간에 진행하는 행사만 표시
+                trip_dates = st.session_state.get('trip_dates')
+                if trip_dates and st.checkbox(
+                        f"여행 기간({trip_dates[0]} ~ {trip_dates[1]}) 행사만 보기", value=True):
+                    active = get_trip_active_mask(place_markers, *trip_dates)
+                    if active is not None:
+                        place_markers = [m for m, keep in zip(place_markers, active) if keep]
+                
+                markers.extend(place_markers)
+                st.success(f"지도에 {len(place_markers)}개의 장소를 표시했습니다.")
             
             # Google Maps 표시
             show_google_map(
@@ -1843,46 +2193,8 @@ def show_map_page():
         with info_col:
             st.subheader("장소 정보")
             
-            # 검색 기능
-            search_term = st.text_input("장소 검색")
-            if search_term and st.session_state.all_markers:
-                search_results = [m for m in st.session_state.all_markers 
-                                 if search_term.lower() in m['title'].lower()]
-                
-                if search_results:
-                    st.markdown(f"### 🔍 검색 결과 ({len(search_results)}개)")
-                    for i, marker in enumerate(search_results[:5]):  # 상위 5개만
-                        with st.container():
-                            st.markdown(f"**{marker['title']}**")
-                            st.caption(f"분류: {marker.get('category', '기타')}")
-                            
-                            col1, col2 = st.columns([1,1])
-                            with col1:
-                                if st.button(f"길찾기", key=f"nav_{i}"):
-                                    st.session_state.navigation_active = True
-                                    st.session_state.navigation_destination = {
-                                        "name": marker['title'],
-                                        "lat": marker['lat'],
-                                        "lng": marker['lng']
-                                    }
-                                    st.rerun()
-                            
-                            with col2:
-                                if st.button(f"방문기록", key=f"visit_{i}"):
-                                    success, xp = add_visit(
-                                        st.session_state.username,
-                                        marker['title'],
-                                        marker['lat'],
-                                        marker['lng']
-                                    )
-                                    if success:
-                                        st.success(f"'{marker['title']}' 방문! +{xp} XP 획득!")
-                                        time.sleep(1)
-                                        st.rerun()
-                                    else:
-                                        st.info("이미 오늘 방문한 장소입니다.")
-                else:
-                    st.info(f"'{search_term}'에 대한 검색 결과가 없습니다.")
+            # 검색 패널 (지도를 다시 그리지 않도록 부분 실행)
+            show_place_search_panel()
             
             # 카테고리별 통계
             if st.session_state.all_markers:
@@ -2077,16 +2389,7 @@ def show_course_page():
         st.rerun()
     
     # 자동으로 데이터 로드 (아직 로드되지 않은 경우)
-    if not st.session_state.markers_loaded or not st.session_state.all_markers:
-        with st.spinner("서울 관광 데이터를 로드하는 중..."):
-            all_markers = load_excel_files(st.session_state.language)
-            if all_markers:
-                st.session_state.all_markers = all_markers
-                st.session_state.markers_loaded = True
-                st.session_state.tourism_data = all_markers
-                st.success(f"총 {len(all_markers)}개의 관광지 로드 완료!")
-            else:
-                st.warning("관광지 데이터를 로드할 수 없습니다.")
+    ensure_markers_loaded()
     
     # AI 추천 아이콘 및 소개
     col1, col2 = st.columns([1, 5])
@@ -2114,6 +2417,7 @@ def show_course_page():
     
     # 일수 계산
     delta = (end_date - start_date).days + 1
+    st.session_state.trip_dates = (start_date, end_date)  # 지도에서 여행 기간 행사 필터에 사용
     st.caption(f"총 {delta}일 일정")
     
     col1, col2 = st.columns(2)
@@ -2137,6 +2441,29 @@ def show_course_page():
             if st.checkbox(style, key=f"style_{style}"):
                 selected_styles.append(style)
     
+    # 동선 최적화 옵션
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        optimize_route = st.checkbox("동선 최적화", value=True, help="이동 거리를 줄이도록 하루 방문 순서와 장소를 다시 조정합니다.")
+        partition_days = st.checkbox("지역별 일정 분할", value=False, disabled=delta < 2,
+                                     help="추천 장소를 가까운 지역끼리 묶어 하루에 한 지역씩 둘러봅니다.")
+        add_meals = st.checkbox("점심/저녁 식사 장소 추가", value=True,
+                                help="동선에서 가장 적게 돌아가는 근처 한국음식점을 식사 장소로 넣습니다.")
+        diverse_places = st.checkbox("비슷한 장소 줄이기", value=True,
+                                     help="같은 종류나 같은 동네의 장소만 몰리지 않도록 여러 카테고리/지역을 섞습니다.")
+    
+    with col2:
+        day_hours = st.slider("하루 활동 시간 (시간)", min_value=4, max_value=14, value=10, disabled=not optimize_route)
+    
+    # 숙소 선택 (매일 출발/도착 지점)
+    hotel_index = get_hotel_index()
+    hotel_options = ["서울시청 (기본)"]
+    if hotel_index is not None:
+        hotel_options += ["추천 숙소 자동 선택"] + sorted(h['title'] for h in hotel_index.hotels)
+    hotel_choice = st.selectbox("숙소 (매일 출발/도착 지점)", hotel_options,
+                                help="선택한 숙소에서 매일 출발해 돌아오는 동선으로 코스를 만듭니다.")
+    
     # 코스 생성 버튼
     st.markdown("---")
     generate_course = st.button("코스 생성하기", type="primary", use_container_width=True)
@@ -2146,50 +2473,73 @@ def show_course_page():
             st.warning("최소 하나 이상의 여행 스타일을 선택해주세요.")
         else:
             with st.spinner("최적의 관광 코스를 생성 중입니다..."):
-                # 코스 추천 실행
-                recommended_places, course_type, daily_courses = recommend_courses(
-                    st.session_state.all_markers if hasattr(st.session_state, 'all_markers') else [],
-                    selected_styles,
-                    delta,
-                    include_children
+                course_options = dict(
+                    optimize_route=optimize_route,
+                    day_hours=day_hours,
+                    partition_days=partition_days,
+                    diverse_places=diverse_places,
+                    trip_start=start_date,
+                    trip_end=end_date
                 )
+                course_data = st.session_state.all_markers if hasattr(st.session_state, 'all_markers') else []
                 
-                st.success("코스 생성 완료!")
+                # 숙소 결정 (자동 선택이면 기본 코스 기준으로 가장 좋은 숙소를 고른 뒤 다시 계산)
+                anchor_hotel = None
+                if hotel_index is not None and hotel_choice in hotel_index.by_title:
+                    anchor_hotel = hotel_index.hotels[hotel_index.by_title[hotel_choice]]
+                elif hotel_choice == "추천 숙소 자동 선택":
+                    _, _, base_courses = recommend_courses(
+                        course_data, selected_styles, delta, include_children, **course_options
+                    )
+                    ranking = suggest_hotels(base_courses, k=1)
+                    if ranking:
+                        anchor_hotel = ranking[0]['hotel']
+                anchor = (anchor_hotel['lat'], anchor_hotel['lng']) if anchor_hotel else None
                 
                 # 코스 표시
                 st.markdown("## 추천 코스")
-                st.markdown(f"**{course_type}** - {delta}일 일정")
                 
-                # 일별 코스 표시
-                if daily_courses:
-                    # 실제 데이터 기반 일별 코스 표시
-                    for day_idx, day_course in enumerate(daily_courses):
-                        st.markdown(f"### Day {day_idx + 1}")
-                        
-                        if not day_course:
-                            st.info("추천 장소가 부족합니다.")
-                            continue
-                        
-                        # 시간대별 장소 표시
-                        time_slots = ["오전 (09:00-12:00)", "오후 (13:00-16:00)", "저녁 (16:00-19:00)"]
-                        timeline = st.columns(len(day_course))
-                        
-                        for i, place in enumerate(day_course):
-                            with timeline[i]:
-                                time_idx = min(i, len(time_slots) - 1)
-                                st.markdown(f"**{time_slots[time_idx]}**")
-                                st.markdown(f"**{place['title']}**")
-                                st.caption(f"분류: {place['category']}")
-                                
-                                # 간단한 설명 추가
-                                info_text = ""
-                                if 'address' in place and place['address']:
-                                    info_text += f"위치: {place['address']}"
-                                    if len(place['address']) > 20:
-                                        info_text = info_text[:20] + "..."
-                                st.caption(info_text)
+                if course_data:
+                    # 하루가 계산될 때마다 바로 표시 (긴 일정도 Day 1 부터 먼저 보임)
+                    course_type = course_type_for(selected_styles)
+                    st.markdown(f"**{course_type}** - {delta}일 일정")
+                    if anchor_hotel:
+                        st.markdown(f"🏨 숙소: **{anchor_hotel['title']}** (매일 출발/도착)")
+                    
+                    progress = st.progress(0.0, text="Day 1 코스를 계산하는 중...")
+                    daily_courses = []
+                    for day_course in stream_courses(
+                        course_data, selected_styles, delta, include_children,
+                        anchor=anchor, add_meals=add_meals, **course_options
+                    ):
+                        daily_courses.append(day_course)
+                        show_course_day(len(daily_courses) - 1, day_course, anchor)
+                        done = len(daily_courses)
+                        progress.progress(done / delta, text=f"Day {done + 1} 코스를 계산하는 중..." if done < delta else "완료")
+                    progress.empty()
+                    recommended_places = [place['title'] for day_course in daily_courses for place in day_course]
                 else:
-                    # 기본 코스 데이터 표시
+                    recommended_places, course_type, daily_courses = recommend_courses(
+                        course_data, selected_styles, delta, include_children, **course_options
+                    )
+                    st.markdown(f"**{course_type}** - {delta}일 일정")
+                
+                st.success("코스 생성 완료!")
+                cache_stats = get_course_cache().stats()
+                st.caption(f"추천 캐시 적중률 {cache_stats['hit_rate']:.0%} "
+                           f"({cache_stats['hits']}/{cache_stats['hits'] + cache_stats['misses']}, "
+                           f"저장 {cache_stats['size']}/{cache_stats['maxsize']})")
+                
+                # 추천 숙소 (코스 전체 이동 거리 + 리뷰 점수)
+                hotel_suggestions = suggest_hotels(daily_courses) if daily_courses else []
+                if hotel_suggestions:
+                    with st.expander("🏨 이 코스에 어울리는 숙소"):
+                        for rank, item in enumerate(hotel_suggestions, 1):
+                            st.markdown(f"{rank}. **{item['hotel']['title']}** - "
+                                        f"총 이동 약 {item['travel_km']:.1f}km, 리뷰 점수 {item['aspect_score']:.2f}")
+                
+                # 데이터가 없으면 기본 코스 표시 (실제 데이터 코스는 위에서 하루씩 표시함)
+                if not daily_courses:
                     for day in range(1, min(delta+1, 4)):  # 최대 3일까지
                         st.markdown(f"### Day {day}")
                         
@@ -2210,8 +2560,7 @@ def show_course_page():
                         
                         for i, spot_name in enumerate(day_spots):
                             # 시간대 설정
-                            time_slots = ["오전 (09:00-12:00)", "오후 (13:00-16:00)", "저녁 (16:00-19:00)"]
-                            time_slot = time_slots[i % 3]
+                            time_slot = COURSE_TIME_SLOTS[i % len(COURSE_TIME_SLOTS)]
                             
                             with timeline[i]:
                                 st.markdown(f"**{time_slot}**")
@@ -2232,19 +2581,30 @@ def show_course_page():
                 # 코스 마커 생성
                 map_markers = []
                 
+                if anchor_hotel:
+                    map_markers.append({
+                        'lat': anchor_hotel['lat'],
+                        'lng': anchor_hotel['lng'],
+                        'title': f"숙소 - {anchor_hotel['title']}",
+                        'info': f"숙소<br>{anchor_hotel.get('address', '')}",
+                        'category': '숙소',
+                        'color': 'red'
+                    })
+                
                 if daily_courses:
                     # 실제 데이터 기반 코스
                     for day_idx, day_course in enumerate(daily_courses):
+                        slot_labels = course_slot_labels(day_course)
                         for time_idx, place in enumerate(day_course):
-                            # 시간대별 색상 구분
+                            # 시간대별 색상 구분 (식사 장소는 주황색)
                             colors = ["blue", "green", "purple"]
-                            color = colors[time_idx % len(colors)]
+                            color = "orange" if place.get('meal') else colors[time_idx % len(colors)]
                             
                             marker = {
                                 'lat': place['lat'],
                                 'lng': place['lng'],
                                 'title': f"Day {day_idx+1} - {place['title']}",
-                                'info': f"Day {day_idx+1} {time_slots[time_idx]}<br>{place.get('info', '')}",
+                                'info': f"Day {day_idx+1} {slot_labels[time_idx]}<br>{place.get('info', '')}",
                                 'category': place['category'],
                                 'color': color
                             }
@@ -2485,6 +2845,155 @@ def show_congestion_page():
         "[👉 서울시 공식 사이트 새 탭에서 전체 화면으로 보기](https://data.seoul.go.kr/SeoulRtd/map)"
     )
 
+def show_stay_page():
+    """STAY-VIEW 숙소 리뷰 페이지 - 지역별 항목 순위와 호텔 요약"""
+    page_header("🏠 STAY-VIEW💬")
+    
+    if st.button("← 메뉴로 돌아가기"):
+        change_page("menu")
+        st.rerun()
+    
+    rankings = get_hotel_rankings()
+    if rankings is None:
+        st.warning("호텔 리뷰 데이터(hotel_fin_0331_1.csv)를 찾을 수 없습니다.")
+        return
+    
+    # 지역/호텔 선택
+    selected_region = st.radio("📍 지역을 선택하세요", rankings.regions, horizontal=True)
+    selected_hotel = st.selectbox("🏠 호텔을 선택하세요", ["전체 보기"] + rankings.hotels(selected_region))
+    
+    # 항목별 순위 (미리 정렬해 둔 순위에서 바로 조회)
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("#### 🔍 항목별 상위 호텔")
+        aspect_to_sort = st.selectbox("정렬 기준", ASPECT_COLUMNS)
+        for rank, (hotel, score) in enumerate(rankings.top(selected_region, aspect_to_sort, 5), 1):
+            st.write(f"👑**{rank}등!** {hotel} ({score:.2f})")
+    with col2:
+        st.markdown("#### ⚖️ 나만의 기준 순위")
+        weights = {}
+        slider_cols = st.columns(3)
+        for i, aspect in enumerate(ASPECT_COLUMNS):
+            with slider_cols[i % 3]:
+                weights[aspect] = st.slider(aspect, 0, 5, 1, key=f"stay_weight_{aspect}")
+        for rank, (hotel, score) in enumerate(rankings.weighted_top(selected_region, weights, 5), 1):
+            st.write(f"**{rank}.** {hotel} ({score:.2f})")
+    
+    # 주변 장소 기준 순위 (미리 계산한 반경별 개수 열에 가중치만 곱함)
+    ensure_markers_loaded()
+    markers = st.session_state.all_markers
+    proximity = get_hotel_proximity(get_place_table(markers).version, markers) if markers else None
+    if proximity is not None:
+        with st.expander("🚶 걸어서 갈 수 있는 장소가 많은 숙소"):
+            near_categories = st.multiselect("가까웠으면 하는 장소", proximity.categories,
+                                             default=[c for c in ["종로구 관광지", "한국음식점"] if c in proximity.categories])
+            radius_km = st.select_slider("도보 반경 (km)", options=proximity.radii_km, value=proximity.radii_km[len(proximity.radii_km) // 2])
+            ranking = proximity.rank({c: 1.0 for c in near_categories}, radius_km,
+                                     titles=rankings.hotels(selected_region))
+            for rank, (hotel, count) in enumerate(ranking, 1):
+                st.write(f"**{rank}.** {hotel} - 반경 {radius_km:g}km 안에 {count:.0f}곳")
+            if near_categories and not ranking:
+                st.info("이 지역 호텔의 주변 장소 정보가 없습니다.")
+    
+    # 리뷰 문장 검색 (글자 2-gram 색인 + BM25)
+    with st.expander("📝 리뷰로 숙소 찾기"):
+        review_query = st.text_input("리뷰에서 찾을 말", placeholder="예: 조용한 역세권", key="stay_review_query")
+        field_options = {"좋았던 점": 'positive', "아쉬운 점": 'negative', "전체": None}
+        review_field = st.radio("검색할 리뷰", list(field_options), horizontal=True, key="stay_review_field")
+        only_region = st.checkbox(f"{selected_region} 지역만", value=True, key="stay_review_region")
+        if review_query.strip():
+            review_index = get_review_search_index()
+            results = review_index.search(review_query, k=5, field=field_options[review_field],
+                                          region=selected_region if only_region else None) if review_index else []
+            for rank, item in enumerate(results, 1):
+                st.markdown(f"**{rank}. {item['hotel']}** ({item['location']}) - 점수 {item['score']:.2f}")
+                if item['snippet']:
+                    st.markdown(f"> {item['snippet']}")
+            if not results:
+                st.info("검색어와 맞는 리뷰가 없습니다.")
+    
+    st.markdown("---")
+    
+    # 지도
+    if selected_hotel == "전체 보기":
+        st.subheader(f"🗺️ {selected_region} 지역 호텔 지도")
+        map_rows = [rankings.record(selected_region, hotel) for hotel in rankings.hotels(selected_region)]
+    else:
+        st.subheader(f"🗺️ '{selected_hotel}' 위치")
+        map_rows = [rankings.record(selected_region, selected_hotel)]
+    map_df = pd.DataFrame(
+        [{'lat': row['Latitude'], 'lon': row['Longitude']} for row in map_rows if row is not None]
+    ).dropna()
+    if not map_df.empty:
+        st.map(map_df, zoom=15 if len(map_df) == 1 else 11)
+    else:
+        st.warning("지도에 표시할 위치 정보가 없습니다.")
+    
+    if selected_hotel != "전체 보기":
+        hotel_data = rankings.record(selected_region, selected_hotel)
+        # 리뷰 요약은 호텔을 고른 뒤에만 읽음
+        review = rankings.review(selected_region, selected_hotel) or {}
+        
+        # 호텔 요약
+        st.markdown("### ✨ 선택한 호텔 요약")
+        col1, col2 = st.columns(2)
+        with col1:
+            st.subheader("✅ 긍정 요약")
+            st.write(review.get('positive', ''))
+        with col2:
+            st.subheader("🚫 부정 요약")
+            st.write(review.get('negative', ''))
+        
+        # 주변 장소
+        nearby = proximity.counts_for(selected_hotel, 1.0) if proximity is not None else None
+        if nearby:
+            st.markdown("#### 🚶 걸어서 15분(1km) 안의 장소")
+            st.write(", ".join(f"{category} {count}곳" for category, count in nearby.items()))
+            for _, title, km in proximity.nearest_for(selected_hotel):
+                st.write(f"- {title} ({km * 1000:.0f}m)")
+        
+        # 항목별 점수
+        st.markdown("---")
+        st.subheader("📊 항목별 평균 점수")
+        score_df = pd.DataFrame({
+            "항목": ASPECT_COLUMNS,
+            "점수": [hotel_data.get(aspect) for aspect in ASPECT_COLUMNS]
+        })
+        st.bar_chart(score_df, x="항목", y="점수")
+        added_reviews = get_review_log().aggregates.count(selected_region, selected_hotel)
+        if added_reviews:
+            st.caption(f"새로 추가된 리뷰 {added_reviews}건이 반영된 점수입니다.")
+        
+        # 리뷰 추가 (추가 전용 로그 + 호텔별 누적 집계, 이 호텔 점수만 다시 계산)
+        with st.expander("✍️ 이 호텔 리뷰 남기기"):
+            with st.form("stay_review_form", clear_on_submit=True):
+                review_labels = {"아쉬움": -1.0, "언급 없음": 0.0, "좋음": 1.0}
+                review_cols = st.columns(3)
+                review_scores = {}
+                for i, aspect in enumerate(ASPECT_COLUMNS):
+                    with review_cols[i % 3]:
+                        choice = st.select_slider(aspect, options=list(review_labels), value="언급 없음",
+                                                  key=f"stay_review_{aspect}")
+                        review_scores[aspect] = review_labels[choice]
+                review_text = st.text_area("한 줄 후기 (선택)")
+                if st.form_submit_button("리뷰 등록"):
+                    add_hotel_review(selected_region, selected_hotel, review_scores, review_text)
+                    st.rerun()
+        
+        # 리뷰 점수가 비슷한 숙소 (점수 벡터 색인 + 선택 시 거리 제한)
+        st.markdown("---")
+        st.subheader("🔎 이 호텔과 비슷한 숙소")
+        distance_options = {"거리 제한 없음": None, "1km 이내": 1.0, "3km 이내": 3.0, "5km 이내": 5.0, "10km 이내": 10.0}
+        distance_choice = st.selectbox("거리", list(distance_options), key="stay_similar_distance")
+        hotel_index = get_all_hotel_index()
+        similar = hotel_index.similar(selected_hotel, max_km=distance_options[distance_choice]) if hotel_index else []
+        if similar:
+            for rank, item in enumerate(similar, 1):
+                st.write(f"**{rank}.** {item['hotel']['title']} ({item['hotel']['location']}) - "
+                         f"점수 차이 {item['distance']:.2f}, 약 {item['km']:.1f}km")
+        else:
+            st.info("조건에 맞는 비슷한 숙소가 없습니다.")
+
 
 #################################################
 # 메인 앱 로직
@@ -2525,6 +3034,8 @@ def main():
         show_history_page()
     elif st.session_state.current_page == "congestion":
         show_congestion_page()
+    elif st.session_state.current_page == "stay":
+        show_stay_page()
     else:
         show_menu_page()  # 기본값
 
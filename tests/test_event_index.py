@@ -0,0 +1,60 @@
+"""event_index 기간 파싱 / 구간 트리 질의 (전수 비교)"""
+from datetime import date
+
+import numpy as np
+import pytest
+
+from event_index import EventIndex, IntervalTree, parse_event_period, row_event_period
+
+
+@pytest.mark.parametrize('text, expected', [
+    ("2025.04.01 ~ 2025.04.30", (date(2025, 4, 1), date(2025, 4, 30))),
+    ("2025-04-01~30", (date(2025, 4, 1), date(2025, 4, 30))),
+    ("2025년 4월 10일", (date(2025, 4, 10), date(2025, 4, 10))),
+    ("2026년 4월-5월 야간 개장", (date(2026, 4, 1), date(2026, 5, 31))),
+    ("5,6월 주말 공연", (date(2025, 5, 1), date(2025, 6, 30))),
+    ("봄꽃 축제 (4월)", (date(2025, 4, 1), date(2025, 4, 30))),
+    ("4월10일 개막", (date(2025, 4, 10), date(2025, 4, 10))),
+])
+def test_parse_event_period(text, expected):
+    assert parse_event_period(text, default_year=2025) == expected
+
+
+def test_month_only_period_needs_a_year():
+    assert parse_event_period("4월-5월") is None
+    assert parse_event_period("상설 전시", default_year=2025) is None
+
+
+def test_row_period_prefers_start_end_columns():
+    row = {'시작일': "2025-05-10", '종료일': "2025-05-01", '기간': "2024.01.01 ~ 2024.12.31"}
+    assert row_event_period(row) == (date(2025, 5, 1), date(2025, 5, 10))
+    assert row_event_period({'상세(한국어)': "전시 기간 (6월)"}, default_year=2025) == \
+        (date(2025, 6, 1), date(2025, 6, 30))
+
+
+def test_interval_tree_matches_brute_force():
+    rng = np.random.default_rng(7)
+    starts = rng.integers(0, 1000, size=500)
+    ends = starts + rng.integers(0, 120, size=500)
+    tree = IntervalTree(starts, ends)
+
+    for lo in range(-50, 1150, 37):
+        for width in (0, 5, 90):
+            hi = lo + width
+            expected = np.flatnonzero((starts <= hi) & (ends >= lo))
+            assert np.array_equal(np.sort(tree.query(lo, hi)), expected)
+
+
+def test_event_index_keeps_undated_places_active():
+    markers = [
+        {'event_start': "2025-04-01", 'event_end': "2025-04-30"},
+        {},
+        {'event_start': "2025-06-01", 'event_end': "2025-06-01"},
+        {'event_start': "2025-03-20", 'event_end': "2025-05-10"},
+    ]
+    index = EventIndex(markers)
+
+    assert len(index) == 3
+    assert index.query(date(2025, 4, 29), date(2025, 5, 2)).tolist() == [0, 3]
+    assert index.active_mask(date(2025, 6, 1), date(2025, 6, 3)).tolist() == [False, True, True, False]
+    assert index.active_mask(date(2025, 1, 1), date(2025, 1, 31)).tolist() == [False, True, False, False]
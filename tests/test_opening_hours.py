@@ -0,0 +1,58 @@
+"""opening_hours 휴무일/운영시간 문구 → 주간 비트마스크"""
+import pytest
+
+from opening_hours import ALWAYS_OPEN, DAY_BITS, compile_weekly_mask, parse_days
+
+
+def closed_days(mask):
+    """마스크에서 세 시간대가 모두 닫힌 요일 집합"""
+    return {day for day in range(7) if not (mask >> (day * 3)) & DAY_BITS}
+
+
+@pytest.mark.parametrize('text', [
+    "1월 1일, 설날 및 추석 당일",
+    "설날 당일 휴관",
+    "설날·추석 연휴",
+    "공휴일 휴관",
+    "매월 첫째 월요일",
+    "매월 둘째, 넷째 일요일 휴무",
+    "화장실 이용 불가 일부 시설 휴관",
+])
+def test_holiday_and_monthly_closures_keep_every_weekday_open(text):
+    assert compile_weekly_mask(None, text) == ALWAYS_OPEN
+
+
+@pytest.mark.parametrize('text, expected', [
+    ("매주 월요일", {0}),
+    ("월요일 휴관", {0}),
+    ("매주 월요일, 1월 1일, 설날·추석 당일", {0}),
+    ("매주 월요일 및 1월 1일", {0}),
+    ("매주 월 휴관", {0}),
+    ("월·화", {0, 1}),
+    ("월/화 휴관", {0, 1}),
+    ("토, 일요일", {5, 6}),
+    ("월~금", {0, 1, 2, 3, 4}),
+    ("금-월 휴무", {4, 5, 6, 0}),
+    ("Closed on Mondays", {0}),
+])
+def test_weekly_closed_days(text, expected):
+    assert closed_days(compile_weekly_mask(None, text)) == expected
+
+
+def test_hours_with_day_prefix_and_closed_day():
+    mask = compile_weekly_mask("평일 9-18시, 토 10-17시 (일요일 휴무)")
+    assert closed_days(mask) == {6}
+    assert mask == ALWAYS_OPEN & ~(DAY_BITS << 18)
+
+
+def test_hours_and_closed_columns_combine():
+    mask = compile_weekly_mask("09:00~13:00", "매주 화요일, 설날 당일")
+    assert closed_days(mask) == {1}
+    # 오전만 여는 곳: 화요일을 뺀 날의 오전 비트만 켜짐
+    assert all((mask >> (day * 3)) & DAY_BITS == 0b001 for day in range(7) if day != 1)
+
+
+def test_bare_day_char_inside_words_is_not_a_day():
+    assert parse_days("당일") == set()
+    assert parse_days("일부 구역") == set()
+    assert parse_days("3월 1일") == set()
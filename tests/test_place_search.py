@@ -0,0 +1,64 @@
+"""place_search 자동완성(PrefixIndex) / 근사 검색(FuzzyIndex, PlaceSearchIndex)"""
+from place_search import FuzzyIndex, PlaceSearchIndex, PrefixIndex, decompose_jamo
+
+
+def make_marker(place_id, name, popularity=1.0):
+    return {'place_id': place_id, 'title': name, 'names': {'한국어': name}, 'popularity': popularity}
+
+
+def completions(index, prefix, k):
+    return [result['text'] for result in index.complete(prefix, k)]
+
+
+def test_complete_prefers_short_names_when_popularity_is_tied():
+    markers = [make_marker(f"long-{i}", f"서울가나다라마바사아자차카타파하{i}") for i in range(60)]
+    markers += [make_marker('forest', "서울숲"), make_marker('station', "서울역")]
+    index = PrefixIndex(markers, popularity=lambda marker: marker['popularity'])
+
+    top = completions(index, "서울", 5)
+    assert top[:2] == ["서울숲", "서울역"]
+    assert len(top) == 5
+    # 같은 입력이면 항상 같은 결과
+    assert completions(index, "서울", 5) == top
+
+
+def test_complete_collects_k_places_past_repeated_words():
+    repeated = ' '.join(["서울"] * 12)
+    markers = [make_marker('repeated', repeated, popularity=100.0)]
+    markers += [make_marker(f"other-{i}", f"서울 명소 {i}") for i in range(5)]
+    index = PrefixIndex(markers, popularity=lambda marker: marker['popularity'])
+
+    top = completions(index, "서울", 2)
+    assert top == [repeated, "서울 명소 0"]
+
+
+def test_complete_matches_middle_word_chosung_and_partial_syllable():
+    markers = [make_marker('palace', "경복궁", 5.0), make_marker('market', "광장 시장", 3.0),
+               make_marker('tower', "남산 서울타워", 4.0)]
+    index = PrefixIndex(markers, popularity=lambda marker: marker['popularity'])
+
+    assert completions(index, "시장", 3) == ["광장 시장"]
+    assert completions(index, "서울", 3) == ["남산 서울타워"]
+    assert completions(index, "ㄱ", 3) == ["경복궁", "광장 시장"]
+    # 마지막 글자를 치는 중 (자모 단위 접두 일치)
+    assert completions(index, "경보", 3) == ["경복궁"]
+    assert completions(index, "없는 이름", 3) == []
+
+
+def test_fuzzy_index_finds_substrings_within_distance():
+    keys = [decompose_jamo(name) for name in ["경복궁", "창덕궁", "덕수궁", "남산타워"]]
+    index = FuzzyIndex(keys)
+
+    assert index.search(decompose_jamo("덕수궁"), 0) == {2: 0}
+    matches = index.search(decompose_jamo("경복궁"), 2)
+    assert matches[0] == 0
+    assert 3 not in matches
+
+
+def test_place_search_ranks_exact_match_first_and_dedups_places():
+    markers = [make_marker('palace', "경복궁"), make_marker('palace', "경복궁"),
+               make_marker('other', "경복궁 역사관")]
+    index = PlaceSearchIndex(markers)
+
+    results = index.search("경복궁")
+    assert [marker['title'] for marker in results] == ["경복궁", "경복궁 역사관"]
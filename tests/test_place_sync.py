@@ -0,0 +1,58 @@
+"""place_sync 변경분 동기화 - 녹화 XML 을 ReplayServer 로 재생해 연속 두 번 동기화"""
+import os
+
+import pandas as pd
+
+import place_sync
+from seoul_openapi import (CULTURAL_SPACE_SERVICE, ReplayServer, SeoulOpenApiClient, read_place_dataset,
+                           record_xml, rows_to_dataframe)
+
+NUM_ROWS = 2500
+
+
+def make_rows(updated=(), deleted=(), added=0):
+    rows = []
+    for i in range(1, NUM_ROWS + added + 1):
+        if i in deleted:
+            continue
+        row = {'NUM': str(i), 'FAC_NAME': f"시설 {i}", 'SUBJCODE': "공연장", 'ADDR': f"서울 {i}",
+               'X_COORD': "37.5", 'Y_COORD': "127.0", 'PHNE': None, 'HOMEPAGE': None}
+        if i in updated:
+            # 첫 동기화 때 모두 비어 있던 열에 값이 들어오는 수정
+            row.update(FAC_NAME=f"시설 {i} (이전)", PHNE="02-120", Y_COORD="127.05")
+        rows.append(row)
+    return rows
+
+
+def normalized(df):
+    """번호 순 정렬, 빈 값은 None 으로 맞춘 object 프레임 (엑셀을 거친 dtype 차이 무시)"""
+    df = df.set_index('번호').sort_index().astype(object)
+    return df.where(df.notna(), None)
+
+
+def sync(tmp_path, rows, name):
+    recording = os.path.join(tmp_path, f"{name}.xml")
+    record_xml(rows, CULTURAL_SPACE_SERVICE, recording)
+    with ReplayServer({CULTURAL_SPACE_SERVICE: recording}) as server:
+        with SeoulOpenApiClient(server.api_key, server.base_url, backoff=0.01) as client:
+            return place_sync.sync_service(client, store_path=os.path.join(tmp_path, "places.xlsx"),
+                                           state_dir=os.path.join(tmp_path, "sync"),
+                                           log_path=os.path.join(tmp_path, "sync_log.jsonl"))
+
+
+def test_two_syncs_in_a_row(tmp_path):
+    first = sync(tmp_path, make_rows(), "first")
+    assert (first['added'], first['updated'], first['deleted']) == (NUM_ROWS, 0, 0)
+
+    rows = make_rows(updated={5, 9}, deleted={7}, added=3)
+    second = sync(tmp_path, rows, "second")
+    assert (second['added'], second['updated'], second['deleted']) == (3, 2, 1)
+    assert second['store_rows'] == NUM_ROWS + 2
+
+    # 변경분만 반영한 파일과 전체를 새로 받은 결과가 같은지 (행 순서만 다름)
+    store = read_place_dataset(os.path.join(tmp_path, "places.xlsx"))
+    pd.testing.assert_frame_equal(normalized(store), normalized(rows_to_dataframe(rows)))
+
+    third = sync(tmp_path, rows, "third")
+    assert (third['added'], third['updated'], third['deleted'], third['applied']) == (0, 0, 0, False)
+    assert len(place_sync.read_sync_log(os.path.join(tmp_path, "sync_log.jsonl"))) == 3